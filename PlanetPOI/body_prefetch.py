@@ -0,0 +1,126 @@
+"""
+Body prefetch module for EDMC-PlanetPOI
+Prepares the POI slice, spatial index and description strings for a body on a
+worker thread while the commander approaches it, so the first surface tick
+only has to calculate distances
+"""
+
+import queue
+import threading
+
+from PlanetPOI.navigation.formatting import poi_description
+from PlanetPOI.poi_manager import get_all_pois_flat, get_full_body_name, is_poi_active
+from PlanetPOI.spatial_index import BodyIndex
+
+
+class BodySlice:
+    """
+    Everything the views need about one body's POIs:
+    - pois: all POIs on the body, tree order
+    - active: the active ones (folder flags included), tree order
+    - descriptions: id(poi) -> description shown in the POI list
+    - index: BodyIndex over the active POIs (unit vectors already computed)
+    `active` is worked out from the tree when not given, so only pass it in
+    when the slice is built off the Tk thread.
+    """
+
+    def __init__(self, body, revision, pois, active=None):
+        self.body = body
+        self.revision = revision
+        self.pois = pois
+        self.active = active if active is not None else [poi for poi in pois if is_poi_active(poi)]
+        self.descriptions = {id(poi): poi_description(poi) for poi in pois}
+        self.index = BodyIndex(self.active)
+
+
+def group_by_body(all_pois, bodies=None, system=None):
+    """
+    {full body name: [POIs]} in tree order with one walk of the tree.
+    Limited to `bodies` and/or POIs in `system` when given.
+    """
+    groups = {body: [] for body in bodies or ()}
+    for poi in get_all_pois_flat(all_pois):
+        if system is not None and poi.get("system", "") != system:
+            continue
+        body = get_full_body_name(poi)
+        if bodies is not None:
+            if body in groups:
+                groups[body].append(poi)
+        elif poi.get("body"):  # System-level POIs have no surface position
+            groups.setdefault(body, []).append(poi)
+    return groups
+
+
+class BodyPrefetcher:
+    """
+    Cache of BodySlices keyed on body, valid for one POI tree revision.
+    prefetch() groups the POIs by body on the calling thread and leaves the
+    descriptions and spatial indexes to a background thread, which never
+    touches the tree; get() never blocks and builds the slice on the calling
+    thread if it was not prefetched.
+    """
+
+    def __init__(self, max_bodies=32):
+        self.max_bodies = max_bodies
+        self._slices = {}
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._thread = None
+        self.hits = 0
+        self.misses = 0
+
+    def prefetch(self, all_pois, revision, bodies=None, system=None):
+        """Build slices for the given bodies (or every body in `system`) in the background"""
+        jobs = []
+        for body, pois in group_by_body(all_pois, list(bodies) if bodies else None, system).items():
+            with self._lock:
+                current = self._slices.get(body)
+            if current is None or current.revision != revision:
+                # Active flags depend on the folders above each POI - resolve them here, on the tree's thread
+                jobs.append((body, pois, [poi for poi in pois if is_poi_active(poi)]))
+        if not jobs:
+            return
+        self._queue.put((revision, jobs))
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._worker, name="planetpoi-BodyPrefetch", daemon=True)
+            self._thread.start()
+
+    def get(self, all_pois, revision, body):
+        """Slice for a body at the current revision"""
+        with self._lock:
+            body_slice = self._slices.get(body)
+        if body_slice is not None and body_slice.revision == revision:
+            self.hits += 1
+            return body_slice
+        self.misses += 1
+        body_slice = BodySlice(body, revision, group_by_body(all_pois, bodies=[body])[body])
+        self._store(body_slice)
+        return body_slice
+
+    def clear(self):
+        with self._lock:
+            self._slices.clear()
+
+    def _store(self, body_slice):
+        with self._lock:
+            self._slices[body_slice.body] = body_slice
+            while len(self._slices) > self.max_bodies:
+                # Dicts keep insertion order - drop the oldest body
+                self._slices.pop(next(iter(self._slices)))
+
+    def _worker(self):
+        while True:
+            try:
+                revision, jobs = self._queue.get(timeout=5)
+            except queue.Empty:
+                return
+            for body, pois, active in jobs:
+                with self._lock:
+                    current = self._slices.get(body)
+                if current is not None and current.revision == revision:
+                    continue  # Built by get() in the meantime
+                try:
+                    self._store(BodySlice(body, revision, pois, active))
+                except Exception as ex:
+                    # get() builds the slice on the Tk thread instead
+                    print(f"PPOI: Body prefetch of {body} failed: {ex}")
@@ -40,6 +40,34 @@ def calculate_bearing_and_distance(lat1, lon1, lat2, lon2, planet_radius_m, alt1
     return distance, bearing
 
 
+def calculate_destination_point(lat, lon, bearing, distance_m, planet_radius_m):
+    """
+    Calculate the point reached by travelling along a great circle
+    
+    Args:
+        lat, lon: Starting position (degrees)
+        bearing: Initial bearing (degrees)
+        distance_m: Distance travelled in meters
+        planet_radius_m: Planet radius in meters
+        
+    Returns:
+        tuple: (lat, lon) in degrees, lon normalized to -180..180
+    """
+    phi1 = math.radians(lat)
+    lambda1 = math.radians(lon)
+    theta = math.radians(bearing)
+    delta = distance_m / planet_radius_m
+
+    sin_phi2 = math.sin(phi1) * math.cos(delta) + math.cos(phi1) * math.sin(delta) * math.cos(theta)
+    phi2 = math.asin(max(-1.0, min(1.0, sin_phi2)))
+    y = math.sin(theta) * math.sin(delta) * math.cos(phi1)
+    x = math.cos(delta) - math.sin(phi1) * sin_phi2
+    lambda2 = lambda1 + math.atan2(y, x)
+
+    lon2 = (math.degrees(lambda2) + 540) % 360 - 180
+    return math.degrees(phi2), lon2
+
+
 def format_body_name(body_name):
     """
     Format body name according to Elite Dangerous naming rules.
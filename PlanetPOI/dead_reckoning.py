@@ -0,0 +1,123 @@
+"""
+Dead reckoning module for EDMC-PlanetPOI
+Estimates ground speed and track from recent dashboard samples and
+extrapolates the position between Status.json updates.
+Predictions are for rendering only - the real samples are never changed.
+"""
+
+import collections
+import time
+
+from PlanetPOI.calculations import calculate_bearing_and_distance, calculate_destination_point
+
+
+MAX_SAMPLES = 5
+SAMPLE_WINDOW = 4.0        # Seconds of samples used for the speed estimate
+MAX_EXTRAPOLATION = 2.0    # Never predict further ahead than this (seconds)
+UPDATE_GRACE = 1.5         # Updates overdue by this many sample intervals have stopped
+MAX_SPEED = 3000.0         # m/s - faster estimates are glitches (e.g. respawn, jump)
+MIN_SPEED = 0.5            # m/s - below this we are parked and jitter is ignored
+
+
+class PositionPredictor:
+    """
+    Keeps the last few (time, lat, lon) samples on one body.
+    Track comes from the oldest and newest sample within SAMPLE_WINDOW, speed
+    from the same span but never above the speed over the newest interval, so
+    slowing down or stopping takes effect with the next sample.
+    Predictions run at most one sample interval (times UPDATE_GRACE, and never
+    more than MAX_EXTRAPOLATION seconds) past the newest sample; after that
+    updates have stopped and the newest sample itself is returned.
+    The history is dropped when the body or planet radius changes.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.samples = collections.deque(maxlen=MAX_SAMPLES)
+        self.body = None
+        self.planet_radius = None
+        self.speed = 0.0
+        self.track = 0.0
+        self.horizon = 0.0  # Seconds past the newest sample predictions may run
+
+    def reset(self):
+        self.samples.clear()
+        self.body = None
+        self.planet_radius = None
+        self.speed = 0.0
+        self.track = 0.0
+        self.horizon = 0.0
+
+    def add_sample(self, body, lat, lon, planet_radius, t=None):
+        """Record a real position from Status.json"""
+        if t is None:
+            t = self.clock()
+        if body != self.body or planet_radius != self.planet_radius:
+            self.reset()
+            self.body = body
+            self.planet_radius = planet_radius
+        if self.samples and t <= self.samples[-1][0]:
+            # Same timestamp - replace instead of dividing by zero later
+            self.samples.pop()
+        self.samples.append((t, lat, lon))
+        self._estimate_velocity()
+
+    def _estimate_velocity(self):
+        newest = self.samples[-1]
+        oldest = None
+        for sample in self.samples:
+            if newest[0] - sample[0] <= SAMPLE_WINDOW:
+                oldest = sample
+                break
+        if oldest is None or oldest is newest:
+            self.speed = 0.0
+            return
+        previous = self.samples[-2]
+
+        distance, bearing = calculate_bearing_and_distance(
+            oldest[1], oldest[2], newest[1], newest[2], self.planet_radius
+        )
+        speed = distance / (newest[0] - oldest[0])
+        if speed > MAX_SPEED:
+            # Teleport-like jump - start over from the newest sample
+            self.samples.clear()
+            self.samples.append(newest)
+            self.speed = 0.0
+            return
+        interval = newest[0] - previous[0]
+        recent_distance, _ = calculate_bearing_and_distance(
+            previous[1], previous[2], newest[1], newest[2], self.planet_radius
+        )
+        # Slowing down shows in the newest interval long before it shows over the window
+        speed = min(speed, recent_distance / interval)
+        self.speed = speed if speed >= MIN_SPEED else 0.0
+        self.horizon = min(interval * UPDATE_GRACE, MAX_EXTRAPOLATION)
+        if self.speed:
+            # Track at the newest sample = reverse of the bearing back to the oldest one
+            _, back_bearing = calculate_bearing_and_distance(
+                newest[1], newest[2], oldest[1], oldest[2], self.planet_radius
+            )
+            self.track = (back_bearing + 180) % 360
+
+    def is_moving(self, t=None):
+        """True while predictions still differ from the newest sample"""
+        if not self.samples or not self.speed:
+            return False
+        if t is None:
+            t = self.clock()
+        return t - self.samples[-1][0] <= self.horizon
+
+    def predict(self, t=None):
+        """
+        Return the estimated (lat, lon) at time t, or None without samples.
+        Once updates are overdue (see is_moving) this is the newest sample again.
+        """
+        if not self.samples:
+            return None
+        if t is None:
+            t = self.clock()
+        sample_t, lat, lon = self.samples[-1]
+        if not self.is_moving(t):
+            return lat, lon
+        dt = max(t - sample_t, 0.0)
+        return calculate_destination_point(lat, lon, self.track, self.speed * dt, self.planet_radius)
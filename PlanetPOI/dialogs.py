@@ -6,7 +6,7 @@ Contains all dialog windows (add POI, move, delete, share, etc.)
 import tkinter as tk
 import tkinter.messagebox as mb
 from PlanetPOI.calculations import scale_geometry, format_body_name
-from PlanetPOI.poi_manager import split_system_and_body
+from PlanetPOI.poi_manager import split_system_and_body, notify_item_added, notify_poi_changed, transaction
 from PlanetPOI.AutoCompleter import AutoCompleter
 import functools
 import l10n
@@ -69,6 +69,7 @@ def show_add_poi_dialog(parent_frame, prefill_system=None, edit_poi=None, parent
     auto_lon = ""
     auto_desc = ""
     auto_notes = ""
+    auto_radius = ""
     
     if is_edit_mode:
         auto_system = edit_poi.get("system", "")
@@ -79,6 +80,8 @@ def show_add_poi_dialog(parent_frame, prefill_system=None, edit_poi=None, parent
         auto_lon = str(lon_val) if lon_val not in ["", None] else ""
         auto_desc = edit_poi.get("description", "")
         auto_notes = edit_poi.get("notes", "")
+        if edit_poi.get("radius"):
+            auto_radius = f"{edit_poi['radius']:g}"
     else:
         if last_body:
             system_part, body_part = split_system_and_body(last_body)
@@ -130,6 +133,13 @@ def show_add_poi_dialog(parent_frame, prefill_system=None, edit_poi=None, parent
     lon_entry.grid(row=row, column=1, padx=(10, 20), pady=5, sticky="ew")
     row += 1
     
+    # Empty = the guidance stop distance from the settings
+    tk.Label(dialog, text="Arrival radius (m):").grid(row=row, column=0, sticky="w", padx=10, pady=5)
+    radius_var = tk.StringVar(value=auto_radius)
+    radius_entry = tk.Entry(dialog, textvariable=radius_var, width=30)
+    radius_entry.grid(row=row, column=1, padx=(10, 20), pady=5, sticky="ew")
+    row += 1
+    
     tk.Label(dialog, text="Description:").grid(row=row, column=0, sticky="w", padx=10, pady=5)
     desc_var = tk.StringVar(value=auto_desc)
     desc_entry = tk.Entry(dialog, textvariable=desc_var, width=30)
@@ -147,10 +157,37 @@ def show_add_poi_dialog(parent_frame, prefill_system=None, edit_poi=None, parent
     status_label.grid(row=row, column=0, columnspan=2, pady=(2, 5))
     row += 1
     
+    def add_shared_collection(shared):
+        """Add all POIs from a multi-POI link as a new folder. Returns True if handled."""
+        name, pois = shared
+        if len(pois) < 2:
+            return False
+        folder_name = name or plugin_tl("Shared POIs")
+        if not mb.askyesno(
+            plugin_tl("Shared link"),
+            plugin_tl("Add {count} POIs from shared link into folder '{folder}'?").format(count=len(pois), folder=folder_name),
+            parent=dialog
+        ):
+            return True
+        new_folder = {
+            "type": "folder",
+            "name": folder_name,
+            "children": pois
+        }
+        parent_children.append(new_folder)
+        notify_item_added(new_folder, parent_children)
+        cb['save_pois']()
+        cb['redraw_plugin_app']()
+        dialog.destroy()
+        return True
+    
     def paste_from_clipboard():
         try:
             clipboard_text = dialog.clipboard_get().strip()
-            poi_data = cb['parse_share_url'](clipboard_text)
+            shared = cb['parse_share_url_pois'](clipboard_text)
+            if shared and add_shared_collection(shared):
+                return
+            poi_data = shared[1][0] if shared and shared[1] else None
             
             if poi_data:
                 system_name = poi_data.get('system', '')
@@ -180,8 +217,11 @@ def show_add_poi_dialog(parent_frame, prefill_system=None, edit_poi=None, parent
         try:
             text = widget.get()
             if 'github.io/EDMC-PlanetPOI' in text or '#' in text:
-                poi_data = cb['parse_share_url'](text)
+                shared = cb['parse_share_url_pois'](text)
+                poi_data = shared[1][0] if shared and shared[1] else None
                 if poi_data:
+                    if add_shared_collection(shared):
+                        return
                     if widget == system_entry:
                         system_entry.set_text("", placeholder_style=False)
                     elif hasattr(widget, 'delete'):
@@ -236,6 +276,17 @@ def show_add_poi_dialog(parent_frame, prefill_system=None, edit_poi=None, parent
             lat = ""
             lon = ""
         
+        radius_str = radius_var.get().strip().replace(",", ".")
+        radius = None
+        if radius_str:
+            try:
+                radius = float(radius_str)
+            except ValueError:
+                radius = 0
+            if radius <= 0:
+                status_label.config(text="Invalid arrival radius!", fg="red")
+                return
+        
         desc = desc_var.get().strip()
         notes = notes_text.get("1.0", tk.END).strip()
         
@@ -246,6 +297,11 @@ def show_add_poi_dialog(parent_frame, prefill_system=None, edit_poi=None, parent
             edit_poi["lon"] = lon
             edit_poi["description"] = desc
             edit_poi["notes"] = notes
+            if radius:
+                edit_poi["radius"] = radius
+            else:
+                edit_poi.pop("radius", None)
+            notify_poi_changed(edit_poi)
         else:
             new_poi = {
                 "type": "poi",
@@ -257,11 +313,15 @@ def show_add_poi_dialog(parent_frame, prefill_system=None, edit_poi=None, parent
                 "notes": notes,
                 "active": True
             }
+            if radius:
+                new_poi["radius"] = radius
             parent_children.append(new_poi)
+            notify_item_added(new_poi, parent_children)
         
-        cb['save_pois']()
-        cb['redraw_plugin_app']()
-        cb['update_overlay_for_current_position']()
+        with transaction():
+            cb['save_pois']()
+            cb['redraw_plugin_app']()
+            cb['update_overlay_for_current_position']()
         
         dialog.destroy()
     
@@ -303,11 +363,13 @@ def show_add_folder_dialog(frame, parent_children):
 
 
 def show_move_dialog(frame, item, item_type, is_prefs=False):
-    """Show dialog to move POI or folder to different parent"""
+    """Show dialog to move POI or folder to different parent. item may also be a list of POIs and folders."""
     g = get_globals()
     cb = get_callbacks()
     
     ALL_POIS = g['ALL_POIS']
+    targets = item if isinstance(item, list) else [item]
+    target_ids = {id(target) for target in targets}
     
     in_config_dialog = False
     try:
@@ -358,15 +420,15 @@ def show_move_dialog(frame, item, item_type, is_prefs=False):
                     return result
         return None
     
-    current_parent = find_parent(ALL_POIS, item)
-    
-    if current_parent is None and item in ALL_POIS:
-        current_index = 0
+    if len(targets) == 1:
+        current_parent = find_parent(ALL_POIS, targets[0])
+        if current_parent is None and any(it is targets[0] for it in ALL_POIS):
+            current_index = 0
     
     def add_folders(items, indent=0):
         nonlocal current_index
         for it in items:
-            if it.get("type") == "folder" and it is not item:
+            if it.get("type") == "folder" and id(it) not in target_ids:
                 idx = listbox.size()
                 folder_map[idx] = it.get("children", [])
                 prefix = "  " * indent + "📁 "
@@ -389,8 +451,10 @@ def show_move_dialog(frame, item, item_type, is_prefs=False):
         if selection:
             idx = selection[0]
             target_children = folder_map.get(idx, ALL_POIS)
-            if cb['move_item'](ALL_POIS, item, target_children):
-                cb['save_pois']()
+            # One save and one redraw however many items move
+            with transaction():
+                if not cb['move_pois'](targets, target_children):
+                    return
                 if is_prefs:
                     popup.grab_release()
                 popup.destroy()
@@ -452,13 +516,14 @@ def confirm_delete_item(frame, item, item_type):
 
 
 def show_share_popup(parent, poi):
-    """Show popup dialog with shareable URL and copy button"""
+    """Show popup dialog with shareable URL and copy button (POI or whole folder)"""
     cb = get_callbacks()
     
     share_url = cb['generate_share_url'](poi)
+    is_folder = poi.get("type") == "folder"
     
     popup = tk.Toplevel(parent)
-    popup.title(plugin_tl("Share POI"))
+    popup.title(plugin_tl("Share folder") if is_folder else plugin_tl("Share POI"))
     popup.geometry(scale_geometry(500, 170))
     popup.resizable(False, False)
     popup.transient(parent)
@@ -468,7 +533,8 @@ def show_share_popup(parent, poi):
     y = parent.winfo_rooty() + (parent.winfo_height() // 2) - (popup.winfo_height() // 2)
     popup.geometry(f"+{x}+{y}")
     
-    label = tk.Label(popup, text=plugin_tl("Copy this link to share the POI:"))
+    label_text = plugin_tl("Copy this link to share all POIs in the folder:") if is_folder else plugin_tl("Copy this link to share the POI:")
+    label = tk.Label(popup, text=label_text)
     label.pack(pady=(10, 5), padx=10)
     
     url_var = tk.StringVar(value=share_url)
@@ -492,3 +558,130 @@ def show_share_popup(parent, poi):
     popup.bind("<FocusOut>", lambda e: popup.after(100, lambda: popup.destroy() if not popup.focus_get() else None))
     
     popup.grab_set()
+
+
+def show_progress_dialog(parent, title, on_cancel=None):
+    """
+    Show a small progress window with a Cancel button.
+    Returns the popup; call popup.set_progress(fraction, text) to update it.
+    """
+    from tkinter import ttk
+    
+    popup = tk.Toplevel(parent)
+    popup.title(title)
+    popup.geometry(scale_geometry(400, 130))
+    popup.resizable(False, False)
+    popup.transient(parent)
+    
+    status_var = tk.StringVar(value="")
+    tk.Label(popup, textvariable=status_var).pack(pady=(10, 5), padx=10)
+    
+    bar = ttk.Progressbar(popup, orient="horizontal", mode="determinate", maximum=100, length=340)
+    bar.pack(pady=5, padx=10, fill=tk.X)
+    
+    def cancel():
+        if on_cancel:
+            on_cancel()
+        cancel_btn.config(state="disabled")
+    
+    cancel_btn = tk.Button(popup, text=plugin_tl("Cancel"), command=cancel, width=10)
+    cancel_btn.pack(pady=10)
+    popup.protocol("WM_DELETE_WINDOW", cancel)
+    
+    def set_progress(fraction, text=""):
+        bar["value"] = max(0, min(100, fraction * 100))
+        status_var.set(text)
+    
+    popup.set_progress = set_progress
+    return popup
+
+
+def ask_import_mode(parent, has_existing=True):
+    """
+    Ask how imported POIs should be combined with the existing ones.
+    Returns "replace", one of the poi_dedupe merge policies, or None if cancelled.
+    """
+    from PlanetPOI import poi_dedupe
+    
+    popup = tk.Toplevel(parent)
+    popup.title(plugin_tl("Import POIs"))
+    popup.geometry(scale_geometry(420, 240))
+    popup.resizable(False, False)
+    popup.transient(parent)
+    
+    choice = tk.StringVar(value=poi_dedupe.POLICY_SKIP)
+    result = {"mode": None}
+    
+    options = [
+        (plugin_tl("Add, skip duplicates"), poi_dedupe.POLICY_SKIP),
+        (plugin_tl("Add, update descriptions of duplicates"), poi_dedupe.POLICY_UPDATE),
+        (plugin_tl("Add all, keep duplicates"), poi_dedupe.POLICY_KEEP),
+    ]
+    if has_existing:
+        options.append((plugin_tl("Replace all existing POIs"), "replace"))
+    
+    tk.Label(popup, text=plugin_tl("How should the imported POIs be added?")).pack(pady=(10, 5), padx=10, anchor="w")
+    for label, value in options:
+        tk.Radiobutton(popup, text=label, variable=choice, value=value).pack(padx=20, anchor="w")
+    
+    def ok():
+        result["mode"] = choice.get()
+        popup.destroy()
+    
+    button_frame = tk.Frame(popup)
+    button_frame.pack(side=tk.BOTTOM, pady=10)
+    tk.Button(button_frame, text=plugin_tl("Import POIs"), command=ok, width=12).pack(side=tk.LEFT, padx=5)
+    tk.Button(button_frame, text=plugin_tl("Cancel"), command=popup.destroy, width=12).pack(side=tk.LEFT, padx=5)
+    
+    popup.grab_set()
+    popup.wait_window()
+    return result["mode"]
+
+
+def ask_journal_ingest(parent, journal_dir, folder_name):
+    """
+    Ask which journal folder to scan and which POI folder to put the results in.
+    Returns (journal_dir, folder_name) or None if cancelled.
+    """
+    from tkinter import filedialog
+    
+    popup = tk.Toplevel(parent)
+    popup.title(plugin_tl("Import from journals"))
+    popup.geometry(scale_geometry(460, 200))
+    popup.resizable(False, False)
+    popup.transient(parent)
+    
+    dir_var = tk.StringVar(value=journal_dir)
+    name_var = tk.StringVar(value=folder_name)
+    result = {"choice": None}
+    
+    tk.Label(popup, text=plugin_tl("Journal folder:")).pack(pady=(10, 2), padx=10, anchor="w")
+    dir_frame = tk.Frame(popup)
+    dir_frame.pack(fill=tk.X, padx=10)
+    tk.Entry(dir_frame, textvariable=dir_var, width=45).pack(side=tk.LEFT, fill=tk.X, expand=True)
+    
+    def browse():
+        chosen = filedialog.askdirectory(parent=popup, initialdir=dir_var.get() or None)
+        if chosen:
+            dir_var.set(chosen)
+    
+    tk.Button(dir_frame, text=plugin_tl("Browse..."), command=browse).pack(side=tk.LEFT, padx=(5, 0))
+    
+    tk.Label(popup, text=plugin_tl("Add POIs to folder:")).pack(pady=(10, 2), padx=10, anchor="w")
+    tk.Entry(popup, textvariable=name_var, width=45).pack(padx=10, anchor="w")
+    
+    def ok():
+        directory = dir_var.get().strip()
+        name = name_var.get().strip()
+        if directory and name:
+            result["choice"] = (directory, name)
+            popup.destroy()
+    
+    button_frame = tk.Frame(popup)
+    button_frame.pack(side=tk.BOTTOM, pady=10)
+    tk.Button(button_frame, text=plugin_tl("Import"), command=ok, width=12).pack(side=tk.LEFT, padx=5)
+    tk.Button(button_frame, text=plugin_tl("Cancel"), command=popup.destroy, width=12).pack(side=tk.LEFT, padx=5)
+    
+    popup.grab_set()
+    popup.wait_window()
+    return result["choice"]
@@ -0,0 +1,265 @@
+"""
+Folder statistics module for EDMC-PlanetPOI
+Per-folder subfolder, POI and active counts plus the systems a folder covers.
+Built once per loaded tree, then updated along the path to the root when an
+item is added, removed, moved or (de)activated, so views never walk a folder.
+
+A POI is active only if its own flag and the flag of every folder above it
+are set. That effective state is cached per item, so filtering POIs costs one
+lookup each; toggling a folder recomputes only the folder's own subtree.
+"""
+
+import threading
+
+from collections import Counter
+
+
+class FolderStats:
+    """Aggregates of everything below one folder"""
+
+    __slots__ = ("subfolders", "pois", "active", "systems")
+
+    def __init__(self):
+        self.subfolders = 0
+        self.pois = 0
+        self.active = 0
+        self.systems = Counter()  # system name -> number of POIs in it
+
+    @property
+    def system_names(self):
+        return set(self.systems)
+
+
+class FolderAggregates:
+    """
+    FolderStats for every folder of one tree.
+    Items are keyed on id(); references are kept so ids stay unique.
+    """
+
+    def __init__(self):
+        self._stats = {}     # id(folder) -> FolderStats
+        self._parent = {}    # id(item) -> parent folder, None at root level
+        self._owner = {}     # id(children list) -> folder, None for the root list
+        self._items = {}     # id(item) -> item
+        self._active = {}    # id(item) -> effective active state
+        self._system = {}    # id(poi) -> counted system
+        self._pending_tree = None
+        self._lock = threading.Lock()  # The body prefetch thread may trigger the build
+
+    def reset(self, all_pois):
+        """Start over with a newly loaded or replaced tree. Built on first use."""
+        self.__init__()
+        self._pending_tree = all_pois
+
+    def get(self, folder):
+        """FolderStats of a folder, None if the folder is not in the tree"""
+        self._build_pending()
+        return self._stats.get(id(folder))
+
+    def parent_of(self, item):
+        """Folder containing an item, None at root level"""
+        self._build_pending()
+        return self._parent.get(id(item))
+
+    def folder_of(self, children):
+        """Folder owning a children list, None for the root list"""
+        self._build_pending()
+        return self._owner.get(id(children))
+
+    def is_active(self, item):
+        """Effective active state: the item's own flag and every folder above it"""
+        self._build_pending()
+        active = self._active.get(id(item))
+        if active is None:  # Not in the tree
+            return bool(item.get("active", True))
+        return active
+
+    def ancestors(self, item):
+        """Folders above an item, nearest first"""
+        self._build_pending()
+        folders = []
+        parent = self._parent.get(id(item))
+        while parent is not None:
+            folders.append(parent)
+            parent = self._parent.get(id(parent))
+        return folders
+
+    # Change notifications - each costs O(depth), plus the size of a newly added subtree
+
+    def item_added(self, item, parent_children):
+        """An item (and its subtree) was appended to parent_children"""
+        if self._build_pending():
+            return
+        parent = self._owner.get(id(parent_children))
+        self._index(item, parent)
+        self._apply(parent, item, 1)
+
+    def item_removed(self, item):
+        """An item was taken out of the tree"""
+        if self._build_pending():
+            return
+        key = id(item)
+        if key not in self._items:
+            return
+        self._apply(self._parent.get(key), item, -1)
+        self._forget(item)
+
+    def item_moved(self, item, new_parent_children):
+        """An item was moved to another children list"""
+        if self._build_pending():
+            return
+        key = id(item)
+        if key not in self._items:
+            self.item_added(item, new_parent_children)
+            return
+        self._apply(self._parent.get(key), item, -1)
+        new_parent = self._owner.get(id(new_parent_children))
+        self._parent[key] = new_parent
+        self._refresh(item, self._parent_active(new_parent))
+        self._apply(new_parent, item, 1)
+
+    def poi_changed(self, poi):
+        """A POI's active flag or system may have changed"""
+        if self._build_pending():
+            return
+        key = id(poi)
+        if key not in self._items:
+            return
+        active = self._parent_active(self._parent.get(key)) and bool(poi.get("active", True))
+        system = poi.get("system", "")
+        if active == self._active[key] and system == self._system[key]:
+            return
+        old_active, old_system = self._active[key], self._system[key]
+        self._active[key] = active
+        self._system[key] = system
+        for folder in self.ancestors(poi):
+            stats = self._stats[id(folder)]
+            stats.active += (1 if active else 0) - (1 if old_active else 0)
+            if system != old_system:
+                stats.systems[system] += 1
+                stats.systems[old_system] -= 1
+                if stats.systems[old_system] <= 0:
+                    del stats.systems[old_system]
+
+    def folder_changed(self, folder):
+        """A folder's active flag may have changed. Costs the size of the folder's subtree."""
+        if self._build_pending():
+            return
+        key = id(folder)
+        if key not in self._stats:
+            return
+        stats = self._stats[key]
+        old_active = stats.active
+        parent = self._parent.get(key)
+        self._refresh(folder, self._parent_active(parent))
+        delta = stats.active - old_active
+        while parent is not None and delta:
+            self._stats[id(parent)].active += delta
+            parent = self._parent.get(id(parent))
+
+    def _build_pending(self):
+        """Build the aggregates if a tree is waiting. Returns True if it was built now."""
+        if self._pending_tree is None:
+            return False
+        with self._lock:
+            tree = self._pending_tree
+            if tree is None:  # Built by the other thread meanwhile
+                return False
+            self._owner[id(tree)] = None
+            for item in tree:
+                self._index(item, None)
+            self._pending_tree = None
+        return True
+
+    def _parent_active(self, parent):
+        return True if parent is None else self._active[id(parent)]
+
+    def _refresh(self, item, parent_active):
+        """
+        Recompute effective active states below an item after its flag or its
+        parent's state changed. Returns the item's active POI count. Subtrees
+        whose effective state did not change are not entered.
+        """
+        key = id(item)
+        active = parent_active and bool(item.get("active", True))
+        if item.get("type") == "folder":
+            stats = self._stats[key]
+            if self._active.get(key) != active:
+                self._active[key] = active
+                stats.active = sum(self._refresh(child, active) for child in item.get("children", []))
+            return stats.active
+        if item.get("type") == "poi":
+            self._active[key] = active
+            return 1 if active else 0
+        return 0
+
+    def _index(self, item, parent):
+        """Record an item's subtree and return its contribution to the parent's stats"""
+        key = id(item)
+        self._items[key] = item
+        self._parent[key] = parent
+        if item.get("type") == "folder":
+            self._active[key] = self._parent_active(parent) and bool(item.get("active", True))
+            stats = self._stats[key] = FolderStats()
+            children = item.setdefault("children", [])
+            self._owner[id(children)] = item
+            for child in children:
+                child_stats = self._index(child, item)
+                if child_stats is None:
+                    continue
+                subfolders, pois, active, systems = child_stats
+                stats.subfolders += subfolders
+                stats.pois += pois
+                stats.active += active
+                stats.systems.update(systems)
+            return 1 + stats.subfolders, stats.pois, stats.active, stats.systems
+        if item.get("type") == "poi":
+            active = self._parent_active(parent) and bool(item.get("active", True))
+            system = item.get("system", "")
+            self._active[key] = active
+            self._system[key] = system
+            return 0, 1, 1 if active else 0, {system: 1}
+        return None
+
+    def _contribution(self, item):
+        key = id(item)
+        if item.get("type") == "folder":
+            stats = self._stats[key]
+            return 1 + stats.subfolders, stats.pois, stats.active, stats.systems
+        if item.get("type") == "poi":
+            return 0, 1, 1 if self._active[key] else 0, {self._system[key]: 1}
+        return None
+
+    def _apply(self, folder, item, sign):
+        """Add (sign=1) or subtract (sign=-1) an item's subtree from folder and its ancestors"""
+        contribution = self._contribution(item)
+        if contribution is None:
+            return
+        subfolders, pois, active, systems = contribution
+        systems = Counter(systems)
+        while folder is not None:
+            stats = self._stats[id(folder)]
+            stats.subfolders += sign * subfolders
+            stats.pois += sign * pois
+            stats.active += sign * active
+            if sign > 0:
+                stats.systems.update(systems)
+            else:
+                stats.systems.subtract(systems)
+                for system in systems:
+                    if stats.systems[system] <= 0:
+                        del stats.systems[system]
+            folder = self._parent.get(id(folder))
+
+    def _forget(self, item):
+        key = id(item)
+        self._items.pop(key, None)
+        self._parent.pop(key, None)
+        self._active.pop(key, None)
+        self._system.pop(key, None)
+        if item.get("type") == "folder":
+            self._stats.pop(key, None)
+            children = item.get("children", [])
+            self._owner.pop(id(children), None)
+            for child in children:
+                self._forget(child)
@@ -5,12 +5,14 @@ Contains main GUI building functions (build_plugin_content, build_plugin_ui, etc
 
 import tkinter as tk
 import tkinter.font as tkfont
+import tkinter.messagebox as mb
 import myNotebook as nb
 from tkinter import ttk
 from config import config
 from theme import theme
-from PlanetPOI.calculations import calculate_bearing_and_distance, format_distance_with_unit
-from PlanetPOI.poi_manager import get_full_body_name, get_all_pois_flat
+from PlanetPOI import theme_colors
+from PlanetPOI import navigation
+from PlanetPOI.poi_manager import get_full_body_name, get_all_pois_flat, notify_poi_changed, is_poi_active, transaction
 import functools
 import l10n
 
@@ -20,6 +22,9 @@ plugin_tl = functools.partial(l10n.translations.tl, context=__file__)
 get_globals = None
 get_callbacks = None
 
+# Search results shown in the main panel
+SEARCH_RESULT_LIMIT = 10
+
 
 def init_gui_builder(globals_getter, callbacks_getter):
     """Initialize GUI builder with getters for external dependencies"""
@@ -75,6 +80,67 @@ def create_scrolled_frame(parent):
     return container
 
 
+def bind_search(entry, search_var, callback):
+    """Call callback whenever search_var changes, for as long as entry exists"""
+    trace_id = search_var.trace_add('write', lambda *args: callback())
+    entry.bind("<Destroy>", lambda e: search_var.trace_remove('write', trace_id), add="+")
+    entry.bind("<Escape>", lambda e: search_var.set(""))
+
+
+def build_search_section(frame, row):
+    """Search box with a result list that is filtered as you type. Returns the next free row."""
+    g = get_globals()
+    cb = get_callbacks()
+    search_var = g['SEARCH_VAR']
+    if search_var is None:
+        return row
+    small_font = tkfont.Font(size=9)
+
+    search_frame = tk.Frame(frame)
+    search_frame.grid(row=row, column=0, columnspan=2, sticky="ew", padx=2, pady=(2, 0))
+    search_frame.grid_columnconfigure(1, weight=1)
+    search_label = tk.Label(search_frame, text=plugin_tl("Search"), font=small_font)
+    search_label.grid(row=0, column=0, sticky="w", padx=(0, 4))
+    search_entry = tk.Entry(search_frame, textvariable=search_var)
+    search_entry.grid(row=0, column=1, sticky="ew")
+    theme.update(search_frame)
+    row += 1
+
+    results_frame = tk.Frame(frame)
+    results_frame.grid(row=row, column=0, columnspan=2, sticky="ew", padx=2)
+    row += 1
+
+    def show_results():
+        for widget in results_frame.winfo_children():
+            widget.destroy()
+        query = search_var.get().strip()
+        if not query:
+            return
+        results = cb['search_pois'](query, SEARCH_RESULT_LIMIT + 1)
+        for result_row, poi in enumerate(results[:SEARCH_RESULT_LIMIT]):
+            text = f"{get_full_body_name(poi)} - {navigation.poi_description(poi)}"
+            label_kwargs = {"text": text, "font": small_font}
+            if not is_poi_active(poi):
+                label_kwargs["foreground"] = "gray"
+            result_label = tk.Label(results_frame, **label_kwargs)
+            result_label.grid(row=result_row, column=0, sticky="w")
+            result_label.bind("<Button-3>", lambda e, p=poi: cb['show_poi_context_menu_main'](e, p, frame))
+        if not results:
+            info_text = plugin_tl("No matching POIs")
+        elif len(results) > SEARCH_RESULT_LIMIT:
+            info_text = plugin_tl("Showing the first {count} matches").format(count=SEARCH_RESULT_LIMIT)
+        else:
+            info_text = None
+        if info_text:
+            info_label = tk.Label(results_frame, text=info_text, font=small_font, foreground="gray")
+            info_label.grid(row=SEARCH_RESULT_LIMIT, column=0, sticky="w")
+        theme.update(results_frame)
+
+    bind_search(search_entry, search_var, show_results)
+    show_results()
+    return row
+
+
 def build_plugin_content(frame):
     """Build/rebuild the content inside the persistent plugin frame"""
     # Check if module is initialized
@@ -94,16 +160,13 @@ def build_plugin_content(frame):
     last_planet_radius = g['last_planet_radius']
     CURRENT_SYSTEM = g['CURRENT_SYSTEM']
     ALL_POIS = g['ALL_POIS']
-    SHOW_GUI_INFO_KEY = g['SHOW_GUI_INFO_KEY']
-    ALT_KEY = g['ALT_KEY']
-    GUIDANCE_DISTANCE_KEY = g['GUIDANCE_DISTANCE_KEY']
-    GUIDANCE_THRESHOLD_KEY = g['GUIDANCE_THRESHOLD_KEY']
+    SETTINGS = g['SETTINGS']
     
     small_font = tkfont.Font(size=9)
     
     frame.grid_columnconfigure(0, weight=0, minsize=25)
     frame.grid_columnconfigure(1, weight=1)
-    row = 0
+    row = build_search_section(frame, 0)
 
     current_body = last_body
 
@@ -138,7 +201,7 @@ def build_plugin_content(frame):
                 
                 body_part = poi.get("body", "")
                 poi_desc = body_part + " - " + desc if body_part else desc
-                is_active = poi.get("active", True)
+                is_active = is_poi_active(poi)
                 
                 label_kwargs = {"text": poi_desc, "font": small_font}
                 if not is_active:
@@ -165,7 +228,9 @@ def build_plugin_content(frame):
         
         return
 
-    matching_pois = [poi for poi in get_all_pois_flat(ALL_POIS) if get_full_body_name(poi) == current_body]
+    # Prefetched on approach - no walk of the whole tree here
+    body_slice = cb['get_body_slice'](current_body)
+    matching_pois = body_slice.pois
 
     # Header with menu button
     header_frame = tk.Frame(frame)
@@ -183,149 +248,67 @@ def build_plugin_content(frame):
     row += 1
     
     # Guidance section
-    if config.get_int(SHOW_GUI_INFO_KEY) and matching_pois:
-        first_active_poi = None
-        for poi in matching_pois:
-            if poi.get("active", True):
-                first_active_poi = poi
-                break
+    # POI guidance points at (first active or nearest, depending on target mode)
+    first_active_poi = cb['get_guidance_target']()
+    
+    # Target bearing, distance and arrow texts from the navigation core
+    target_display = None
+    if first_active_poi and last_lat is not None and last_lon is not None:
+        position = navigation.Position(last_body, last_lat, last_lon, last_altitude, last_planet_radius, last_heading)
+        target_display = navigation.describe_guidance(position, first_active_poi, SETTINGS)
+    
+    g['GUIDANCE_FRAME'] = None
+    g['GUIDANCE_LEFT_LABEL'] = None
+    g['GUIDANCE_CENTER_LABEL'] = None
+    g['GUIDANCE_RIGHT_LABEL'] = None
+    
+    if SETTINGS.show_gui_info and matching_pois and target_display is not None and target_display.show_guidance:
+        guidance_frame = tk.Frame(frame, relief="solid", borderwidth=1, highlightbackground="white", highlightthickness=1)
+        guidance_frame.grid(row=row, column=0, columnspan=2, sticky="ew", padx=2, pady=(2, 5))
         
-        if first_active_poi and last_lat is not None and last_lon is not None:
-            poi_lat = first_active_poi.get("lat")
-            poi_lon = first_active_poi.get("lon")
-            
-            if poi_lat is not None and poi_lon is not None:
-                distance, bearing = calculate_bearing_and_distance(
-                    last_lat, last_lon, poi_lat, poi_lon,
-                    last_planet_radius,
-                    last_altitude, 0,
-                    calc_with_altitude=config.get_int(ALT_KEY)
-                )
-                
-                guidance_distance = config.get_int(GUIDANCE_DISTANCE_KEY, default=2000)
-                
-                if distance >= guidance_distance:
-                    show_dist, unit = format_distance_with_unit(distance)
-                    
-                    guidance_threshold = config.get_int(GUIDANCE_THRESHOLD_KEY, default=4)
-                    on_course = False
-                    deviation = 0
-                    
-                    if last_heading is not None:
-                        deviation = bearing - last_heading
-                        while deviation > 180:
-                            deviation -= 360
-                        while deviation < -180:
-                            deviation += 360
-                        on_course = abs(deviation) <= guidance_threshold
-                    
-                    guidance_frame = tk.Frame(frame, relief="solid", borderwidth=1, highlightbackground="white", highlightthickness=1)
-                    guidance_frame.grid(row=row, column=0, columnspan=2, sticky="ew", padx=2, pady=(2, 5))
-                    
-                    guidance_frame.grid_columnconfigure(0, weight=0, minsize=40)
-                    guidance_frame.grid_columnconfigure(1, weight=1)
-                    guidance_frame.grid_columnconfigure(2, weight=0, minsize=40)
-                    
-                    num_arrows = 0
-                    if not on_course and last_heading is not None:
-                        abs_deviation = abs(deviation)
-                        if abs_deviation > guidance_threshold:
-                            max_deviation = 90
-                            arrow_fraction = min((abs_deviation - guidance_threshold) / (max_deviation - guidance_threshold), 1.0)
-                            num_arrows = int(arrow_fraction * 4) + 1
-                            num_arrows = min(num_arrows, 4)
-                    
-                    left_arrows = "<" * num_arrows if deviation < -guidance_threshold else ""
-                    left_label = tk.Label(guidance_frame, text=left_arrows, font=('TkDefaultFont', 12), anchor="e")
-                    left_label.grid(row=0, column=0, sticky="e", padx=(2, 0))
-                    
-                    if unit == "m":
-                        center_text = f"{round(bearing)}°/ {round(show_dist)}{unit}"
-                    else:
-                        center_text = f"{round(bearing)}°/ {show_dist:.1f}{unit}"
-                    
-                    # Create label without custom color
-                    center_label = tk.Label(guidance_frame, text=center_text, font=('TkDefaultFont', 10, 'bold'), anchor="center")
-                    center_label.grid(row=0, column=1, sticky="ew", padx=2)
-                    theme.update(center_label)
-                    
-                    # Set green color if on_course
-                    if on_course:
-                        center_label.config(foreground="#00aa00")
-                    
-                    right_arrows = ">" * num_arrows if deviation > guidance_threshold else ""
-                    right_label = tk.Label(guidance_frame, text=right_arrows, font=('TkDefaultFont', 12), anchor="w")
-                    right_label.grid(row=0, column=2, sticky="w", padx=(0, 2))
-                    
-                    theme.update(guidance_frame)
-                    theme.update(left_label)
-                    theme.update(right_label)
-                    
-                    # Store references for guidance_manager
-                    g['GUIDANCE_FRAME'] = guidance_frame
-                    g['GUIDANCE_LEFT_LABEL'] = left_label
-                    g['GUIDANCE_CENTER_LABEL'] = center_label
-                    g['GUIDANCE_RIGHT_LABEL'] = right_label
-                    
-                    row += 1
-                else:
-                    g['GUIDANCE_FRAME'] = None
-                    g['GUIDANCE_LEFT_LABEL'] = None
-                    g['GUIDANCE_CENTER_LABEL'] = None
-                    g['GUIDANCE_RIGHT_LABEL'] = None
-            else:
-                g['GUIDANCE_FRAME'] = None
-                g['GUIDANCE_LEFT_LABEL'] = None
-                g['GUIDANCE_CENTER_LABEL'] = None
-                g['GUIDANCE_RIGHT_LABEL'] = None
-        else:
-            g['GUIDANCE_FRAME'] = None
-            g['GUIDANCE_LEFT_LABEL'] = None
-            g['GUIDANCE_CENTER_LABEL'] = None
-            g['GUIDANCE_RIGHT_LABEL'] = None
-    else:
-        g['GUIDANCE_FRAME'] = None
-        g['GUIDANCE_LEFT_LABEL'] = None
-        g['GUIDANCE_CENTER_LABEL'] = None
-        g['GUIDANCE_RIGHT_LABEL'] = None
+        guidance_frame.grid_columnconfigure(0, weight=0, minsize=40)
+        guidance_frame.grid_columnconfigure(1, weight=1)
+        guidance_frame.grid_columnconfigure(2, weight=0, minsize=40)
+        
+        left_label = tk.Label(guidance_frame, text=target_display.left_arrows, font=('TkDefaultFont', 12), anchor="e")
+        left_label.grid(row=0, column=0, sticky="e", padx=(2, 0))
+        
+        # Create label without custom color
+        center_label = tk.Label(guidance_frame, text=target_display.center_text, font=('TkDefaultFont', 10, 'bold'), anchor="center")
+        center_label.grid(row=0, column=1, sticky="ew", padx=2)
+        theme.update(center_label)
+        
+        # Set green color if on_course
+        theme_colors.set_foreground(center_label, theme_colors.get_guidance_color(target_display.on_course))
+        
+        right_label = tk.Label(guidance_frame, text=target_display.right_arrows, font=('TkDefaultFont', 12), anchor="w")
+        right_label.grid(row=0, column=2, sticky="w", padx=(0, 2))
+        
+        theme.update(guidance_frame)
+        theme.update(left_label)
+        theme.update(right_label)
+        
+        # Store references for the guidance updates in load.py
+        g['GUIDANCE_FRAME'] = guidance_frame
+        g['GUIDANCE_LEFT_LABEL'] = left_label
+        g['GUIDANCE_CENTER_LABEL'] = center_label
+        g['GUIDANCE_RIGHT_LABEL'] = right_label
+        
+        row += 1
     
     g['OVERLAY_INFO_LABEL'] = None
 
     # POI list
-    shown_first_active = False
+    shown_target = False
     g['FIRST_POI_LABEL'] = None
     
     for poi in matching_pois:
-        desc = poi.get("description", "")
-        if not desc:
-            lat = poi.get("lat")
-            lon = poi.get("lon")
-            if lat is not None and lon is not None:
-                desc = f"{lat:.4f}, {lon:.4f}"
-            else:
-                desc = "(No description)"
-        
-        is_active = poi.get("active", True)
+        is_active = is_poi_active(poi)
         
-        display_text = desc
-        if is_active and not shown_first_active and last_lat is not None and last_lon is not None:
-            poi_lat = poi.get("lat")
-            poi_lon = poi.get("lon")
-            
-            if poi_lat is not None and poi_lon is not None:
-                distance, bearing = calculate_bearing_and_distance(
-                    last_lat, last_lon, poi_lat, poi_lon,
-                    last_planet_radius,
-                    last_altitude, 0,
-                    calc_with_altitude=config.get_int(ALT_KEY)
-                )
-                
-                show_dist, unit = format_distance_with_unit(distance)
-                if unit == "m":
-                    display_text = f"{desc} - {round(bearing)}°/ {round(show_dist)}{unit}"
-                else:
-                    display_text = f"{desc} - {round(bearing)}°/ {show_dist:.1f}{unit}"
-                shown_first_active = True
+        display_text = body_slice.descriptions.get(id(poi)) or navigation.poi_description(poi)
+        if poi is first_active_poi and target_display is not None:
+            display_text = target_display.target_label
+            shown_target = True
         
         label_kwargs = {"text": display_text, "font": small_font}
         if not is_active:
@@ -335,7 +318,7 @@ def build_plugin_content(frame):
         desc_label.grid(row=row, column=0, columnspan=2, sticky="w", padx=2, pady=0)
         theme.update(desc_label)
         
-        if is_active and shown_first_active and g['FIRST_POI_LABEL'] is None and poi_lat is not None and poi_lon is not None:
+        if poi is first_active_poi and shown_target and g['FIRST_POI_LABEL'] is None:
             g['FIRST_POI_LABEL'] = desc_label
         
         desc_label.bind("<Button-3>", lambda e, p=poi: cb['show_poi_context_menu_main'](e, p, frame))
@@ -398,6 +381,8 @@ def build_plugin_ui(frame):
     export_btn.grid(row=row, column=4, sticky="w", padx=(0, 4))
     import_btn = nb.Button(frame, text=plugin_tl("Import POIs"), command=lambda: cb['import_pois_from_file'](frame), width=12)
     import_btn.grid(row=row, column=5, sticky="w", padx=(0, 4))
+    journal_btn = nb.Button(frame, text=plugin_tl("Import from journals"), command=lambda: cb['import_pois_from_journals'](frame), width=18)
+    journal_btn.grid(row=row, column=6, sticky="w", padx=(0, 4))
     row += 1
     
     # Settings row 2
@@ -420,6 +405,33 @@ def build_plugin_ui(frame):
     guidance_distance_entry.grid(row=row, column=4, sticky="w", padx=(0, 4))
     row += 1
     
+    # Settings row 4
+    nb.Label(frame, text=plugin_tl("Import duplicate tolerance (degrees)")).grid(row=row, column=0, columnspan=2, sticky="w", padx=(0, 8))
+    duplicate_tolerance_entry = nb.EntryMenu(frame, textvariable=g['DUPLICATE_TOLERANCE_VAR'], width=8)
+    duplicate_tolerance_entry.grid(row=row, column=2, sticky="w", padx=(0, 8))
+    
+    nb.Label(frame, text=plugin_tl("Guidance target")).grid(row=row, column=3, sticky="w", padx=(8, 8))
+    target_mode_var = g['TARGET_MODE_VAR']
+    target_mode_menu = nb.OptionMenu(frame, target_mode_var, target_mode_var.get(), *cb['get_target_mode_labels']().values())
+    target_mode_menu.grid(row=row, column=4, columnspan=2, sticky="w", padx=(0, 4))
+    row += 1
+    
+    # Settings row 5
+    nb.Label(frame, text=plugin_tl("Overlay updates per second")).grid(row=row, column=0, columnspan=2, sticky="w", padx=(0, 8))
+    overlay_rate_entry = nb.EntryMenu(frame, textvariable=g['OVERLAY_RATE_VAR'], width=4)
+    overlay_rate_entry.grid(row=row, column=2, sticky="w", padx=(0, 8))
+    
+    nb.Label(frame, text=plugin_tl("GUI updates per second")).grid(row=row, column=3, sticky="w", padx=(8, 8))
+    gui_rate_entry = nb.EntryMenu(frame, textvariable=g['GUI_RATE_VAR'], width=4)
+    gui_rate_entry.grid(row=row, column=4, sticky="w", padx=(0, 4))
+    row += 1
+    
+    # Settings row 6
+    nb.Label(frame, text=plugin_tl("Deactivate POIs when reached")).grid(row=row, column=0, columnspan=2, sticky="w", padx=(0, 8))
+    auto_deactivate_cb = nb.Checkbutton(frame, variable=g['AUTO_DEACTIVATE_VAR'], width=2)
+    auto_deactivate_cb.grid(row=row, column=2, sticky="w", padx=(0, 4))
+    row += 1
+    
     # Column configuration
     for col in range(6):
         frame.grid_columnconfigure(col, weight=0, minsize=100 if col >= 4 else 0)
@@ -434,7 +446,52 @@ def build_plugin_ui(frame):
     frame.grid_rowconfigure(row, weight=1)
     
     table_row = 0
-    nb.Label(table_frame, text=plugin_tl("Saved POIs"), font=('TkDefaultFont', 10, 'bold')).grid(row=table_row, column=0, columnspan=9, sticky="w")
+    nb.Label(table_frame, text=plugin_tl("Saved POIs"), font=('TkDefaultFont', 10, 'bold')).grid(row=table_row, column=0, columnspan=4, sticky="w")
+    prefs_search_var = g['PREFS_SEARCH_VAR']
+    if prefs_search_var is not None:
+        nb.Label(table_frame, text=plugin_tl("Search")).grid(row=table_row, column=4, sticky="e", padx=(0, 4))
+        prefs_search_entry = nb.EntryMenu(table_frame, textvariable=prefs_search_var, width=28)
+        prefs_search_entry.grid(row=table_row, column=5, sticky="w", padx=(2, 2))
+    table_row += 1
+
+    # Bulk actions on the rows currently shown - every row, or the search matches
+    def shown_pois():
+        query = prefs_search_var.get().strip() if prefs_search_var is not None else ""
+        if not query:
+            return [poi for poi, widgets in row_widgets]
+        matches = {id(poi) for poi in cb['search_pois'](query)}
+        return [poi for poi, widgets in row_widgets if id(poi) in matches]
+
+    def bulk_set_active(active):
+        with transaction():
+            if cb['set_pois_active'](shown_pois(), active):
+                cb['redraw_plugin_app']()
+                cb['redraw_prefs'](frame)
+
+    def bulk_move():
+        pois = shown_pois()
+        if pois:
+            cb['show_move_dialog'](frame, pois, "POIs", True)
+
+    def bulk_delete():
+        pois = shown_pois()
+        if not pois:
+            return
+        if mb.askyesno(
+            plugin_tl("Delete POIs"),
+            plugin_tl("Are you sure you want to delete {count} POIs?").format(count=len(pois))
+        ):
+            with transaction():
+                if cb['delete_pois'](pois):
+                    cb['redraw_plugin_app']()
+                    cb['redraw_prefs'](frame)
+
+    bulk_frame = tk.Frame(table_frame, background="white")
+    bulk_frame.grid(row=table_row, column=0, columnspan=9, sticky="w", pady=(2, 4))
+    nb.Button(bulk_frame, text=plugin_tl("Activate shown"), command=lambda: bulk_set_active(True)).pack(side="left", padx=(0, 4))
+    nb.Button(bulk_frame, text=plugin_tl("Deactivate shown"), command=lambda: bulk_set_active(False)).pack(side="left", padx=(0, 4))
+    nb.Button(bulk_frame, text=plugin_tl("Move shown"), command=bulk_move).pack(side="left", padx=(0, 4))
+    nb.Button(bulk_frame, text=plugin_tl("Delete shown"), command=bulk_delete).pack(side="left")
     table_row += 1
 
     # Sorting function
@@ -485,6 +542,9 @@ def build_plugin_ui(frame):
     else:
         all_pois_sorted = sorted(all_pois_flat, key=lambda p: (p.get("system", "").lower(), p.get("body", "").lower()), reverse=SORT_REVERSE)
     
+    # Widgets of each table row, so a search can hide rows without rebuilding the table
+    row_widgets = []
+
     for poi in all_pois_sorted:
         active_var = tk.BooleanVar(value=poi.get("active", True))
         cb_poi = nb.Checkbutton(table_frame, variable=active_var, width=2)
@@ -499,6 +559,7 @@ def build_plugin_ui(frame):
         # Add trace to save active state immediately when checkbox changes
         def on_active_change(*args, p=poi, v=active_var):
             p["active"] = v.get()
+            notify_poi_changed(p)
             cb['save_pois']()
         
         active_var.trace_add('write', lambda *args, p=poi, v=active_var: on_active_change(p=p, v=v))
@@ -555,8 +616,27 @@ def build_plugin_ui(frame):
 
         desc_var.trace_add('write', lambda *args, p=poi, v=desc_var, btn=savebtn: on_desc_change(p=p, v=v, btn=btn))
         savebtn.config(command=lambda p=poi, v=desc_var, btn=savebtn: cb['save_desc_obj'](p, v, frame, btn))
+        row_widgets.append((poi, (cb_poi, copy_label, body_label, lat_label, lon_label, desc_entry, delbtn, savebtn, sharebtn)))
         table_row += 1
 
+    def filter_rows():
+        query = prefs_search_var.get().strip()
+        matches = None
+        if query:
+            matches = {id(poi) for poi in cb['search_pois'](query)}
+        for poi, widgets in row_widgets:
+            visible = matches is None or id(poi) in matches
+            for widget in widgets:
+                if visible:
+                    widget.grid()
+                else:
+                    widget.grid_remove()
+
+    if prefs_search_var is not None:
+        bind_search(prefs_search_entry, prefs_search_var, filter_rows)
+        if prefs_search_var.get().strip():
+            filter_rows()
+
     # Column configuration
     table_frame.grid_columnconfigure(0, minsize=22, weight=0)
     table_frame.grid_columnconfigure(1, minsize=15, weight=0)
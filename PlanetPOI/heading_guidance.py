@@ -64,22 +64,34 @@ class HeadingGuidance:
         if not self.overlay:
             return
             
-        # Calculate shortest angular deviation (-180 to +180)
+        with overlay.batch():
+            # Calculate shortest angular deviation (-180 to +180)
+            deviation = self._calculate_deviation(current_heading, target_heading)
+        
+            # Clear old arrows first
+            self._clear_arrows()
+        
+            # If almost on course - show fine-tuning bar
+            if abs(deviation) <= self.on_course_threshold:
+                self._draw_center_circle(deviation)
+            # Otherwise show arrow in correct direction
+            elif deviation > 0:
+                # Need to turn right (positive deviation)
+                self._draw_right_arrow(deviation)
+            else:
+                # Need to turn left (negative deviation)
+                self._draw_left_arrow(abs(deviation))
+    
+    def display_key(self, current_heading, target_heading):
+        """
+        Returns a hashable summary of what update() would draw for these headings,
+        so callers can skip resending identical graphics
+        """
         deviation = self._calculate_deviation(current_heading, target_heading)
-        
-        # Clear old arrows first
-        self._clear_arrows()
-        
-        # If almost on course - show fine-tuning bar
         if abs(deviation) <= self.on_course_threshold:
-            self._draw_center_circle(deviation)
-        # Otherwise show arrow in correct direction
-        elif deviation > 0:
-            # Need to turn right (positive deviation)
-            self._draw_right_arrow(deviation)
-        else:
-            # Need to turn left (negative deviation)
-            self._draw_left_arrow(abs(deviation))
+            return ("center", self.center_x, self.center_y, self._calculate_bar_offset(deviation))
+        direction = "right" if deviation > 0 else "left"
+        return (direction, self.center_x, self.center_y, self._calculate_arrow_length(deviation))
     
     def show_checkmark(self):
         """
@@ -88,62 +100,63 @@ class HeadingGuidance:
         if not self.overlay:
             return
         
-        # Clear old arrows
-        self._clear_arrows()
-        
-        # Draw a green checkmark
-        # The checkmark consists of two lines forming a V-shape
-        check_size = 20
-        
-        # Left part of checkmark (lower left to middle)
-        left_start_x = self.center_x - check_size
-        left_start_y = self.center_y
-        left_end_x = self.center_x - 5
-        left_end_y = self.center_y + check_size
-        
-        # Right part of checkmark (middle to upper right)
-        right_start_x = left_end_x
-        right_start_y = left_end_y
-        right_end_x = self.center_x + check_size
-        right_end_y = self.center_y - check_size
-        
-        # Draw left line (thicker through multiple parallel lines)
-        for offset in range(-2, 3):
-            for step in range(20):
-                t = step / 20.0
-                x = int(left_start_x + (left_end_x - left_start_x) * t)
-                y = int(left_start_y + (left_end_y - left_start_y) * t) + offset
-                self.overlay.send_shape(
-                    f"checkmark-left-{step}-{offset}",
-                    "rect",
-                    "#00ff00",
-                    "#00ff00",
-                    x,
-                    y,
-                    2,
-                    2,
-                    self.ttl
-                )
-        
-        # Draw right line (thicker through multiple parallel lines)
-        for offset in range(-2, 3):
-            for step in range(30):
-                t = step / 30.0
-                x = int(right_start_x + (right_end_x - right_start_x) * t)
-                y = int(right_start_y + (right_end_y - right_start_y) * t) + offset
-                self.overlay.send_shape(
-                    f"checkmark-right-{step}-{offset}",
-                    "rect",
-                    "#00ff00",
-                    "#00ff00",
-                    x,
-                    y,
-                    2,
-                    2,
-                    self.ttl
-                )
-        
-        # Don't clear after drawing - checkmark stays visible
+        with overlay.batch():
+            # Clear old arrows
+            self._clear_arrows()
+        
+            # Draw a green checkmark
+            # The checkmark consists of two lines forming a V-shape
+            check_size = 20
+        
+            # Left part of checkmark (lower left to middle)
+            left_start_x = self.center_x - check_size
+            left_start_y = self.center_y
+            left_end_x = self.center_x - 5
+            left_end_y = self.center_y + check_size
+        
+            # Right part of checkmark (middle to upper right)
+            right_start_x = left_end_x
+            right_start_y = left_end_y
+            right_end_x = self.center_x + check_size
+            right_end_y = self.center_y - check_size
+        
+            # Draw left line (thicker through multiple parallel lines)
+            for offset in range(-2, 3):
+                for step in range(20):
+                    t = step / 20.0
+                    x = int(left_start_x + (left_end_x - left_start_x) * t)
+                    y = int(left_start_y + (left_end_y - left_start_y) * t) + offset
+                    self.overlay.send_shape(
+                        f"checkmark-left-{step}-{offset}",
+                        "rect",
+                        "#00ff00",
+                        "#00ff00",
+                        x,
+                        y,
+                        2,
+                        2,
+                        self.ttl
+                    )
+        
+            # Draw right line (thicker through multiple parallel lines)
+            for offset in range(-2, 3):
+                for step in range(30):
+                    t = step / 30.0
+                    x = int(right_start_x + (right_end_x - right_start_x) * t)
+                    y = int(right_start_y + (right_end_y - right_start_y) * t) + offset
+                    self.overlay.send_shape(
+                        f"checkmark-right-{step}-{offset}",
+                        "rect",
+                        "#00ff00",
+                        "#00ff00",
+                        x,
+                        y,
+                        2,
+                        2,
+                        self.ttl
+                    )
+        
+            # Don't clear after drawing - checkmark stays visible
     
     def _calculate_deviation(self, current, target):
         """
@@ -182,6 +195,22 @@ class HeadingGuidance:
         
         return int(length)
     
+    def _calculate_bar_offset(self, deviation, max_offset=50):
+        """
+        Calculates horizontal offset of the fine-tuning bar
+        
+        Args:
+            deviation: Current deviation in degrees
+            max_offset: Maximum pixels to move left/right
+            
+        Returns:
+            Offset in pixels, clamped to +/- max_offset
+        """
+        if abs(deviation) > 0:
+            offset = int((deviation / self.on_course_threshold) * max_offset)
+            return max(-max_offset, min(max_offset, offset))
+        return 0
+    
     def _draw_left_arrow(self, deviation):
         """
         Draws a left arrow pointing left
@@ -292,11 +321,7 @@ class HeadingGuidance:
         # Calculate horizontal offset based on deviation
         # Negative deviation (too far left) = move bar left
         # Positive deviation (too far right) = move bar right
-        if abs(deviation) > 0:
-            offset = int((deviation / self.on_course_threshold) * max_offset)
-            offset = max(-max_offset, min(max_offset, offset))  # Clamp to ±50px
-        else:
-            offset = 0
+        offset = self._calculate_bar_offset(deviation, max_offset)
         
         # Calculate X position (offset moves bar in same direction as deviation)
         x_pos = self.center_x - width // 2 + offset
@@ -378,7 +403,8 @@ class HeadingGuidance:
         """
         if not self.overlay:
             return
-        self._clear_arrows()
+        with overlay.batch():
+            self._clear_arrows()
 
 
 # ============================================================================
@@ -0,0 +1,251 @@
+"""
+Journal ingest module for EDMC-PlanetPOI
+Turns surface events in old Journal.*.log files into POIs, one file per worker process
+
+Touchdown and CodexEntry carry their own coordinates and become POIs.
+ScanOrganic and Disembark have no coordinates in the journal: a logged
+species is added to the description of the POI at the last known position on
+the same body, and Disembark only tracks which body the commander is on.
+"""
+
+import glob
+import json
+import os
+import queue
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from PlanetPOI.poi_manager import split_system_and_body
+
+
+JOURNAL_PATTERN = "Journal.*.log"
+DEFAULT_FOLDER_NAME = "Journal POIs"
+
+# Events that change system or body, or describe a place on the surface
+LOCATION_EVENTS = frozenset(("Location", "FSDJump", "CarrierJump"))
+BODY_EVENTS = frozenset(("ApproachBody", "Touchdown", "Liftoff", "Disembark", "Embark"))
+POI_EVENTS = frozenset(("Touchdown", "CodexEntry", "ScanOrganic"))
+INGEST_EVENTS = LOCATION_EVENTS | BODY_EVENTS | POI_EVENTS
+
+_EVENT_MARKER = b'"event":"'
+
+
+def event_name(line):
+    """Event name straight from the raw line, so other lines skip json.loads"""
+    start = line.find(_EVENT_MARKER)
+    if start < 0:
+        return None
+    start += len(_EVENT_MARKER)
+    end = line.find(b'"', start)
+    if end < 0:
+        return None
+    return line[start:end].decode("ascii", "replace")
+
+
+def _make_poi(system, full_body, lat, lon, description):
+    # Full body names start with the system name, but system names may contain spaces
+    if system and full_body.startswith(system + " "):
+        body = full_body[len(system) + 1:]
+    else:
+        system, body = split_system_and_body(full_body)
+    return {
+        "type": "poi",
+        "system": system,
+        "body": body,
+        "lat": round(float(lat), 6),
+        "lon": round(float(lon), 6),
+        "description": description,
+        "notes": "",
+        "active": False  # Hundreds of old landings should not all show up in the overlay
+    }
+
+
+def scan_journal_file(path):
+    """
+    Stream one journal file and return (pois, stats).
+    Reads line by line in binary mode; only lines whose event is relevant are parsed.
+    """
+    stats = {"lines": 0, "parsed": 0, "errors": 0}
+    pois = []
+    system = None
+    bodies = {}          # BodyID -> full body name in the current system
+    current_body = None  # Full name of the body the commander is on or near
+    last_position = {}   # Full body name -> (lat, lon)
+    last_poi = {}        # Full body name -> POI created at last_position
+
+    with open(path, "rb") as fp:
+        for line in fp:
+            stats["lines"] += 1
+            event = event_name(line)
+            if event not in INGEST_EVENTS:
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                stats["errors"] += 1
+                continue
+            stats["parsed"] += 1
+
+            if event in LOCATION_EVENTS:
+                if entry.get("StarSystem") != system:
+                    system = entry.get("StarSystem")
+                    bodies = {}
+                current_body = entry.get("Body") if entry.get("BodyType") == "Planet" else None
+                if entry.get("BodyID") is not None and entry.get("Body"):
+                    bodies[entry["BodyID"]] = entry["Body"]
+                continue
+
+            if event in BODY_EVENTS and entry.get("Body"):
+                current_body = entry["Body"]
+                if entry.get("BodyID") is not None:
+                    bodies[entry["BodyID"]] = entry["Body"]
+                if entry.get("StarSystem"):
+                    system = entry["StarSystem"]
+
+            if event == "Touchdown":
+                lat, lon = entry.get("Latitude"), entry.get("Longitude")
+                if current_body and lat is not None and lon is not None:
+                    poi = _make_poi(system, current_body, lat, lon, "Touchdown")
+                    pois.append(poi)
+                    last_position[current_body] = (lat, lon)
+                    last_poi[current_body] = poi
+            elif event == "Liftoff":
+                lat, lon = entry.get("Latitude"), entry.get("Longitude")
+                if current_body and lat is not None and lon is not None:
+                    last_position[current_body] = (lat, lon)
+                    last_poi.pop(current_body, None)
+            elif event == "CodexEntry":
+                lat, lon = entry.get("Latitude"), entry.get("Longitude")
+                full_body = bodies.get(entry.get("BodyID")) or current_body
+                if full_body and lat is not None and lon is not None:
+                    name = entry.get("Name_Localised") or entry.get("Name") or "Codex entry"
+                    poi = _make_poi(entry.get("System") or system, full_body, lat, lon, name)
+                    pois.append(poi)
+                    last_position[full_body] = (lat, lon)
+                    last_poi[full_body] = poi
+            elif event == "ScanOrganic" and entry.get("ScanType") == "Log":
+                # "Body" is a BodyID here
+                full_body = bodies.get(entry.get("Body")) or current_body
+                if not full_body or full_body not in last_position:
+                    continue
+                species = entry.get("Species_Localised") or entry.get("Species") or "Organic"
+                poi = last_poi.get(full_body)
+                if poi is None:
+                    lat, lon = last_position[full_body]
+                    poi = _make_poi(system, full_body, lat, lon, species)
+                    pois.append(poi)
+                    last_poi[full_body] = poi
+                elif species not in poi["description"]:
+                    poi["description"] = f"{poi['description']}, {species}"
+    return pois, stats
+
+
+def find_journal_files(directory):
+    """Journal files in a directory, oldest first (the names sort by date)"""
+    return sorted(glob.glob(os.path.join(directory, JOURNAL_PATTERN)))
+
+
+def _make_executor(workers):
+    """
+    Process pool for real parallel parsing. Threads inside a frozen EDMC,
+    where starting a process would launch another copy of the application.
+    """
+    if not getattr(sys, "frozen", False):
+        try:
+            return ProcessPoolExecutor(max_workers=workers)
+        except (OSError, NotImplementedError, ImportError) as ex:
+            print(f"PPOI: Process pool unavailable, using threads: {ex}")
+    return ThreadPoolExecutor(max_workers=workers)
+
+
+class JournalIngestJob(threading.Thread):
+    """
+    Background scan of a journal directory.
+    Uses the same message protocol as poi_io.ImportJob; the "done" payload is
+    the list of POIs in journal order. Nothing is committed by the job.
+    """
+
+    def __init__(self, directory, workers=None):
+        threading.Thread.__init__(self, name="planetpoi-JournalIngestJob", daemon=True)
+        self.directory = directory
+        self.workers = workers or min(8, os.cpu_count() or 1)
+        self.messages = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.stats = {"files": 0, "pois": 0, "lines": 0, "errors": 0}
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        try:
+            files = find_journal_files(self.directory)
+            if not files:
+                self.messages.put(("done", [], dict(self.stats)))
+                return
+            results = [None] * len(files)
+            with _make_executor(self.workers) as executor:
+                futures = {executor.submit(scan_journal_file, path): idx for idx, path in enumerate(files)}
+                for future in as_completed(futures):
+                    if self.cancel_event.is_set():
+                        for pending in futures:
+                            pending.cancel()
+                        self.messages.put(("cancelled", None, dict(self.stats)))
+                        return
+                    idx = futures[future]
+                    try:
+                        pois, file_stats = future.result()
+                    except Exception as ex:
+                        print(f"PPOI: Error reading {files[idx]}: {ex}")
+                        self.stats["errors"] += 1
+                        pois, file_stats = [], {}
+                    results[idx] = pois
+                    self.stats["files"] += 1
+                    self.stats["pois"] += len(pois)
+                    self.stats["lines"] += file_stats.get("lines", 0)
+                    self.stats["errors"] += file_stats.get("errors", 0)
+                    self.messages.put(("progress", self.stats["files"] / len(files), dict(self.stats)))
+            # Keep journal order, so the oldest visit of a place wins the dedupe
+            items = [poi for pois in results if pois for poi in pois]
+            self.messages.put(("done", items, dict(self.stats)))
+        except Exception as ex:
+            self.messages.put(("error", str(ex), dict(self.stats)))
+
+
+if __name__ == "__main__":
+    # Benchmark: python -m PlanetPOI.journal_ingest [journal dir]
+    import shutil
+    import tempfile
+    import time
+
+    directory = sys.argv[1] if len(sys.argv) > 1 else None
+    synthetic = directory is None
+    if synthetic:
+        # Synthetic journals: mostly noise lines, a landing with a codex entry and a bio scan now and then
+        directory = tempfile.mkdtemp(prefix="ppoi-journals-")
+        noise = json.dumps({"timestamp": "2024-01-01T00:00:00Z", "event": "ReceiveText", "From": "x", "Message": "y" * 120, "Channel": "npc"}, separators=(",", ":"))
+        for file_no in range(40):
+            with open(os.path.join(directory, f"Journal.2024-01-{file_no % 28 + 1:02d}T{file_no:06d}.01.log"), "w") as fp:
+                for visit in range(200):
+                    body = f"Synth {file_no}-{visit} A 1"
+                    fp.write(json.dumps({"event": "FSDJump", "StarSystem": f"Synth {file_no}-{visit}", "Body": f"Synth {file_no}-{visit} A", "BodyType": "Star"}, separators=(",", ":")) + "\n")
+                    fp.write((noise + "\n") * 50)
+                    fp.write(json.dumps({"event": "Touchdown", "StarSystem": f"Synth {file_no}-{visit}", "Body": body, "BodyID": 5, "Latitude": visit * 0.1, "Longitude": file_no * 0.1}, separators=(",", ":")) + "\n")
+                    fp.write(json.dumps({"event": "ScanOrganic", "ScanType": "Log", "Body": 5, "Species_Localised": "Bacterium Aurasus"}, separators=(",", ":")) + "\n")
+                    fp.write(json.dumps({"event": "CodexEntry", "BodyID": 5, "Name_Localised": "Crystalline Shards", "Latitude": visit * 0.1 + 1, "Longitude": 3.0}, separators=(",", ":")) + "\n")
+                    fp.write((noise + "\n") * 50)
+
+    size = sum(os.path.getsize(path) for path in find_journal_files(directory))
+    for workers in sorted({1, os.cpu_count() or 1}):
+        job = JournalIngestJob(directory, workers)
+        t0 = time.perf_counter()
+        job.run()
+        elapsed = time.perf_counter() - t0
+        while True:
+            kind, payload, stats = job.messages.get()
+            if kind != "progress":
+                break
+        print(f"{workers:>2} workers: {stats['files']} files, {size / 1e6:.1f} MB, {stats['lines']} lines, "
+              f"{len(payload or [])} POIs in {elapsed:.2f} s ({size / 1e6 / elapsed:.0f} MB/s)")
+    if synthetic:
+        shutil.rmtree(directory)
@@ -0,0 +1,34 @@
+"""
+Navigation core for EDMC-PlanetPOI
+Target selection, guidance state and text formatting without Tk or overlay
+dependencies, so it can be benchmarked or run outside the Tk thread.
+load.py and gui_builder.py render its results.
+"""
+
+from PlanetPOI.navigation.model import (
+    Position,
+    OverlayFrame,
+    GuidanceDisplay,
+    GeofenceEvent,
+    GUIDANCE_CLEAR,
+    GUIDANCE_CHECKMARK,
+    GUIDANCE_ARROW,
+    GEOFENCE_ENTER,
+    GEOFENCE_EXIT
+)
+from PlanetPOI.navigation.formatting import (
+    poi_description,
+    format_bearing_distance,
+    format_overlay_row,
+    format_target_label
+)
+from PlanetPOI.navigation.guidance import calculate_deviation, guidance_arrows, describe_guidance
+from PlanetPOI.navigation.targeting import (
+    TargetTracker,
+    TARGET_MODE_FIRST,
+    TARGET_MODE_NEAREST,
+    TARGET_MODE_ROUTE,
+    TARGET_MODES
+)
+from PlanetPOI.navigation.geofence import Geofence, poi_radius
+from PlanetPOI.navigation.engine import NavigationEngine
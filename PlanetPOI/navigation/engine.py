@@ -0,0 +1,149 @@
+"""
+Navigation engine for EDMC-PlanetPOI
+Turns position, settings and POIs into overlay and GUI render commands
+"""
+
+from PlanetPOI.calculations import calculate_bearing_and_distance
+from PlanetPOI.navigation.formatting import format_overlay_row
+from PlanetPOI.navigation.geofence import Geofence
+from PlanetPOI.navigation.guidance import describe_guidance
+from PlanetPOI.navigation.model import (
+    OverlayFrame, GUIDANCE_ARROW, GUIDANCE_CHECKMARK, GUIDANCE_CLEAR, GEOFENCE_ENTER, GEOFENCE_EXIT
+)
+from PlanetPOI.navigation.targeting import TargetTracker
+
+
+class NavigationEngine:
+    """
+    Holds the guidance state between ticks:
+    - target: POI guidance points at
+    - geofence: which POI fences the commander is inside; entering one marks
+      the POI reached, so the target advances
+    - arrived: the target whose fence was just entered - the checkmark is
+      shown once, then no guidance until that fence is left
+    - gui_guidance_visible: EDMC GUI currently has guidance widgets
+    No Tk or overlay calls - callers render the returned frames.
+    """
+
+    def __init__(self):
+        self.targets = TargetTracker()
+        self.geofence = Geofence()
+        self.target = None
+        self.arrived = None
+        self.gui_guidance_visible = False
+
+    def reset(self):
+        """Left the body - forget all guidance state"""
+        self.target = None
+        self.arrived = None
+        self.geofence.reset()
+        self.gui_guidance_visible = False
+
+    def select_target(self, position, settings, pois, revision):
+        """Select and remember the guidance target for this position"""
+        self.target = self.targets.select(settings.target_mode, position, pois, revision)
+        return self.target
+
+    def update_geofence(self, position, settings, pois, revision):
+        """
+        Move the fences to this position and return (events, arrived_now).
+        Entered POIs count as reached; arrived_now is True if the current
+        target was one of them.
+        """
+        self.targets.sync(position, pois, revision)
+        events = self.geofence.update(position, pois, revision, settings.guidance_distance)
+        arrived_now = False
+        for event in events:
+            if event.kind == GEOFENCE_ENTER:
+                self.targets.mark_reached(event.poi)
+                if event.poi is self.target:
+                    self.arrived = event.poi
+                    arrived_now = True
+            elif event.kind == GEOFENCE_EXIT and event.poi is self.arrived:
+                self.arrived = None
+        return events, arrived_now
+
+    def compute_overlay(self, position, settings, pois, revision):
+        """
+        Overlay rows, heading guidance and geofence events for one tick.
+        `pois` are the active POIs on the body in tree order.
+        """
+        events, arrived_now = self.update_geofence(position, settings, pois, revision)
+        target = self.select_target(position, settings, pois, revision)
+        if not pois:
+            return OverlayFrame(events=tuple(events))
+
+        rows, target_bearing = self._rows(position, settings, pois, revision, target)
+
+        guidance = GUIDANCE_CLEAR
+        if settings.heading_guidance and position.heading is not None:
+            if arrived_now:
+                # Just reached the target - show checkmark once, then nothing until its fence is left
+                guidance = GUIDANCE_CHECKMARK
+            elif self.arrived is None and target_bearing is not None:
+                guidance = GUIDANCE_ARROW
+
+        return OverlayFrame(
+            rows=tuple(rows),
+            guidance=guidance,
+            heading=position.heading,
+            bearing=target_bearing,
+            info_text=_info_text(rows, settings),
+            events=tuple(events)
+        )
+
+    def compute_info_text(self, position, settings, pois, revision):
+        """
+        The overlay rows as GUI text, for refreshing the GUI between ticks
+        (e.g. after a POI was toggled). Keeps the current target and does not
+        update geofences, so it never produces events.
+        """
+        if not pois:
+            return ""
+        target = self.target if any(poi is self.target for poi in pois) else None
+        rows, _ = self._rows(position, settings, pois, revision, target)
+        return _info_text(rows, settings)
+
+    def _rows(self, position, settings, pois, revision, target):
+        """(overlay rows as (text, is_target), bearing to the target or None)"""
+        row_pois = self.targets.row_pois(
+            settings.target_mode, position, pois, revision, target, settings.max_overlay_rows
+        )
+
+        rows = []
+        target_bearing = None
+        for poi in row_pois:
+            distance, bearing = calculate_bearing_and_distance(
+                position.lat, position.lon,
+                poi.get("lat"), poi.get("lon"),
+                position.planet_radius,
+                position.altitude, 0,  # alt1 = current, alt2 = 0
+                calc_with_altitude=settings.calc_with_altitude
+            )
+            is_target = poi is target
+            if is_target:
+                target_bearing = bearing
+            rows.append((format_overlay_row(poi, bearing, distance), is_target and settings.heading_guidance))
+        return rows, target_bearing
+
+    def compute_gui(self, position, settings):
+        """
+        Guidance texts for the EDMC GUI towards the current target.
+        Returns (GuidanceDisplay or None, rebuild) where rebuild is True when
+        guidance widgets must be added or removed.
+        """
+        if not settings.show_gui_info or position.heading is None or self.target is None:
+            return None, False
+        display = describe_guidance(position, self.target, settings)
+        if display is None:
+            return None, False
+        rebuild = display.show_guidance != self.gui_guidance_visible
+        self.gui_guidance_visible = display.show_guidance
+        return display, rebuild
+
+
+def _info_text(rows, settings):
+    """GUI copy of the overlay rows, limited to the max rows setting"""
+    max_rows = settings.max_overlay_rows
+    info_rows = rows[:max_rows] if max_rows > 0 else rows
+    return "\n".join(text for text, _ in info_rows)
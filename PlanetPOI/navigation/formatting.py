@@ -0,0 +1,35 @@
+"""
+Text formatting for EDMC-PlanetPOI navigation
+"""
+
+from PlanetPOI.calculations import format_distance_with_unit
+
+
+def poi_description(poi):
+    """Description of a POI, or its coordinates if it has none"""
+    desc = poi.get("description", "")
+    if desc:
+        return desc
+    lat = poi.get("lat")
+    lon = poi.get("lon")
+    if lat not in ["", None] and lon not in ["", None]:
+        return f"{lat:.4f}, {lon:.4f}"
+    return "(No description)"
+
+
+def format_bearing_distance(bearing, distance):
+    """Format as "<bearing>°/ <distance><unit>", whole meters or one decimal for km/Mm"""
+    show_dist, unit = format_distance_with_unit(distance)
+    if unit == "m":
+        return f"{round(bearing)}°/ {round(show_dist)}{unit}"
+    return f"{round(bearing)}°/ {show_dist:.1f}{unit}"
+
+
+def format_overlay_row(poi, bearing, distance):
+    """Overlay row: bearing and distance first, then description"""
+    return f"{format_bearing_distance(bearing, distance)} {poi_description(poi)}"
+
+
+def format_target_label(poi, bearing, distance):
+    """EDMC GUI target label: description first, then bearing and distance"""
+    return f"{poi_description(poi)} - {format_bearing_distance(bearing, distance)}"
@@ -0,0 +1,192 @@
+"""
+Geofences for EDMC-PlanetPOI navigation
+A circular fence around every POI on the current body, with enter/exit
+events. Fences are bucketed in 3D grids over unit vectors, so a tick only
+looks at the fences in the cells around the commander, however many POIs
+the body has. Each grid level has cells LEVEL_FACTOR times larger than the
+one below, and a fence goes into the finest level whose cells are at least
+as large as the fence, so a few large fences do not coarsen the grid for all.
+When the POIs change only the fences whose POI, position or radius changed
+are replaced, so a save (e.g. auto-deactivating the POI just reached) does
+not rebuild every fence on the body.
+"""
+
+import math
+
+from PlanetPOI.navigation.model import GeofenceEvent, GEOFENCE_ENTER, GEOFENCE_EXIT
+from PlanetPOI.spatial_index import to_unit_vector, chord_to_distance
+
+
+# Cell edge ratio between grid levels
+LEVEL_FACTOR = 4
+# Smallest cell edge (unit sphere), so a zero radius does not divide by zero
+MIN_CELL = 1e-9
+
+
+def poi_radius(poi, default_radius):
+    """Fence radius of a POI in metres: its own "radius" if set, else the default"""
+    try:
+        radius = float(poi.get("radius") or 0)
+    except (TypeError, ValueError):
+        radius = 0
+    return radius if radius > 0 else default_radius
+
+
+def distance_to_chord(distance_m, planet_radius_m):
+    """Chord length on the unit sphere for a surface distance"""
+    angle = min(distance_m / planet_radius_m, math.pi)
+    return 2 * math.sin(angle / 2)
+
+
+class Fence:
+    """One POI's fence: entered within radius, left beyond the (larger) exit radius"""
+
+    __slots__ = ("poi", "spec", "point", "enter_sq", "exit_sq", "exit_chord", "cell")
+
+    def __init__(self, poi, spec, point, enter_chord, exit_chord):
+        self.poi = poi
+        self.spec = spec  # (lat, lon, radius) as stored in the POI when the fence was built
+        self.point = point
+        self.enter_sq = enter_chord * enter_chord
+        self.exit_sq = exit_chord * exit_chord
+        self.exit_chord = exit_chord
+        self.cell = None  # (level, cell) the fence is bucketed in
+
+    def chord_sq(self, point):
+        dx = self.point[0] - point[0]
+        dy = self.point[1] - point[1]
+        dz = self.point[2] - point[2]
+        return dx * dx + dy * dy + dz * dz
+
+
+class Geofence:
+    """
+    Inside/outside state of every POI fence on one body.
+    A fence is entered within the POI's radius and only left again beyond
+    radius + max(hysteresis_m, hysteresis_ratio * radius), so standing on the
+    edge does not produce a stream of events.
+    """
+
+    def __init__(self, hysteresis_m=20, hysteresis_ratio=0.1):
+        self.hysteresis_m = hysteresis_m
+        self.hysteresis_ratio = hysteresis_ratio
+        self._key = None
+        self._revision = None
+        self._base = MIN_CELL
+        self._fences = {}   # id(poi) -> Fence
+        self._levels = {}   # level -> (cell edge, {cell: [Fence]})
+        self._inside = {}   # id(poi) -> Fence the commander is inside
+
+    def reset(self):
+        """Left the body - forget all fence states without events"""
+        self._key = None
+        self._revision = None
+        self._inside = {}
+
+    def is_inside(self, poi):
+        return id(poi) in self._inside
+
+    def update(self, position, pois, revision, default_radius):
+        """
+        Move to a new position and return its GeofenceEvents: exits first,
+        then enters, nearest first. `pois` are the active POIs on the body.
+        All fences are rebuilt when body or radii change; when only the
+        revision changes, just the fences of changed POIs are.
+        """
+        key = (position.body, position.planet_radius, default_radius)
+        if key != self._key:
+            if self._key is None or self._key[0] != position.body:
+                self._inside = {}
+            default_exit = default_radius + max(self.hysteresis_m, self.hysteresis_ratio * default_radius)
+            self._base = max(distance_to_chord(default_exit, position.planet_radius), MIN_CELL)
+            self._fences = {}
+            self._levels = {}
+            self._key = key
+            self._revision = None
+        if revision != self._revision:
+            self._sync(pois, position.planet_radius, default_radius)
+            self._revision = revision
+
+        point = to_unit_vector(position.lat, position.lon)
+        events = []
+        for poi_key, fence in list(self._inside.items()):
+            chord_sq = fence.chord_sq(point)
+            if chord_sq > fence.exit_sq:
+                del self._inside[poi_key]
+                events.append(GeofenceEvent(GEOFENCE_EXIT, fence.poi, chord_to_distance(chord_sq, position.planet_radius)))
+
+        entered = []
+        for fence in self._candidates(point):
+            if id(fence.poi) in self._inside:
+                continue
+            chord_sq = fence.chord_sq(point)
+            if chord_sq <= fence.enter_sq:
+                self._inside[id(fence.poi)] = fence
+                entered.append((chord_sq, fence.poi))
+        entered.sort(key=lambda item: item[0])
+        events.extend(GeofenceEvent(GEOFENCE_ENTER, poi, chord_to_distance(chord_sq, position.planet_radius))
+                      for chord_sq, poi in entered)
+        return events
+
+    def _sync(self, pois, planet_radius, default_radius):
+        """Replace the fences of POIs that were added, removed, moved or resized"""
+        specs = {}
+        for poi in pois:
+            spec = (poi.get("lat"), poi.get("lon"), poi.get("radius"))
+            if spec[0] in ["", None] or spec[1] in ["", None]:
+                continue
+            specs[id(poi)] = (poi, spec)
+
+        for poi_key, fence in list(self._fences.items()):
+            poi, spec = specs.get(poi_key, (None, None))
+            if poi is not fence.poi or spec != fence.spec:
+                self._remove(fence)
+                del self._fences[poi_key]
+        for poi_key, (poi, spec) in specs.items():
+            if poi_key not in self._fences:
+                self._fences[poi_key] = self._add(poi, spec, planet_radius, default_radius)
+
+        # Keep fences already entered; POIs that are gone keep their old fence until it is left
+        for poi_key in self._inside:
+            if poi_key in self._fences:
+                self._inside[poi_key] = self._fences[poi_key]
+
+    def _add(self, poi, spec, planet_radius, default_radius):
+        radius = poi_radius(poi, default_radius)
+        exit_radius = radius + max(self.hysteresis_m, self.hysteresis_ratio * radius)
+        fence = Fence(poi, spec, to_unit_vector(float(spec[0]), float(spec[1])), distance_to_chord(radius, planet_radius),
+                      distance_to_chord(exit_radius, planet_radius))
+
+        # Cells at least as large as the fences in them: a fence the commander
+        # is inside has its centre in one of the 27 cells around the commander
+        level = 0
+        while self._base * LEVEL_FACTOR ** level < fence.exit_chord:
+            level += 1
+        cell = self._base * LEVEL_FACTOR ** level
+        cells = self._levels.setdefault(level, (cell, {}))[1]
+        fence.cell = (level, _cell_of(fence.point, cell))
+        cells.setdefault(fence.cell[1], []).append(fence)
+        return fence
+
+    def _remove(self, fence):
+        level, key = fence.cell
+        cells = self._levels[level][1]
+        cells[key].remove(fence)
+        if not cells[key]:
+            del cells[key]
+            if not cells:
+                del self._levels[level]
+
+    def _candidates(self, point):
+        for cell, cells in self._levels.values():
+            cx, cy, cz = _cell_of(point, cell)
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    for dz in (-1, 0, 1):
+                        fences = cells.get((cx + dx, cy + dy, cz + dz))
+                        if fences:
+                            yield from fences
+
+
+def _cell_of(point, cell):
+    return (math.floor(point[0] / cell), math.floor(point[1] / cell), math.floor(point[2] / cell))
@@ -0,0 +1,70 @@
+"""
+Heading guidance calculations for EDMC-PlanetPOI navigation
+"""
+
+from PlanetPOI.calculations import calculate_bearing_and_distance
+from PlanetPOI.navigation.formatting import format_bearing_distance, format_target_label
+from PlanetPOI.navigation.geofence import poi_radius
+from PlanetPOI.navigation.model import GuidanceDisplay
+
+
+MAX_ARROWS = 4
+MAX_DEVIATION = 90  # Degrees off course that shows the maximum number of arrows
+
+
+def calculate_deviation(heading, bearing):
+    """Shortest turn from heading to bearing, -180..+180 (positive = turn right)"""
+    deviation = bearing - heading
+    while deviation > 180:
+        deviation -= 360
+    while deviation < -180:
+        deviation += 360
+    return deviation
+
+
+def guidance_arrows(deviation, threshold):
+    """Return (left_arrows, right_arrows, on_course) for the EDMC GUI guidance row"""
+    abs_deviation = abs(deviation)
+    on_course = abs_deviation <= threshold
+    num_arrows = 0
+    if not on_course:
+        arrow_fraction = min((abs_deviation - threshold) / max(MAX_DEVIATION - threshold, 1), 1.0)
+        num_arrows = min(int(arrow_fraction * MAX_ARROWS) + 1, MAX_ARROWS)
+    left_arrows = "<" * num_arrows if deviation < -threshold else ""
+    right_arrows = ">" * num_arrows if deviation > threshold else ""
+    return left_arrows, right_arrows, on_course
+
+
+def describe_guidance(position, target, settings):
+    """
+    Bearing, distance and GUI guidance texts from position to target POI.
+    Returns GuidanceDisplay, or None if the target has no coordinates.
+    """
+    poi_lat = target.get("lat")
+    poi_lon = target.get("lon")
+    if poi_lat in ["", None] or poi_lon in ["", None]:
+        return None
+
+    distance, bearing = calculate_bearing_and_distance(
+        position.lat, position.lon, poi_lat, poi_lon,
+        position.planet_radius, position.altitude, 0,
+        calc_with_altitude=settings.calc_with_altitude
+    )
+    # Guidance stops inside the POI's fence (its own radius, else the guidance stop distance)
+    show_guidance = distance >= poi_radius(target, settings.guidance_distance)
+    left_arrows = right_arrows = ""
+    on_course = False
+    if position.heading is not None:
+        deviation = calculate_deviation(position.heading, bearing)
+        left_arrows, right_arrows, on_course = guidance_arrows(deviation, settings.guidance_threshold)
+
+    return GuidanceDisplay(
+        distance=distance,
+        bearing=bearing,
+        target_label=format_target_label(target, bearing, distance),
+        show_guidance=show_guidance,
+        left_arrows=left_arrows,
+        center_text=format_bearing_distance(bearing, distance),
+        right_arrows=right_arrows,
+        on_course=on_course
+    )
@@ -0,0 +1,60 @@
+"""
+Navigation data types for EDMC-PlanetPOI
+Plain immutable values passed into and returned from the navigation engine
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+# What heading guidance on the overlay should show
+GUIDANCE_CLEAR = "clear"          # Nothing
+GUIDANCE_CHECKMARK = "checkmark"  # Just arrived within guidance stop distance
+GUIDANCE_ARROW = "arrow"          # Turn arrow or on-course bar towards the target
+
+# Geofence event kinds
+GEOFENCE_ENTER = "enter"
+GEOFENCE_EXIT = "exit"
+
+
+@dataclass(frozen=True)
+class Position:
+    """Commander position on a body, as reported by Status.json"""
+    body: str
+    lat: float
+    lon: float
+    altitude: float = 0
+    planet_radius: float = 1000000
+    heading: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class OverlayFrame:
+    """Everything the overlay shows for one tick"""
+    rows: tuple = ()               # (text, is_target) per POI row
+    guidance: str = GUIDANCE_CLEAR
+    heading: Optional[float] = None
+    bearing: Optional[float] = None  # Bearing to target, set for GUIDANCE_ARROW
+    info_text: str = ""            # Row texts for the EDMC GUI, limited to max rows
+    events: tuple = ()             # GeofenceEvents of this tick
+
+
+@dataclass(frozen=True)
+class GeofenceEvent:
+    """The commander crossed the fence around a POI"""
+    kind: str                      # GEOFENCE_ENTER or GEOFENCE_EXIT
+    poi: dict
+    distance: float                # Surface distance to the POI in metres
+
+
+@dataclass(frozen=True)
+class GuidanceDisplay:
+    """Bearing/distance to the target and the EDMC GUI guidance texts"""
+    distance: float
+    bearing: float
+    target_label: str              # "<description> - <bearing>°/ <distance>"
+    show_guidance: bool            # Outside guidance stop distance
+    left_arrows: str = ""
+    center_text: str = ""
+    right_arrows: str = ""
+    on_course: bool = False
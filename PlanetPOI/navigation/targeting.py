@@ -0,0 +1,119 @@
+"""
+Guidance target selection for EDMC-PlanetPOI navigation
+"""
+
+from PlanetPOI import route_planner
+from PlanetPOI.spatial_index import BodyIndexCache, TargetSelector
+
+
+TARGET_MODE_FIRST = "first"      # First unreached active POI in tree order
+TARGET_MODE_NEAREST = "nearest"  # Closest unreached active POI, with hysteresis
+TARGET_MODE_ROUTE = "route"      # Next unreached POI of a planned route
+TARGET_MODES = [TARGET_MODE_FIRST, TARGET_MODE_NEAREST, TARGET_MODE_ROUTE]
+
+
+class TargetTracker:
+    """
+    Chooses the guidance target and the order of overlay rows.
+    `pois` are the active POIs on the position's body in tree order, and
+    `revision` is any value that changes whenever those POIs may have changed.
+    POIs reported reached (geofence entered) are skipped, so the target
+    advances to the next one in every mode.
+    """
+
+    def __init__(self):
+        self.index_cache = BodyIndexCache()
+        self.selector = TargetSelector()
+        self.planner = route_planner.BackgroundRoutePlanner()
+        self.route_key = None      # (body, revision) the route was last checked for
+        self.route_ids = set()     # ids of the POIs the route may contain
+        self.route_order = []      # Planned route, or the stand-in while planning
+        self.route_pending = None  # Key of the plan being waited for
+        self.reached = set()  # ids of POIs reached on the current body
+        self._reached_key = None
+
+    def reset(self):
+        """Forget target and route (e.g. when the target mode changes)"""
+        self.selector.reset()
+        self.route_key = None
+        self.route_ids = set()
+        self.route_order = []
+        self.route_pending = None
+
+    def sync(self, position, pois, revision):
+        """Forget reached POIs on a new body, and those no longer among the POIs after an edit"""
+        key = (position.body, revision)
+        if self._reached_key == key:
+            return
+        if self._reached_key is None or self._reached_key[0] != position.body:
+            self.reached = set()
+        else:
+            # Keep progress across edits, but only for POIs that still exist
+            self.reached &= {id(poi) for poi in pois}
+        self._reached_key = key
+
+    def mark_reached(self, poi):
+        self.reached.add(id(poi))
+
+    def body_index(self, position, pois, revision):
+        """Spatial index of the POIs, rebuilt only when body or revision changes"""
+        return self.index_cache.get(position.body, revision, lambda: pois)
+
+    def remaining_route(self, position, pois, revision):
+        """
+        Unreached POIs of the planned route, in visiting order.
+        A route is planned on a worker thread from the current position when
+        POIs are added or the body changes; POIs that are removed or
+        deactivated just drop out. Until a plan arrives the previous route is
+        used, with new POIs after it in tree order.
+        """
+        key = (position.body, revision)
+        if self.route_key != key:
+            ids = {id(poi) for poi in pois}
+            if not ids <= self.route_ids:
+                remaining = [poi for poi in pois if id(poi) not in self.reached]
+                self.planner.request(key, position.lat, position.lon, remaining, position.planet_radius)
+                self.route_pending = key
+                routed = {id(poi) for poi in self.route_order}
+                self.route_order = ([poi for poi in self.route_order if id(poi) in ids]
+                                    + [poi for poi in pois if id(poi) not in routed])
+            self.route_ids = ids
+            self.route_key = key
+        if self.route_pending is not None:
+            route = self.planner.result(self.route_pending)
+            if route is not None:
+                self.route_order = route
+                self.route_pending = None
+        return [poi for poi in self.route_order if id(poi) in self.route_ids and id(poi) not in self.reached]
+
+    def select(self, mode, position, pois, revision):
+        """Return the POI guidance should point at, or None once every POI is reached"""
+        if not pois:
+            return None
+        if position is not None and mode == TARGET_MODE_NEAREST:
+            index = self.body_index(position, pois, revision)
+            if len(index):
+                return self.selector.select(index, position.lat, position.lon, position.planet_radius, skip=self.reached)
+        elif position is not None and mode == TARGET_MODE_ROUTE:
+            route = self.remaining_route(position, pois, revision)
+            # Route complete - no target until the POIs or body change
+            return route[0] if route else None
+        for poi in pois:
+            if id(poi) not in self.reached:
+                return poi
+        return None
+
+    def row_pois(self, mode, position, pois, revision, target, max_rows):
+        """POIs to show as overlay rows, in display order"""
+        if mode == TARGET_MODE_NEAREST:
+            # Only the closest max_rows POIs, already ordered by distance by the index
+            index = self.body_index(position, pois, revision)
+            rows = [poi for _, poi in index.k_nearest(position.lat, position.lon, max_rows if max_rows > 0 else len(index))]
+            # Hysteresis can keep a target that is no longer among the closest rows
+            if target is not None and rows and not any(poi is target for poi in rows):
+                rows[-1] = target
+            return rows
+        if mode == TARGET_MODE_ROUTE:
+            # Remaining route in visiting order, all POIs once the route is complete
+            return self.remaining_route(position, pois, revision) or pois
+        return pois
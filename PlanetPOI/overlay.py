@@ -1,5 +1,10 @@
 # overlay.py
+import json
 import sys
+import time
+from contextlib import contextmanager
+
+from PlanetPOI import settings
 
 # Store module reference - works regardless of whether imported as "overlay" or "PlanetPOI.overlay"
 this = sys.modules[__name__]
@@ -9,6 +14,135 @@ overlay = None
 overlay_available = False
 _connection_attempted = False  # Track if we've tried to connect
 
+# Unchanged items are resent once this share of their TTL has passed, before EDMCOverlay drops them
+REFRESH_RATIO = 0.5
+
+
+def _is_clear(msg):
+    """EDMCOverlay removes an item on ttl 0 or an empty text message"""
+    return msg.get("ttl") == 0 or ("shape" not in msg and not msg.get("text"))
+
+
+class FrameBatcher:
+    """
+    Wraps an EDMCOverlay client with the same send_message/send_shape/send_raw
+    methods. Inside frame() messages are queued and flushed as one sendall of
+    newline-delimited JSON, instead of one JSON line and syscall per message.
+    Outside a frame every message is written immediately.
+
+    Only changes are written: per message id the last message of a frame wins,
+    and it is skipped if EDMCOverlay already shows exactly that (resent after
+    REFRESH_RATIO of its TTL), or if it clears an id that shows nothing.
+    """
+
+    def __init__(self, client=None, clock=time.monotonic):
+        self.client = client
+        self.clock = clock
+        self._pending = {}  # message id (or a unique key without one) -> message
+        self._sent = {}     # message id -> (message, time) as last written
+        self._depth = 0
+        self.flushes = 0
+        self.messages = 0
+        self.skipped = 0
+
+    def set_client(self, client):
+        """Use a new connection - a restarted EDMCOverlay shows nothing, so everything is resent"""
+        self.client = client
+        self._sent.clear()
+
+    @contextmanager
+    def frame(self):
+        """Queue messages until the outermost frame ends, then flush them together"""
+        self._depth += 1
+        try:
+            yield self
+        finally:
+            self._depth -= 1
+            if self._depth == 0:
+                self.flush()
+
+    def send_raw(self, msg):
+        key = msg.get("id")
+        self._pending[object() if key is None else key] = msg
+        if self._depth == 0:
+            self.flush()
+
+    def send_message(self, msgid, text, color, x, y, ttl=4, size="normal"):
+        self.send_raw({"id": msgid, "color": color, "text": text, "size": size, "x": x, "y": y, "ttl": ttl})
+
+    def send_shape(self, shapeid, shape, color, fill, x, y, w, h, ttl):
+        self.send_raw({"id": shapeid, "shape": shape, "color": color, "fill": fill, "x": x, "y": y, "w": w, "h": h, "ttl": ttl})
+
+    def flush(self):
+        """Write all queued changes; a failed write drops the frame and reconnects on the next one"""
+        if not self._pending:
+            return
+        queued, self._pending = self._pending, {}
+        client = self.client
+        if client is None:
+            return
+        now = self.clock()
+        pending = [msg for msg in queued.values() if self._needs_send(msg, now)]
+        self.skipped += len(queued) - len(pending)
+        if not pending:
+            return
+        try:
+            if not hasattr(client, "connection"):
+                # Client without a reachable socket - fall back to one write per message
+                for msg in pending:
+                    client.send_raw(msg)
+            else:
+                if client.connection is None:
+                    client.connect()
+                payload = "".join(json.dumps(msg) + "\n" for msg in pending).encode("utf-8")
+                client.connection.sendall(payload)
+            self.flushes += 1
+            self.messages += len(pending)
+            for msg in pending:
+                if "id" in msg:
+                    self._sent[msg["id"]] = (msg, now)
+        except Exception as e:
+            print(f"EDMCOverlay: Failed to send {len(pending)} messages: {e}")
+            if hasattr(client, "connection"):
+                client.connection = None
+            # Unknown what EDMCOverlay got - resend everything after reconnecting
+            self._sent.clear()
+
+    def _needs_send(self, msg, now):
+        msg_id = msg.get("id")
+        if msg_id is None:
+            return True
+        last = self._sent.get(msg_id)
+        if last is None:
+            # Never drawn since connecting - clearing it changes nothing
+            return not _is_clear(msg)
+        sent, sent_at = last
+        ttl = sent.get("ttl")
+        if _is_clear(msg):
+            expired = ttl is not None and now - sent_at >= ttl
+            return not _is_clear(sent) and not expired
+        if sent != msg:
+            return True
+        return ttl is not None and now - sent_at >= ttl * REFRESH_RATIO
+
+
+# One batcher for the plugin lifetime, so HeadingGuidance keeps working across reconnects
+_batcher = FrameBatcher()
+
+
+def _connect_client():
+    """Connect a new EDMCOverlay client and return the batcher wrapping it"""
+    from edmcoverlay import Overlay
+    client = Overlay()
+    client.connect()
+    _batcher.set_client(client)
+    return _batcher
+
+
+def batch():
+    """Context manager that sends all overlay updates inside it as one frame"""
+    return _batcher.frame()
+
 def _try_connect():
     """Attempt to connect to EDMCOverlay - called lazily on first use"""
     global overlay, overlay_available, _connection_attempted, this
@@ -19,9 +153,7 @@ def _try_connect():
     _connection_attempted = True
     
     try:
-        from edmcoverlay import Overlay
-        overlay = Overlay()
-        overlay.connect()
+        overlay = _connect_client()
         overlay_available = True
         # Also set on this for backward compatibility
         this.overlay = overlay
@@ -46,18 +178,13 @@ ROW_Y_STEP = 24        # distance between rows
 
 OVERLAY_MAX_ROWS = 10
 OVERLAY_LEFT_MARGIN = 500
+NOTICE_TTL = 6         # seconds an arrival notice stays visible
 
 # New helper for overlay settings
 def get_overlay_settings():
-    try:
-        max_rows = int(config.get_int("planetpoi_max_overlay_rows", 5))
-    except Exception:
-        max_rows = 10
-    try:
-        leftmargin = int(config.get_int("planetpoi_overlay_leftmargin", 500))
-    except Exception:
-        leftmargin = 500
-    return max_rows, leftmargin
+    """Max rows and left margin from the current settings snapshot (no config read)"""
+    current = settings.current()
+    return current.max_overlay_rows, current.overlay_left_margin
 
 def set_overlay_settings(rows, margin):
     global OVERLAY_MAX_ROWS, OVERLAY_LEFT_MARGIN
@@ -76,32 +203,33 @@ def show_poi_rows(poi_texts, color="#ff7100"):
     if len(poi_texts) > OVERLAY_MAX_ROWS:
         poi_texts = poi_texts[:OVERLAY_MAX_ROWS]
 
-    for idx, text in enumerate(poi_texts):
-        y_pos = ROW_Y_START + idx * ROW_Y_STEP
-        message_id = f"poi_{idx}"
-        overlay.send_message(
-            msgid=message_id,
-            text=text,
-            color=color,
-            x=OVERLAY_LEFT_MARGIN,
-            y=y_pos,
-            ttl=30,  # TTL = 30 seconds (keeps overlay visible)
-            size="large"
-        )
+    with batch():
+        for idx, text in enumerate(poi_texts):
+            y_pos = ROW_Y_START + idx * ROW_Y_STEP
+            message_id = f"poi_{idx}"
+            overlay.send_message(
+                msgid=message_id,
+                text=text,
+                color=color,
+                x=OVERLAY_LEFT_MARGIN,
+                y=y_pos,
+                ttl=30,  # TTL = 30 seconds (keeps overlay visible)
+                size="large"
+            )
  
-    # Clear old overlays if there are fewer rows than before
-    for idx in range(len(poi_texts), OVERLAY_MAX_ROWS):
-        y_pos = ROW_Y_START + idx * ROW_Y_STEP
-        message_id = f"poi_{idx}"
-        overlay.send_message(
-            msgid=message_id,
-            text="",
-            color="#000000",
-            x=OVERLAY_LEFT_MARGIN,
-            y=y_pos,
-            ttl=8,  # TTL = 30 seconds (keeps overlay visible)
-            size="large"
-        )
+        # Clear old overlays if there are fewer rows than before
+        for idx in range(len(poi_texts), OVERLAY_MAX_ROWS):
+            y_pos = ROW_Y_START + idx * ROW_Y_STEP
+            message_id = f"poi_{idx}"
+            overlay.send_message(
+                msgid=message_id,
+                text="",
+                color="#000000",
+                x=OVERLAY_LEFT_MARGIN,
+                y=y_pos,
+                ttl=8,  # TTL = 30 seconds (keeps overlay visible)
+                size="large"
+            )
 
 def show_poi_rows_with_colors(poi_texts_with_colors):
     global OVERLAY_MAX_ROWS, OVERLAY_LEFT_MARGIN, overlay
@@ -117,34 +245,35 @@ def show_poi_rows_with_colors(poi_texts_with_colors):
     if len(poi_texts_with_colors) > OVERLAY_MAX_ROWS:
         poi_texts_with_colors = poi_texts_with_colors[:OVERLAY_MAX_ROWS]
 
-    for idx, (text, is_target) in enumerate(poi_texts_with_colors):
-        y_pos = ROW_Y_START + idx * ROW_Y_STEP
-        message_id = f"poi_{idx}"
-        # Target POI is orange, others are gray
-        color = "#ff7100" if is_target else "#888888"
-        overlay.send_message(
-            msgid=message_id,
-            text=text,
-            color=color,
-            x=OVERLAY_LEFT_MARGIN,
-            y=y_pos,
-            ttl=30,
-            size="large"
-        )
+    with batch():
+        for idx, (text, is_target) in enumerate(poi_texts_with_colors):
+            y_pos = ROW_Y_START + idx * ROW_Y_STEP
+            message_id = f"poi_{idx}"
+            # Target POI is orange, others are gray
+            color = "#ff7100" if is_target else "#888888"
+            overlay.send_message(
+                msgid=message_id,
+                text=text,
+                color=color,
+                x=OVERLAY_LEFT_MARGIN,
+                y=y_pos,
+                ttl=30,
+                size="large"
+            )
  
-    # Clear old overlays if there are fewer rows than before
-    for idx in range(len(poi_texts_with_colors), OVERLAY_MAX_ROWS):
-        y_pos = ROW_Y_START + idx * ROW_Y_STEP
-        message_id = f"poi_{idx}"
-        overlay.send_message(
-            msgid=message_id,
-            text="",
-            color="#000000",
-            x=OVERLAY_LEFT_MARGIN,
-            y=y_pos,
-            ttl=8,
-            size="large"
-        )
+        # Clear old overlays if there are fewer rows than before
+        for idx in range(len(poi_texts_with_colors), OVERLAY_MAX_ROWS):
+            y_pos = ROW_Y_START + idx * ROW_Y_STEP
+            message_id = f"poi_{idx}"
+            overlay.send_message(
+                msgid=message_id,
+                text="",
+                color="#000000",
+                x=OVERLAY_LEFT_MARGIN,
+                y=y_pos,
+                ttl=8,
+                size="large"
+            )
 
 def show_message(message_id, text, color="#ff7100", x=2, y=2, size=8, font_weight="normal"):
     """
@@ -164,24 +293,41 @@ def show_message(message_id, text, color="#ff7100", x=2, y=2, size=8, font_weigh
 
 
 
+def show_notice(text, color="#00ff00"):
+    """
+    Shows a short-lived notice (e.g. "Arrived at ...") below the POI rows and heading guidance.
+    """
+    global overlay
+    if ensure_overlay():
+        overlay.send_message(
+            msgid="poi_notice",
+            text=text,
+            color=color,
+            x=OVERLAY_LEFT_MARGIN,
+            y=ROW_Y_START + OVERLAY_MAX_ROWS * ROW_Y_STEP + 80,
+            ttl=NOTICE_TTL,
+            size="large"
+        )
+
 def clear_all_poi_rows():
     global OVERLAY_MAX_ROWS, OVERLAY_LEFT_MARGIN, overlay
     """
     Clears all POI rows in overlay.
     """
-    for idx in range(OVERLAY_MAX_ROWS):
-        y_pos = ROW_Y_START + idx * ROW_Y_STEP
-        message_id = f"poi_{idx}"
-        if ensure_overlay():
-            overlay.send_message(
-                msgid=message_id,
-                text="",
-                color="#000000",
-                x=OVERLAY_LEFT_MARGIN,
-                y=y_pos,
-                ttl=8,  # TTL = 30 seconds (keeps overlay visible)
-                size="large"
-            )
+    with batch():
+        for idx in range(OVERLAY_MAX_ROWS):
+            y_pos = ROW_Y_START + idx * ROW_Y_STEP
+            message_id = f"poi_{idx}"
+            if ensure_overlay():
+                overlay.send_message(
+                    msgid=message_id,
+                    text="",
+                    color="#000000",
+                    x=OVERLAY_LEFT_MARGIN,
+                    y=y_pos,
+                    ttl=8,  # TTL = 30 seconds (keeps overlay visible)
+                    size="large"
+                )
 
 def ensure_overlay():
     global overlay, overlay_available, _connection_attempted
@@ -196,9 +342,7 @@ def ensure_overlay():
     
     # Not available - try to reconnect
     try:
-        from edmcoverlay import Overlay
-        overlay = Overlay()
-        overlay.connect()
+        overlay = _connect_client()
         overlay_available = True
         this.overlay = overlay
         this.overlay_available = True
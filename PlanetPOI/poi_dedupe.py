@@ -0,0 +1,130 @@
+"""
+Duplicate detection module for EDMC-PlanetPOI
+Finds near-duplicate POIs in O(1) per lookup using a quantized lat/lon cell hash
+"""
+
+import math
+
+from PlanetPOI.calculations import calculate_bearing_and_distance
+from PlanetPOI.poi_manager import get_all_pois_flat
+
+
+# Default distance (degrees of arc) within which two POIs on the same body are the same place
+DEFAULT_TOLERANCE_DEG = 0.001
+
+# Merge policies for imported duplicates
+POLICY_SKIP = "skip"        # Drop the imported POI
+POLICY_UPDATE = "update"    # Keep the existing POI, take description/notes from the import
+POLICY_KEEP = "keep"        # Import it anyway
+
+# Radius that makes calculate_bearing_and_distance return degrees of arc
+_DEGREES_RADIUS = 180 / math.pi
+
+
+def _has_coords(poi):
+    return poi.get("lat") not in ["", None] and poi.get("lon") not in ["", None]
+
+
+class DuplicateIndex:
+    """
+    Hash of POIs keyed on (system, body, lat cell, lon cell).
+    Cells are `tolerance` degrees wide, so a match can only be in the POI's own
+    cell or a neighbour. POIs without coordinates are keyed on their description.
+    """
+
+    def __init__(self, tolerance_deg=DEFAULT_TOLERANCE_DEG):
+        self.tolerance = max(float(tolerance_deg), 1e-7)
+        self.lon_cells = int(math.ceil(360.0 / self.tolerance))
+        self.cells = {}
+        self.system_pois = {}
+
+    @staticmethod
+    def _place_key(poi):
+        return (poi.get("system", "").strip().lower(), poi.get("body", "").strip().lower())
+
+    def _cell(self, lat, lon):
+        lat_cell = int(math.floor((lat + 90.0) / self.tolerance))
+        lon_cell = int(math.floor((lon + 180.0) / self.tolerance)) % self.lon_cells
+        return lat_cell, lon_cell
+
+    def add(self, poi):
+        place = self._place_key(poi)
+        if not _has_coords(poi):
+            key = place + (poi.get("description", "").strip().lower(),)
+            self.system_pois.setdefault(key, poi)
+            return
+        lat_cell, lon_cell = self._cell(float(poi["lat"]), float(poi["lon"]))
+        self.cells.setdefault(place + (lat_cell, lon_cell), []).append(poi)
+
+    def find(self, poi):
+        """Return an indexed POI within tolerance of `poi`, or None"""
+        place = self._place_key(poi)
+        if not _has_coords(poi):
+            return self.system_pois.get(place + (poi.get("description", "").strip().lower(),))
+
+        lat = float(poi["lat"])
+        lon = float(poi["lon"])
+        lat_cell, lon_cell = self._cell(lat, lon)
+        # Longitude cells shrink towards the poles, widen the search to match
+        cos_lat = max(math.cos(math.radians(min(abs(lat) + self.tolerance, 90.0))), 1e-9)
+        lon_reach = min(int(math.ceil(1.0 / cos_lat)), self.lon_cells // 2)
+
+        for dlat in (-1, 0, 1):
+            for dlon in range(-lon_reach, lon_reach + 1):
+                bucket = self.cells.get(place + (lat_cell + dlat, (lon_cell + dlon) % self.lon_cells))
+                if not bucket:
+                    continue
+                for other in bucket:
+                    distance, _ = calculate_bearing_and_distance(
+                        lat, lon, float(other["lat"]), float(other["lon"]), _DEGREES_RADIUS
+                    )
+                    if distance <= self.tolerance:
+                        return other
+        return None
+
+
+def merge_imported(existing_items, imported_items, policy=POLICY_SKIP, tolerance_deg=DEFAULT_TOLERANCE_DEG):
+    """
+    Remove or merge duplicates from `imported_items` (tree, modified in place)
+    against `existing_items` and against earlier POIs in the same import.
+    Folders emptied by the dedupe are dropped.
+    Returns dict with counts: duplicates, updated.
+    """
+    stats = {"duplicates": 0, "updated": 0}
+    if policy == POLICY_KEEP:
+        return stats
+
+    index = DuplicateIndex(tolerance_deg)
+    for poi in get_all_pois_flat(existing_items):
+        index.add(poi)
+
+    def filter_children(children):
+        kept = []
+        for item in children:
+            if item.get("type") == "folder":
+                had_children = bool(item.get("children"))
+                item["children"] = filter_children(item.get("children", []))
+                if item["children"] or not had_children:
+                    kept.append(item)
+                continue
+
+            match = index.find(item)
+            if match is None:
+                index.add(item)
+                kept.append(item)
+                continue
+
+            stats["duplicates"] += 1
+            if policy == POLICY_UPDATE:
+                changed = False
+                for key in ("description", "notes"):
+                    value = item.get(key, "")
+                    if value and value != match.get(key, ""):
+                        match[key] = value
+                        changed = True
+                if changed:
+                    stats["updated"] += 1
+        return kept
+
+    imported_items[:] = filter_children(imported_items)
+    return stats
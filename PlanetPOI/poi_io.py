@@ -0,0 +1,389 @@
+"""
+POI import/export module for EDMC-PlanetPOI
+Streams large POI files in and out on worker threads
+"""
+
+import codecs
+import csv
+import json
+import os
+import queue
+import threading
+
+from PlanetPOI.poi_manager import migrate_item
+
+
+READ_CHUNK_SIZE = 256 * 1024
+PROGRESS_INTERVAL = 0.05  # Report progress every 5% of the file
+
+
+class ImportCancelled(Exception):
+    """Raised inside an import or export job when the user cancels it"""
+
+
+def iter_json_array(fp, chunk_size=READ_CHUNK_SIZE):
+    """
+    Incrementally parse a JSON array from a binary file object.
+    Yields (element, bytes_consumed) for each top-level element, so only one
+    element has to be held in memory at a time.
+    A file that is not a JSON array is parsed whole and yielded as one element.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buf = ""
+    pos = 0
+    bytes_read = 0
+    eof = False
+
+    def fill(min_size):
+        nonlocal buf, pos, bytes_read, eof
+        if eof:
+            return False
+        raw = fp.read(max(chunk_size, min_size))
+        bytes_read += len(raw)
+        if not raw:
+            eof = True
+            buf = buf[pos:] + text_decoder.decode(b"", final=True)
+        else:
+            buf = buf[pos:] + text_decoder.decode(raw)
+        pos = 0
+        return True
+
+    def skip_ws():
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buf) or not fill(0):
+                return
+
+    skip_ws()
+    if pos >= len(buf):
+        return
+    if buf[pos] != "[":
+        # Not an array - fall back to parsing the whole document
+        while fill(0):
+            pass
+        yield json.loads(buf[pos:]), bytes_read
+        return
+    pos += 1
+
+    expect_value = True
+    while True:
+        skip_ws()
+        if pos >= len(buf):
+            raise ValueError("Unexpected end of file in JSON array")
+        ch = buf[pos]
+        if ch == "]":
+            return
+        if ch == ",":
+            if expect_value:
+                raise ValueError("Unexpected ',' in JSON array")
+            pos += 1
+            expect_value = True
+            continue
+        if not expect_value:
+            raise ValueError("Missing ',' in JSON array")
+
+        while True:
+            try:
+                element, end = decoder.raw_decode(buf, pos)
+                break
+            except json.JSONDecodeError:
+                # Element is split across chunks - read more (growing so huge
+                # elements don't cause quadratic re-parsing) and retry
+                if not fill(len(buf)):
+                    raise
+        pos = end
+        expect_value = False
+        yield element, bytes_read
+
+
+def _as_float(value):
+    if value in ["", None]:
+        return ""
+    return float(str(value).replace(",", "."))
+
+
+def validate_item(item, stats):
+    """
+    Validate and migrate one imported item (recursively for folders).
+    Returns the cleaned item or None if it should be skipped. Updates stats counts.
+    """
+    if not isinstance(item, dict):
+        stats["skipped"] += 1
+        return None
+
+    migrate_item(item)
+
+    if item.get("type") == "folder":
+        children = item.get("children", [])
+        if not isinstance(children, list):
+            children = []
+        valid_children = []
+        for child in children:
+            cleaned = validate_item(child, stats)
+            if cleaned is not None:
+                valid_children.append(cleaned)
+        item["name"] = str(item.get("name", "") or "Unnamed")
+        item["children"] = valid_children
+        stats["folders"] += 1
+        return item
+
+    if item.get("type") != "poi" or not item.get("system"):
+        stats["skipped"] += 1
+        return None
+
+    try:
+        lat = _as_float(item.get("lat"))
+        lon = _as_float(item.get("lon"))
+    except (TypeError, ValueError):
+        stats["skipped"] += 1
+        return None
+    if (lat == "") != (lon == ""):
+        stats["skipped"] += 1
+        return None
+    if lat != "" and not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        stats["skipped"] += 1
+        return None
+
+    item["lat"] = lat
+    item["lon"] = lon
+    item["body"] = str(item.get("body", "") or "")
+    item["description"] = str(item.get("description", "") or "")
+    item["notes"] = str(item.get("notes", "") or "")
+    item["active"] = bool(item.get("active", True))
+    stats["pois"] += 1
+    return item
+
+
+class ImportJob(threading.Thread):
+    """
+    Background import of a POI file.
+    Parses incrementally, validates each item and reports progress through
+    `messages` (polled from the Tk thread). Nothing is committed by the job
+    itself - the caller merges `items` into the tree on the "done" message.
+
+    Messages:
+        ("progress", fraction, stats)
+        ("done", items, stats)
+        ("cancelled", None, stats)
+        ("error", message, stats)
+    """
+
+    def __init__(self, file_path):
+        threading.Thread.__init__(self, name="planetpoi-ImportJob", daemon=True)
+        self.file_path = file_path
+        self.messages = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.items = []
+        self.stats = {"pois": 0, "folders": 0, "skipped": 0}
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        try:
+            total = os.path.getsize(self.file_path) or 1
+            next_report = 0.0
+            with open(self.file_path, "rb") as fp:
+                for element, consumed in iter_json_array(fp):
+                    if self.cancel_event.is_set():
+                        raise ImportCancelled()
+                    # A single non-array document may hold a list of items
+                    elements = element if isinstance(element, list) else [element]
+                    for item in elements:
+                        cleaned = validate_item(item, self.stats)
+                        if cleaned is not None:
+                            self.items.append(cleaned)
+                    fraction = min(consumed / total, 1.0)
+                    if fraction >= next_report:
+                        self.messages.put(("progress", fraction, dict(self.stats)))
+                        next_report = fraction + PROGRESS_INTERVAL
+            self.messages.put(("done", self.items, dict(self.stats)))
+        except ImportCancelled:
+            self.items = []
+            self.messages.put(("cancelled", None, dict(self.stats)))
+        except Exception as ex:
+            self.items = []
+            self.messages.put(("error", str(ex), dict(self.stats)))
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+CSV_COLUMNS = ["system", "body", "lat", "lon", "description", "notes", "active", "folder"]
+FOLDER_PATH_SEPARATOR = " > "
+
+
+def iter_pois_with_path(items, path=()):
+    """Yield (poi, folder_path_tuple) for every POI in the tree, depth first"""
+    for item in items:
+        if item.get("type") == "folder":
+            yield from iter_pois_with_path(item.get("children", []), path + (item.get("name", ""),))
+        elif item.get("type") == "poi":
+            yield item, path
+
+
+def snapshot_tree(items):
+    """
+    Copy of a tree made of new dicts and lists, for a worker thread to read
+    while the Tk thread goes on editing the live tree
+    """
+    copied = []
+    for item in items:
+        item = dict(item)
+        if item.get("type") == "folder":
+            item["children"] = snapshot_tree(item.get("children", []))
+        copied.append(item)
+    return copied
+
+
+def count_pois(items):
+    """Count POIs in the tree without building a flat list"""
+    return sum(1 for _ in iter_pois_with_path(items))
+
+
+def _poi_coords(poi):
+    lat = poi.get("lat")
+    lon = poi.get("lon")
+    if lat in ["", None] or lon in ["", None]:
+        return None
+    return float(lat), float(lon)
+
+
+def write_json(fp, items, on_poi):
+    """Stream the tree as JSON in the same layout as poi.json (re-importable)"""
+    def write_items(children, depth):
+        indent = "  " * depth
+        first = True
+        for item in children:
+            fp.write("\n" if first else ",\n")
+            first = False
+            if item.get("type") == "folder":
+                header = {k: v for k, v in item.items() if k != "children"}
+                fp.write(indent + json.dumps(header, ensure_ascii=False)[:-1])
+                fp.write(', "children": [' if header else '"children": [')
+                write_items(item.get("children", []), depth + 1)
+                fp.write("\n" + indent + "]}")
+            else:
+                fp.write(indent + json.dumps(item, ensure_ascii=False))
+                if item.get("type") == "poi":
+                    on_poi()
+        return first
+
+    fp.write("[")
+    empty = write_items(items, 1)
+    fp.write("]\n" if empty else "\n]\n")
+
+
+def write_csv(fp, items, on_poi):
+    """Stream POIs as CSV, one row per POI with its folder path"""
+    writer = csv.writer(fp)
+    writer.writerow(CSV_COLUMNS)
+    for poi, path in iter_pois_with_path(items):
+        writer.writerow([
+            poi.get("system", ""),
+            poi.get("body", ""),
+            poi.get("lat", ""),
+            poi.get("lon", ""),
+            poi.get("description", ""),
+            poi.get("notes", ""),
+            poi.get("active", True),
+            FOLDER_PATH_SEPARATOR.join(path)
+        ])
+        on_poi()
+
+
+def write_geojson(fp, items, on_poi):
+    """Stream POIs as a GeoJSON FeatureCollection (coordinates in degrees)"""
+    fp.write('{"type": "FeatureCollection", "features": [')
+    first = True
+    for poi, path in iter_pois_with_path(items):
+        coords = _poi_coords(poi)
+        feature = {
+            "type": "Feature",
+            # System POIs have no position - GeoJSON allows a null geometry
+            "geometry": {"type": "Point", "coordinates": [coords[1], coords[0]]} if coords else None,
+            "properties": {
+                "system": poi.get("system", ""),
+                "body": poi.get("body", ""),
+                "description": poi.get("description", ""),
+                "folder": FOLDER_PATH_SEPARATOR.join(path)
+            }
+        }
+        fp.write("\n" if first else ",\n")
+        fp.write(json.dumps(feature, ensure_ascii=False))
+        first = False
+        on_poi()
+    fp.write("\n]}\n")
+
+
+EXPORT_FORMATS = {
+    ".json": write_json,
+    ".csv": write_csv,
+    ".geojson": write_geojson,
+}
+
+
+def get_export_writer(file_path):
+    """Pick writer from file extension, JSON if unknown"""
+    ext = os.path.splitext(file_path)[1].lower()
+    return EXPORT_FORMATS.get(ext, write_json)
+
+
+class ExportJob(threading.Thread):
+    """
+    Background export of a tree (or a folder subtree) to JSON, CSV or GeoJSON.
+    Writes to a temporary file that replaces the target when complete, so a
+    cancelled or failed export never leaves a truncated file behind.
+    Uses the same message protocol as ImportJob, with the POI count as payload
+    of "done".
+    The items are copied when the job is created, so create it on the thread
+    that owns the tree; the worker only ever sees that snapshot.
+    """
+
+    def __init__(self, file_path, items):
+        threading.Thread.__init__(self, name="planetpoi-ExportJob", daemon=True)
+        self.file_path = file_path
+        self.items = snapshot_tree(items)
+        self.messages = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.written = 0
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        tmp_path = self.file_path + ".tmp"
+        stats = {"pois": 0}
+        try:
+            total = count_pois(self.items) or 1
+            report_every = max(1, int(total * PROGRESS_INTERVAL))
+
+            def on_poi():
+                if self.cancel_event.is_set():
+                    raise ImportCancelled()
+                self.written += 1
+                if self.written % report_every == 0:
+                    stats["pois"] = self.written
+                    self.messages.put(("progress", self.written / total, dict(stats)))
+
+            writer = get_export_writer(self.file_path)
+            newline = "" if writer is write_csv else None
+            with open(tmp_path, "w", encoding="utf8", newline=newline) as fp:
+                writer(fp, self.items, on_poi)
+            os.replace(tmp_path, self.file_path)
+            stats["pois"] = self.written
+            self.messages.put(("done", self.written, stats))
+        except ImportCancelled:
+            self.messages.put(("cancelled", None, stats))
+        except Exception as ex:
+            self.messages.put(("error", str(ex), stats))
+        finally:
+            if os.path.exists(tmp_path):
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
@@ -0,0 +1,457 @@
+"""
+POI library module for EDMC-PlanetPOI
+Stores the POI tree as shard files, one per top-level folder plus one for
+root-level POIs, listed in a small manifest with the systems each shard covers.
+
+Only the root shard is read at startup; a folder shard is read when one of its
+systems becomes current or a view needs the whole tree. Saving rewrites only
+the shards whose content changed.
+
+Community packs (*.json in the packs folder) are mounted as read-only
+top-level folders. They are never rewritten; only which of their POIs and
+folders are inactive is remembered, in the manifest.
+
+Every top-level folder carries its shard's id as "id", the same id the
+manifest lists, so a folder finds its shard however the tree is edited.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import uuid
+
+
+MANIFEST_FILE = "manifest.json"
+LIBRARY_VERSION = 1
+ROOT_SHARD_ID = "root"
+PACK_PREFIX = "pack:"
+
+
+def _read_json(path):
+    with open(path, "r", encoding="utf8") as fp:
+        return json.load(fp)
+
+
+def _write_text(path, text):
+    """Write through a temporary file, so a crash never leaves half a shard"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf8") as fp:
+        fp.write(text)
+    os.replace(tmp_path, path)
+
+
+def _dump(content):
+    return json.dumps(content, indent=2, ensure_ascii=False)
+
+
+def _digest(text):
+    return hashlib.sha1(text.encode("utf8")).hexdigest()
+
+
+def _iter_pois(items):
+    for item in items:
+        if item.get("type") == "poi":
+            yield item
+        elif item.get("type") == "folder":
+            yield from _iter_pois(item.get("children", []))
+
+
+def _iter_folders(items):
+    for item in items:
+        if item.get("type") == "folder":
+            yield item
+            yield from _iter_folders(item.get("children", []))
+
+
+def _summarize(items):
+    """(sorted systems, POI count) of a list of items"""
+    systems = set()
+    count = 0
+    for poi in _iter_pois(items):
+        count += 1
+        if poi.get("system"):
+            systems.add(poi["system"])
+    return sorted(systems), count
+
+
+class Shard:
+    """One file of the library: a top-level folder, the root-level POIs, or a pack"""
+
+    def __init__(self, shard_id, path, name=None, systems=(), pois=0, read_only=False):
+        self.id = shard_id
+        self.path = path
+        self.name = name
+        self.systems = set(systems)
+        self.pois = pois
+        self.read_only = read_only
+        self.active = True     # Top-level folder's own flag, so a placeholder shows it before the read
+        self.item = None       # Top-level folder in the tree (None for the root shard)
+        self.loaded = False
+        self.digest = None     # Digest of the content as last read or written
+        self.inactive = []     # Packs only: walk indexes of inactive POIs
+        self.inactive_folders = []  # Packs only: walk indexes of inactive subfolders
+        self.stat = None       # Packs only: (mtime, size) the metadata was taken from
+
+    def manifest_entry(self):
+        entry = {
+            "id": self.id,
+            "name": self.name,
+            "systems": sorted(self.systems),
+            "pois": self.pois
+        }
+        if not self.active:
+            entry["active"] = False
+        if self.read_only:
+            entry["inactive"] = self.inactive
+            entry["inactive_folders"] = self.inactive_folders
+            entry["stat"] = list(self.stat) if self.stat else None
+        else:
+            entry["file"] = os.path.basename(self.path)
+        return entry
+
+
+class PoiLibrary:
+    """
+    A sharded POI tree on disk.
+    load() returns the tree with unloaded folders as empty placeholders;
+    ensure_system() and ensure_all() fill them in place.
+    """
+
+    def __init__(self, directory, packs_dir=None, migrate=None):
+        self.directory = directory
+        self.packs_dir = packs_dir
+        self.migrate = migrate       # migrate(items, from_version), applied to packs as they are read
+        self.schema = 0              # POI schema version the stored shards are in
+        self.tree = []
+        self._shards = {}          # shard id (= top-level folder "id") -> Shard, in top-level order
+        self._unloaded_systems = {}  # system -> ids of unloaded shards that contain it
+        self._removed_packs = set()  # Pack file names the user removed from the tree
+        self._pack_entries = {}      # Pack manifest entries from the last session
+        self._root = None
+        self._warned = set()
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.directory, MANIFEST_FILE)
+
+    def exists(self):
+        return os.path.exists(self.manifest_path)
+
+    def load(self, legacy_file=None):
+        """
+        Read the manifest and the root shard and return the tree.
+        Without a library yet, legacy_file (the old single poi.json) is split
+        into shards first. The legacy file itself is left untouched.
+        """
+        self.__init__(self.directory, self.packs_dir, self.migrate)
+        if not self.exists():
+            tree = []
+            if legacy_file and os.path.exists(legacy_file):
+                data = _read_json(legacy_file)
+                tree = data if isinstance(data, list) else []
+            self._create(tree)
+        else:
+            self._open()
+        self._mount_packs()
+        return self.tree
+
+    def ensure_system(self, system):
+        """Load the shards containing POIs in a system. Returns True if the tree grew."""
+        shard_ids = self._unloaded_systems.get(system)
+        if not shard_ids:
+            return False
+        for shard_id in list(shard_ids):
+            self._load_shard(self._shards[shard_id])
+        return True
+
+    def ensure_all(self):
+        """Load every shard. Returns True if the tree grew."""
+        grown = False
+        for shard in list(self._shards.values()):
+            if not shard.loaded:
+                self._load_shard(shard)
+                grown = True
+        return grown
+
+    def ensure_items(self, items):
+        """Load the shards of the top-level folders among items. Returns True if the tree grew."""
+        grown = False
+        for item in items:
+            shard = self._shard_of(item)
+            if shard is not None and not shard.loaded:
+                self._load_shard(shard)
+                grown = True
+        return grown
+
+    def set_schema(self, version):
+        """Record that every writable shard is now in a schema version"""
+        self.schema = version
+        self._write_manifest()
+
+    def is_loaded(self, item):
+        shard = self._shard_of(item)
+        return shard is None or shard.loaded
+
+    def is_read_only(self, item):
+        """True for the top-level folder of a mounted pack"""
+        shard = self._shard_of(item)
+        return shard is not None and shard.read_only
+
+    def save(self, tree):
+        """Write the shards whose content changed, and the manifest if needed"""
+        self.tree = tree
+        manifest_changed = False
+        order = []
+        root_items = []
+        for item in tree:
+            if item.get("type") != "folder":
+                root_items.append(item)
+                continue
+            shard = self._shard_of(item)
+            if shard is None:
+                shard = self._new_shard(item)
+                manifest_changed = True
+            order.append(shard.id)
+            if not shard.loaded:
+                if not item.get("children"):
+                    if shard.name != item.get("name") or shard.active != item.get("active", True):
+                        shard.name = item.get("name")
+                        shard.active = item.get("active", True)
+                        manifest_changed = True
+                    continue
+                # Something was added to a folder that was never read - merge with the file first
+                self._load_shard(shard)
+            manifest_changed |= self._save_shard(shard, item)
+        manifest_changed |= self._save_shard(self._root, root_items)
+
+        for shard in [shard for shard in self._shards.values() if shard.id not in order]:
+            self._drop_shard(shard)
+            manifest_changed = True
+        if order != list(self._shards):
+            self._shards = {shard_id: self._shards[shard_id] for shard_id in order}
+            manifest_changed = True
+        if manifest_changed:
+            self._write_manifest()
+
+    def _shard_of(self, item):
+        """
+        Shard of a top-level folder, by the folder's "id". A copy of the folder
+        (e.g. re-imported from an export) has the id but is not the shard's folder.
+        """
+        if item.get("type") != "folder":
+            return None
+        shard = self._shards.get(item.get("id"))
+        if shard is None or shard.item is not item:
+            return None
+        return shard
+
+    def _create(self, tree):
+        """Start a library from a whole tree"""
+        os.makedirs(self.directory, exist_ok=True)
+        self._root = Shard(ROOT_SHARD_ID, os.path.join(self.directory, "root.json"))
+        self._root.loaded = True
+        self.tree = tree
+        for item in tree:
+            if item.get("type") == "folder":
+                shard = self._new_shard(item)
+                self._save_shard(shard, item)
+        self._save_shard(self._root, [item for item in tree if item.get("type") != "folder"])
+        self._write_manifest()
+        print(f"PPOI: Created POI library with {len(self._shards)} folder shards")
+
+    def _open(self):
+        manifest = _read_json(self.manifest_path)
+        self.schema = manifest.get("schema", 0)
+        self._removed_packs = set(manifest.get("removed_packs", []))
+        self._pack_entries = {entry["id"]: entry for entry in manifest.get("packs", [])}
+
+        root_entry = manifest.get("root") or {"file": "root.json"}
+        self._root = Shard(ROOT_SHARD_ID, os.path.join(self.directory, root_entry["file"]))
+        root_items = []
+        if os.path.exists(self._root.path):
+            root_items = _read_json(self._root.path)
+        self._root.loaded = True
+        self._root.digest = _digest(_dump(root_items))
+
+        for entry in manifest.get("shards", []):
+            shard = Shard(entry["id"], os.path.join(self.directory, entry["file"]),
+                          entry.get("name"), entry.get("systems", ()), entry.get("pois", 0))
+            shard.active = entry.get("active", True)
+            self._add_placeholder(shard)
+        self.tree.extend(root_items)
+
+    def _mount_packs(self):
+        if not self.packs_dir or not os.path.isdir(self.packs_dir):
+            return
+        known = self._pack_entries
+        for path in sorted(glob.glob(os.path.join(self.packs_dir, "*.json"))):
+            file_name = os.path.basename(path)
+            if file_name in self._removed_packs:
+                continue
+            stat = os.stat(path)
+            stat = (int(stat.st_mtime), stat.st_size)
+            shard_id = PACK_PREFIX + file_name
+            entry = known.get(shard_id)
+            shard = Shard(shard_id, path, read_only=True)
+            if entry:
+                shard.active = entry.get("active", True)
+                shard.inactive_folders = list(entry.get("inactive_folders", []))
+            if entry and tuple(entry.get("stat") or ()) == stat:
+                shard.name = entry.get("name")
+                shard.systems = set(entry.get("systems", ()))
+                shard.pois = entry.get("pois", 0)
+                shard.inactive = list(entry.get("inactive", []))
+                shard.stat = stat
+            else:
+                # New or updated pack - read it once for its metadata
+                try:
+                    folder = self._read_pack(path)
+                except (OSError, ValueError) as ex:
+                    print(f"PPOI: Skipping POI pack {file_name}: {ex}")
+                    continue
+                shard.name = folder["name"]
+                systems, shard.pois = _summarize(folder["children"])
+                shard.systems = set(systems)
+                shard.inactive = list(entry.get("inactive", [])) if entry else []
+                shard.stat = stat
+            # Packs go after the user's own folders, before root-level POIs
+            insert_at = sum(1 for item in self.tree if item.get("type") == "folder")
+            self._add_placeholder(shard, insert_at)
+
+    def _read_pack(self, path):
+        """A pack is a folder, or a list of items that becomes a folder named after the file"""
+        data = _read_json(path)
+        if isinstance(data, dict) and data.get("type") == "folder":
+            folder = data
+        elif isinstance(data, list):
+            folder = {"type": "folder", "name": os.path.splitext(os.path.basename(path))[0], "children": data}
+        else:
+            raise ValueError("not a POI folder or list")
+        # Packs are never rewritten, so older ones are upgraded every time they are read
+        if self.migrate is not None:
+            self.migrate(folder["children"], folder.pop("schema", 0))
+        return folder
+
+    def _add_placeholder(self, shard, insert_at=None):
+        placeholder = {"type": "folder", "id": shard.id, "name": shard.name or "", "children": []}
+        if not shard.active:
+            placeholder["active"] = False
+        shard.item = placeholder
+        self._shards[shard.id] = shard
+        for system in shard.systems:
+            self._unloaded_systems.setdefault(system, set()).add(shard.id)
+        if insert_at is None:
+            self.tree.append(placeholder)
+        else:
+            self.tree.insert(insert_at, placeholder)
+
+    def _new_shard(self, folder):
+        shard_id = uuid.uuid4().hex[:12]
+        shard = Shard(shard_id, os.path.join(self.directory, f"{shard_id}.json"), folder.get("name"))
+        shard.item = folder
+        shard.loaded = True
+        # Replaces an id the folder brought along from another library or an earlier place in the tree
+        folder["id"] = shard_id
+        self._shards[shard_id] = shard
+        return shard
+
+    def _load_shard(self, shard):
+        """Read a shard into its placeholder folder, keeping anything already added to it"""
+        placeholder = shard.item
+        try:
+            if shard.read_only:
+                data = self._read_pack(shard.path)
+            else:
+                data = _read_json(shard.path)
+        except (OSError, ValueError) as ex:
+            print(f"PPOI: Could not read POI shard {shard.path}: {ex}")
+            data = {"children": []}
+        for key, value in data.items():
+            if key not in ("type", "id", "name", "children"):
+                placeholder.setdefault(key, value)
+        if not placeholder.get("name"):
+            placeholder["name"] = data.get("name", "")
+        added = placeholder.get("children", [])
+        placeholder["children"] = list(data.get("children", [])) + added
+        if shard.read_only:
+            inactive = set(shard.inactive)
+            for idx, poi in enumerate(_iter_pois(placeholder["children"])):
+                if idx in inactive:
+                    poi["active"] = False
+            inactive_folders = set(shard.inactive_folders)
+            for idx, folder in enumerate(_iter_folders(placeholder["children"])):
+                if idx in inactive_folders:
+                    folder["active"] = False
+        shard.loaded = True
+        # Children added before the read are not on disk yet - leave the shard dirty
+        shard.digest = None if added else _digest(_dump(placeholder))
+        for system in shard.systems:
+            ids = self._unloaded_systems.get(system)
+            if ids is not None:
+                ids.discard(shard.id)
+                if not ids:
+                    del self._unloaded_systems[system]
+
+    def _save_shard(self, shard, content):
+        """Write one shard if it changed. Returns True if its manifest entry changed."""
+        text = _dump(content)
+        digest = _digest(text)
+        if digest == shard.digest:
+            return False
+        shard.digest = digest
+        pois = list(_iter_pois(content if isinstance(content, list) else [content]))
+        active = content.get("active", True) if isinstance(content, dict) else True
+
+        if shard.read_only:
+            inactive = [idx for idx, poi in enumerate(pois) if not poi.get("active", True)]
+            inactive_folders = [idx for idx, folder in enumerate(_iter_folders(content.get("children", [])))
+                                if not folder.get("active", True)]
+            if (inactive, inactive_folders, active) != (shard.inactive, shard.inactive_folders, shard.active):
+                shard.inactive = inactive
+                shard.inactive_folders = inactive_folders
+                shard.active = active
+                return True
+            if shard.id not in self._warned:
+                self._warned.add(shard.id)
+                print(f"PPOI: {shard.name} is a read-only pack - only active flags are saved")
+            return False
+
+        _write_text(shard.path, text)
+        systems = sorted({poi["system"] for poi in pois if poi.get("system")})
+        name = content.get("name") if isinstance(content, dict) else None
+        if (systems != sorted(shard.systems) or len(pois) != shard.pois or name != shard.name
+                or active != shard.active):
+            shard.systems = set(systems)
+            shard.pois = len(pois)
+            shard.name = name
+            shard.active = active
+            return True
+        return False
+
+    def _drop_shard(self, shard):
+        """A top-level folder was deleted from the tree"""
+        del self._shards[shard.id]
+        for system in shard.systems:
+            ids = self._unloaded_systems.get(system)
+            if ids is not None:
+                ids.discard(shard.id)
+        if shard.read_only:
+            self._removed_packs.add(os.path.basename(shard.path))
+            return
+        try:
+            os.remove(shard.path)
+        except OSError:
+            pass
+
+    def _write_manifest(self):
+        shards = list(self._shards.values())
+        manifest = {
+            "version": LIBRARY_VERSION,
+            "schema": self.schema,
+            "root": {"file": os.path.basename(self._root.path)},
+            "shards": [shard.manifest_entry() for shard in shards if not shard.read_only],
+            "packs": [shard.manifest_entry() for shard in shards if shard.read_only],
+            "removed_packs": sorted(self._removed_packs)
+        }
+        _write_text(self.manifest_path, json.dumps(manifest, indent=2, ensure_ascii=False))
@@ -3,13 +3,81 @@ POI Manager module for EDMC-PlanetPOI
 Handles loading, saving, and manipulation of POI data structures
 """
 
+import contextlib
 import json
 import os
 
+from PlanetPOI.folder_stats import FolderAggregates
+from PlanetPOI.poi_library import PoiLibrary
+from PlanetPOI.search_index import SearchIndex
+
 
 # POI file path - will be initialized by calling code
 POI_FILE = os.path.join(os.path.dirname(__file__), "poi.json")
 
+# Sharded library replacing POI_FILE once set; POI_FILE is then only read to create it
+LIBRARY = None
+
+# Version of the stored POI format. When the format changes, bump it and add
+# a step to MIGRATIONS; libraries are upgraded once and then skip migration.
+SCHEMA_VERSION = 2
+
+# Bumped whenever the tree is loaded or saved so views can tell when cached state is stale
+_revision = 0
+
+# Full-text index of the tree, reset on load and updated through the notify_* functions
+search_index = SearchIndex()
+
+# Per-folder counts, reset on load and updated through the notify_* functions
+folder_stats = FolderAggregates()
+
+# Open transaction, if any (see transaction())
+_transaction = None
+
+
+class Transaction:
+    """Changes grouped by transaction(): the tree to save and refreshes to run on commit"""
+
+    def __init__(self):
+        self.tree = None      # Tree of the last save_pois() call, saved on commit
+        self.deferred = {}    # (function, args) -> None, in request order
+
+
+@contextlib.contextmanager
+def transaction():
+    """
+    Group mutations so they cost one save and one run of each view refresh.
+    save_pois() inside the block only records the tree; functions passed to
+    defer_until_commit() run once after the save. Nested blocks join the
+    outermost one. The tree is saved even if the block raises, because the
+    changes made so far are already in memory.
+    """
+    global _transaction
+    if _transaction is not None:
+        yield _transaction
+        return
+    txn = _transaction = Transaction()
+    try:
+        yield txn
+    finally:
+        _transaction = None
+        if txn.tree is not None:
+            save_pois(txn.tree)
+        for func, args in txn.deferred:
+            func(*args)
+
+
+def defer_until_commit(func, *args):
+    """
+    Inside a transaction, remember func(*args) for the commit and return True.
+    Repeated requests run once. Outside a transaction return False, so the
+    caller goes ahead right away.
+    """
+    if _transaction is None:
+        return False
+    _transaction.deferred[(func, args)] = None
+    return True
+
 
 def set_poi_file(file_path):
     """Set the POI file path"""
@@ -17,51 +85,180 @@ def set_poi_file(file_path):
     POI_FILE = file_path
 
 
+def get_revision():
+    """Return a counter that changes every time the POI tree is loaded or saved"""
+    return _revision
+
+
+def set_library(directory, packs_dir=None):
+    """Store POIs as a sharded library in directory, mounting read-only packs from packs_dir"""
+    global LIBRARY
+    LIBRARY = PoiLibrary(directory, packs_dir, migrate=migrate_tree)
+
+
+def ensure_loaded(system=None):
+    """
+    Read library shards before the tree is used: the ones with POIs in a
+    system, or all of them. Returns True if POIs were added to the tree.
+    """
+    global _revision
+    if LIBRARY is None:
+        return False
+    grown = LIBRARY.ensure_system(system) if system else LIBRARY.ensure_all()
+    if grown:
+        _revision += 1
+        _reset_indexes(LIBRARY.tree)
+    return grown
+
+
+def ensure_systems_loaded(systems):
+    """
+    Read the shards with POIs in any of the systems, e.g. before looking for
+    duplicates of POIs in them. Returns True if POIs were added to the tree.
+    """
+    global _revision
+    if LIBRARY is None:
+        return False
+    grown = False
+    for system in set(systems):
+        grown |= LIBRARY.ensure_system(system)
+    if grown:
+        _revision += 1
+        _reset_indexes(LIBRARY.tree)
+    return grown
+
+
+def ensure_items_loaded(items):
+    """
+    Read the shards of any not yet loaded top-level folders among items, so a
+    delete, move or count sees their contents. Returns True if POIs were added.
+    """
+    global _revision
+    if LIBRARY is None:
+        return False
+    grown = LIBRARY.ensure_items(items)
+    if grown:
+        _revision += 1
+        _reset_indexes(LIBRARY.tree)
+    return grown
+
+
+def _reset_indexes(all_pois):
+    """Point the search index and folder stats at a newly loaded tree, and return it"""
+    search_index.reset(all_pois)
+    folder_stats.reset(all_pois)
+    return all_pois
+
+
 def load_pois():
     """Load POIs from JSON file and return them"""
+    global _revision, LIBRARY
+    _revision += 1
+    if LIBRARY is not None:
+        try:
+            data = LIBRARY.load(POI_FILE)
+            if LIBRARY.schema < SCHEMA_VERSION:
+                # One walk over the whole library, then never again
+                LIBRARY.ensure_all()
+                changed = migrate_tree(data, LIBRARY.schema)
+                print(f"PPOI: Migrated {changed} items from POI schema {LIBRARY.schema} to {SCHEMA_VERSION}")
+                LIBRARY.save(data)
+                LIBRARY.set_schema(SCHEMA_VERSION)
+            return _reset_indexes(data)
+        except Exception as ex:
+            # Keep using the single file rather than starting an empty library
+            print(f"Error loading POI library, using {POI_FILE}: {ex}")
+            LIBRARY = None
     if not os.path.exists(POI_FILE):
-        return []
+        return _reset_indexes([])
     try:
         with open(POI_FILE, "r", encoding="utf8") as f:
             data = json.load(f)
-            # Handle migration of old format to new format with separate system/body
+            # A plain poi.json has no schema version, so the whole tree is checked on every load
             if data and isinstance(data, list):
-                migrated = False
-                for item in data:
-                    # Check if POI needs migration (has old "body" field but not "system" field)
-                    if item.get("type") == "poi" and "body" in item and "system" not in item:
-                        # Old format: {"body": "HIP 36601 C 3 b"}
-                        # New format: {"system": "HIP 36601", "body": "C 3 b"}
-                        full_body = item.get("body", "")
-                        system_name, body_part = split_system_and_body(full_body)
-                        item["system"] = system_name
-                        item["body"] = body_part
-                        migrated = True
-                        print(f"Migrated POI: {full_body} -> system={system_name}, body={body_part}")
-                    # Also ensure old non-typed POIs get type field
-                    elif "type" not in item:
-                        item["type"] = "poi"
-                        if "body" in item and "system" not in item:
-                            full_body = item.get("body", "")
-                            system_name, body_part = split_system_and_body(full_body)
-                            item["system"] = system_name
-                            item["body"] = body_part
-                            migrated = True
+                migrated = migrate_tree(data) > 0
                 
                 if migrated:
                     print("Saving migrated POI format...")
                     save_pois(data)  # Save migrated format
                 
-                return data
+                return _reset_indexes(data)
             else:
-                return []
+                return _reset_indexes([])
     except Exception as ex:
         print(f"Error loading POIs: {ex}")
-        return []
+        return _reset_indexes([])
+
+
+def _migrate_add_type(item):
+    """Schema 1: items without a type are POIs"""
+    if "type" in item:
+        return False
+    item["type"] = "poi"
+    return True
+
+
+def _migrate_split_body(item):
+    """Schema 2: separate system and body instead of one full body name"""
+    if item.get("type") != "poi" or "body" not in item or "system" in item:
+        return False
+    # Old format: {"body": "HIP 36601 C 3 b"}
+    # New format: {"system": "HIP 36601", "body": "C 3 b"}
+    full_body = item.get("body", "")
+    system_name, body_part = split_system_and_body(full_body)
+    item["system"] = system_name
+    item["body"] = body_part
+    print(f"Migrated POI: {full_body} -> system={system_name}, body={body_part}")
+    return True
+
+
+# (schema version a step upgrades to, step) in order
+MIGRATIONS = [
+    (1, _migrate_add_type),
+    (2, _migrate_split_body),
+]
+
+
+def migrate_item(item, from_version=0):
+    """
+    Upgrade a single item (not its children) from a schema version to the
+    current one in place. Returns True if the item was changed.
+    """
+    changed = False
+    for version, step in MIGRATIONS:
+        if version > from_version and step(item):
+            changed = True
+    return changed
+
+
+def migrate_tree(items, from_version=0):
+    """Upgrade every item of a tree, inside folders too. Returns the number of items changed."""
+    if from_version >= SCHEMA_VERSION:
+        return 0
+    changed = 0
+    stack = list(items)
+    while stack:
+        item = stack.pop()
+        if migrate_item(item, from_version):
+            changed += 1
+        if item.get("type") == "folder":
+            stack.extend(item.get("children", []))
+    return changed
 
 
 def save_pois(all_pois):
-    """Save POIs to JSON file"""
+    """Save POIs to JSON file (once, on commit, inside a transaction)"""
+    global _revision
+    if _transaction is not None:
+        _transaction.tree = all_pois
+        return
+    _revision += 1
+    if LIBRARY is not None:
+        try:
+            LIBRARY.save(all_pois)
+        except Exception as ex:
+            print(f"Error saving POI library: {ex}")
+        return
     try:
         print("saving pois")
         with open(POI_FILE, "w", encoding="utf8") as f:
@@ -70,6 +267,47 @@ def save_pois(all_pois):
         print(f"Error saving POIs: {ex}")
 
 
+def notify_item_added(item, parent_children):
+    """Call after appending a new POI or folder to parent_children"""
+    folder_stats.item_added(item, parent_children)
+    search_index.add(item, _folder_path(folder_stats.folder_of(parent_children)))
+
+
+def notify_poi_changed(poi):
+    """Call after changing a POI's active flag, description, notes, system or body"""
+    folder_stats.poi_changed(poi)
+    search_index.update(poi, _folder_path(folder_stats.parent_of(poi)))
+
+
+def notify_tree_replaced(all_pois):
+    """Call after bulk changes such as imports, or when the tree object is replaced"""
+    _reset_indexes(all_pois)
+
+
+def _notify_item_removed(item):
+    folder_stats.item_removed(item)
+    search_index.remove(item)
+
+
+def _notify_item_moved(item, new_parent_children):
+    folder_stats.item_moved(item, new_parent_children)
+    search_index.move(item, _folder_path(folder_stats.folder_of(new_parent_children)))
+
+
+def _folder_path(folder):
+    """Names of a folder and the folders above it, outermost first; () at root level"""
+    if folder is None:
+        return ()
+    folders = [folder] + folder_stats.ancestors(folder)
+    return tuple(item.get("name", "") for item in reversed(folders))
+
+
+def search_pois(query, limit=None):
+    """POIs whose description, notes, system, body or folder names match every word of the query"""
+    ensure_loaded()
+    return search_index.search(query, limit)
+
+
 def split_system_and_body(full_body_name):
     """
     Split full body name into system and body parts.
@@ -144,22 +382,28 @@ def create_folder(all_pois, parent_children, folder_name):
         "children": []
     }
     parent_children.append(new_folder)
+    notify_item_added(new_folder, parent_children)
     save_pois(all_pois)
     return new_folder
 
 
+def remove_from_tree(items, target_item):
+    """Take an item out of the tree without saving. Returns True if it was found."""
+    for idx, item in enumerate(items):
+        if item is target_item:
+            items.pop(idx)
+            return True
+        if item.get("type") == "folder":
+            if remove_from_tree(item.get("children", []), target_item):
+                return True
+    return False
+
+
 def delete_item(all_pois, items, target_item):
     """Delete item (POI or folder) from tree."""
-    def remove_from(children):
-        for idx, item in enumerate(children):
-            if item is target_item:
-                children.pop(idx)
-                return True
-            if item.get("type") == "folder":
-                if remove_from(item.get("children", [])):
-                    return True
-        return False
-    if remove_from(items):
+    ensure_items_loaded([target_item])
+    if remove_from_tree(items, target_item):
+        _notify_item_removed(target_item)
         save_pois(all_pois)
         return True
     return False
@@ -167,17 +411,94 @@ def delete_item(all_pois, items, target_item):
 
 def move_item(all_pois, items, target_item, new_parent_children):
     """Move item to new parent folder."""
+    ensure_items_loaded([target_item])
     # First remove from current location
-    if delete_item(all_pois, items, target_item):
+    if remove_from_tree(items, target_item):
         # Then add to new location
         new_parent_children.append(target_item)
+        _notify_item_moved(target_item, new_parent_children)
         save_pois(all_pois)
         return True
     return False
 
 
+def set_pois_active(all_pois, pois, active):
+    """Activate or deactivate many POIs with one save. Returns the number changed."""
+    changed = 0
+    with transaction():
+        for poi in pois:
+            if poi.get("active", True) != active:
+                poi["active"] = active
+                folder_stats.poi_changed(poi)
+                changed += 1
+        if changed:
+            save_pois(all_pois)
+    return changed
+
+
+def set_folder_active(all_pois, folder, active):
+    """
+    Switch a folder on or off. POIs below it keep their own flags but only
+    count as active while every folder above them is on. Returns True if it changed.
+    """
+    if folder.get("active", True) == active:
+        return False
+    folder["active"] = active
+    folder_stats.folder_changed(folder)
+    save_pois(all_pois)
+    return True
+
+
+def is_poi_active(poi):
+    """Effective active state of a POI (or folder): its own flag and every folder above it"""
+    return folder_stats.is_active(poi)
+
+
+def delete_items(all_pois, items, targets):
+    """Delete many POIs or folders with one save. Returns the number deleted."""
+    ensure_items_loaded(targets)
+    deleted = 0
+    with transaction():
+        for target in targets:
+            if remove_from_tree(items, target):
+                _notify_item_removed(target)
+                deleted += 1
+        if deleted:
+            save_pois(all_pois)
+    return deleted
+
+
+def move_items(all_pois, items, targets, new_parent_children):
+    """Move many POIs or folders to one folder with one save. Returns the number moved."""
+    ensure_items_loaded(targets)
+    # A folder cannot go into itself or one of its subfolders
+    destination = folder_stats.folder_of(new_parent_children)
+    blocked = set()
+    if destination is not None:
+        blocked = {id(folder) for folder in [destination] + folder_stats.ancestors(destination)}
+    moved = 0
+    with transaction():
+        for target in targets:
+            if id(target) in blocked:
+                continue
+            if move_item(all_pois, items, target, new_parent_children):
+                moved += 1
+    return moved
+
+
+def get_folder_stats(folder):
+    """FolderStats (subfolders, pois, active, systems) of a folder in the loaded tree, or None"""
+    return folder_stats.get(folder)
+
+
 def count_folder_contents(folder):
     """Count total subfolders and POIs in a folder recursively."""
+    ensure_items_loaded([folder])
+    stats = folder_stats.get(folder)
+    if stats is not None:
+        return stats.subfolders, stats.pois
+
+    # Folder outside the loaded tree (e.g. a parsed import) - walk it
     subfolder_count = 0
     poi_count = 0
     
@@ -54,6 +54,7 @@ class ClientVersion:
 RELEASE_CYCLE = 60 * 1000 * 60  # 1 Hour
 DEFAULT_URL = "https://github.com/bbbkada/EDMC-PlanetPOI/releases"
 WRAP_LENGTH = 200
+USER_DATA_DIRS = ("poi_library", "packs")  # Folders in the plugin directory kept across upgrades
 
 
 class ReleaseLink(HyperlinkLabel):
@@ -374,9 +375,9 @@ class Release(Frame):
             safe_log('debug', f"Extracting to: {extract_to}")
             safe_log('debug', f"ZIP contains: {z.namelist()[:5]}")  # Show first 5 files
             
-            # Extract all files EXCEPT poi.json - user data must never be overwritten
+            # Extract all files EXCEPT poi.json, the POI library and packs - user data must never be overwritten
             for member in z.namelist():
-                if not member.endswith('poi.json'):
+                if not member.endswith('poi.json') and not any(f'/{name}/' in member for name in USER_DATA_DIRS):
                     z.extract(member, extract_to)
                 else:
                     safe_log('info', f"Skipping extraction of {member} - preserving user data")
@@ -464,6 +465,17 @@ class Release(Frame):
                 shutil.copy2(backup_poi, target_poi)
                 safe_log('debug', "poi.json restored successfully")
             
+            # Restore the sharded POI library and installed packs the same way
+            for name in USER_DATA_DIRS:
+                backup_data = os.path.join(backup_dir, name)
+                target_data = os.path.join(target_plugin_dir, name)
+                if os.path.isdir(backup_data):
+                    safe_log('info', f"Restoring {name} from backup to preserve user data")
+                    if os.path.exists(target_data):
+                        shutil.rmtree(target_data)
+                    shutil.copytree(backup_data, target_data)
+                    safe_log('debug', f"{name} restored successfully")
+            
             safe_log('debug', "Installation complete")
             
             # Auto-remove old backups if enabled
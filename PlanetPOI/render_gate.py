@@ -0,0 +1,46 @@
+"""
+Render gate module for EDMC-PlanetPOI
+Skips overlay and GUI updates when nothing visible would change
+"""
+
+import time
+
+
+# Resend unchanged overlay graphics this often so they outlive their TTL
+# (heading guidance uses 15s, POI rows 30s)
+KEEPALIVE_SECONDS = 10.0
+
+
+class RenderGate:
+    """
+    Remembers the last signature drawn on each channel ("input", "overlay", "gui", ...).
+    A signature is any hashable summary of what a channel would display, e.g.
+    rounded bearing and distance text rather than raw coordinates, so centimetre
+    moves and flag-only Status.json writes compare equal and are skipped.
+    Channels with keepalive=True report a change again once the last draw is
+    older than keepalive_s, even if the signature is the same.
+    """
+
+    def __init__(self, keepalive_s=KEEPALIVE_SECONDS, clock=time.monotonic):
+        self.keepalive_s = keepalive_s
+        self.clock = clock
+        self._last = {}
+        self.skipped = 0
+
+    def changed(self, channel, signature, keepalive=False):
+        """Return True (and remember signature) if channel should be redrawn"""
+        now = self.clock()
+        last = self._last.get(channel)
+        if last is not None and last[0] == signature:
+            if not keepalive or now - last[1] < self.keepalive_s:
+                self.skipped += 1
+                return False
+        self._last[channel] = (signature, now)
+        return True
+
+    def reset(self, *channels):
+        """Forget signatures for the given channels, or all channels if none given"""
+        if not channels:
+            self._last.clear()
+        for channel in channels:
+            self._last.pop(channel, None)
@@ -0,0 +1,108 @@
+"""
+Render scheduler module for EDMC-PlanetPOI
+Coalesces position updates and renders overlay and GUI at fixed maximum rates
+"""
+
+import time
+
+
+DEFAULT_OVERLAY_RATE = 5  # Renders per second
+DEFAULT_GUI_RATE = 2
+MAX_RATE = 30
+
+
+class RenderChannel:
+    """One render target (overlay or GUI) with its own maximum rate"""
+
+    def __init__(self, name, render, rate):
+        self.name = name
+        self.render = render
+        self.interval = 1.0 / DEFAULT_OVERLAY_RATE
+        self.set_rate(rate)
+        self.dirty = False
+        self.after_id = None
+        self.last_run = 0.0
+        self.renders = 0
+
+    def set_rate(self, rate):
+        try:
+            rate = float(rate)
+        except (TypeError, ValueError):
+            return
+        if rate > 0:
+            self.interval = 1.0 / min(rate, MAX_RATE)
+
+
+class RenderScheduler:
+    """
+    Records that new position data has arrived and renders later with Tk after().
+    Each channel renders at most once per interval; any number of requests in
+    between coalesce into a single render of the latest state.
+    Without a Tk widget to schedule on (e.g. during startup) requests render at once.
+    """
+
+    def __init__(self, widget_getter, clock=time.monotonic):
+        self.widget_getter = widget_getter
+        self.clock = clock
+        self.channels = []
+        self.requests = 0
+
+    def add_channel(self, name, render, rate):
+        channel = RenderChannel(name, render, rate)
+        self.channels.append(channel)
+        return channel
+
+    def get_channel(self, name):
+        for channel in self.channels:
+            if channel.name == name:
+                return channel
+        return None
+
+    def set_rate(self, name, rate):
+        channel = self.get_channel(name)
+        if channel is not None:
+            channel.set_rate(rate)
+
+    def request(self, *names):
+        """Mark channels (all if none given) dirty and make sure each has a render scheduled"""
+        self.requests += 1
+        widget = self.widget_getter()
+        for channel in self.channels:
+            if names and channel.name not in names:
+                continue
+            channel.dirty = True
+            if channel.after_id is not None:
+                continue  # Already scheduled - this request coalesces into it
+            if widget is None:
+                self._run(channel)
+                continue
+            delay = channel.interval - (self.clock() - channel.last_run)
+            try:
+                channel.after_id = widget.after(max(0, int(delay * 1000)), lambda c=channel: self._run(c))
+            except Exception:
+                # Widget destroyed - render directly instead of losing the update
+                channel.after_id = None
+                self._run(channel)
+
+    def cancel(self):
+        """Cancel pending renders (e.g. on plugin stop or when the frame is rebuilt)"""
+        widget = self.widget_getter()
+        for channel in self.channels:
+            if channel.after_id is not None and widget is not None:
+                try:
+                    widget.after_cancel(channel.after_id)
+                except Exception:
+                    pass
+            channel.after_id = None
+
+    def _run(self, channel):
+        channel.after_id = None
+        if not channel.dirty:
+            return
+        channel.dirty = False
+        channel.last_run = self.clock()
+        channel.renders += 1
+        try:
+            channel.render()
+        except Exception as ex:
+            print(f"PPOI: {channel.name} render failed: {ex}")
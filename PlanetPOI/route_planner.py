@@ -0,0 +1,267 @@
+"""
+Route planner module for EDMC-PlanetPOI
+Orders the active POIs on a body into a short open tour from the current position
+"""
+
+import threading
+import time
+
+from PlanetPOI.calculations import calculate_bearing_and_distance
+
+
+DEFAULT_TIME_BUDGET = 0.1  # Seconds spent improving a tour
+OR_OPT_MAX_SEGMENT = 3
+_EPSILON = 1e-9
+
+
+def build_distance_matrix(points, planet_radius_m):
+    """
+    Great-circle distance matrix for a list of (lat, lon) tuples.
+    Symmetric, so only the upper triangle is calculated.
+    """
+    n = len(points)
+    matrix = [[0.0] * n for _ in range(n)]
+    for i in range(n):
+        lat1, lon1 = points[i]
+        row = matrix[i]
+        for j in range(i + 1, n):
+            lat2, lon2 = points[j]
+            distance, _ = calculate_bearing_and_distance(lat1, lon1, lat2, lon2, planet_radius_m)
+            row[j] = distance
+            matrix[j][i] = distance
+    return matrix
+
+
+def tour_length(tour, matrix):
+    """Length of an open tour (no return to start)"""
+    return sum(matrix[tour[i]][tour[i + 1]] for i in range(len(tour) - 1))
+
+
+def nearest_neighbour_tour(matrix, start=0):
+    """Greedy open tour from `start`, always moving to the closest unvisited node"""
+    n = len(matrix)
+    unvisited = set(range(n))
+    unvisited.discard(start)
+    tour = [start]
+    current = start
+    while unvisited:
+        row = matrix[current]
+        current = min(unvisited, key=row.__getitem__)
+        unvisited.remove(current)
+        tour.append(current)
+    return tour
+
+
+def two_opt(tour, matrix, deadline):
+    """
+    Improve an open tour in place by reversing segments.
+    The first node (start position) never moves. Returns True if improved.
+    """
+    n = len(tour)
+    improved_any = False
+    improved = True
+    while improved and time.perf_counter() < deadline:
+        improved = False
+        for i in range(1, n - 1):
+            a = tour[i - 1]
+            b = tour[i]
+            row_a = matrix[a]
+            d_ab = row_a[b]
+            row_b = matrix[b]
+            for j in range(i + 1, n):
+                c = tour[j]
+                if j == n - 1:
+                    # Reversing the tail only changes the edge into the segment
+                    delta = row_a[c] - d_ab
+                else:
+                    d = tour[j + 1]
+                    delta = row_a[c] + row_b[d] - d_ab - matrix[c][d]
+                if delta < -_EPSILON:
+                    tour[i:j + 1] = reversed(tour[i:j + 1])
+                    improved = improved_any = True
+                    b = tour[i]
+                    d_ab = row_a[b]
+                    row_b = matrix[b]
+            if time.perf_counter() >= deadline:
+                break
+    return improved_any
+
+
+def or_opt(tour, matrix, deadline, max_segment=OR_OPT_MAX_SEGMENT):
+    """
+    Improve an open tour in place by moving short segments (optionally reversed)
+    to a better position. The first node never moves. Returns True if improved.
+    """
+    improved_any = False
+    improved = True
+    while improved and time.perf_counter() < deadline:
+        improved = False
+        n = len(tour)
+        for seg_len in range(1, max_segment + 1):
+            i = 1
+            while i + seg_len <= n:
+                first = tour[i]
+                last = tour[i + seg_len - 1]
+                prev = tour[i - 1]
+                nxt = tour[i + seg_len] if i + seg_len < n else None
+                if nxt is None:
+                    removal_gain = matrix[prev][first]
+                else:
+                    removal_gain = matrix[prev][first] + matrix[last][nxt] - matrix[prev][nxt]
+
+                rest = tour[:i] + tour[i + seg_len:]
+                best_delta = -_EPSILON
+                best_move = None
+                for p in range(len(rest)):
+                    if p == i - 1:
+                        continue  # Same place it came from
+                    a = rest[p]
+                    b = rest[p + 1] if p + 1 < len(rest) else None
+                    d_ab = matrix[a][b] if b is not None else 0.0
+                    forward = matrix[a][first] + (matrix[last][b] if b is not None else 0.0) - d_ab
+                    backward = matrix[a][last] + (matrix[first][b] if b is not None else 0.0) - d_ab
+                    if forward - removal_gain < best_delta:
+                        best_delta = forward - removal_gain
+                        best_move = (p, False)
+                    if seg_len > 1 and backward - removal_gain < best_delta:
+                        best_delta = backward - removal_gain
+                        best_move = (p, True)
+
+                if best_move is not None:
+                    p, reverse = best_move
+                    segment = tour[i:i + seg_len]
+                    if reverse:
+                        segment.reverse()
+                    tour[:] = rest[:p + 1] + segment + rest[p + 1:]
+                    improved = improved_any = True
+                i += 1
+                if time.perf_counter() >= deadline:
+                    return improved_any
+    return improved_any
+
+
+def solve_open_tour(matrix, start=0, time_budget=DEFAULT_TIME_BUDGET):
+    """
+    Open tour over all nodes beginning at `start`.
+    Nearest-neighbour construction followed by 2-opt and Or-opt until no
+    improvement is found or the time budget runs out.
+    """
+    deadline = time.perf_counter() + time_budget
+    tour = nearest_neighbour_tour(matrix, start)
+    if len(tour) < 3:
+        return tour
+    while time.perf_counter() < deadline:
+        improved = two_opt(tour, matrix, deadline)
+        improved = or_opt(tour, matrix, deadline) or improved
+        if not improved:
+            break
+    return tour
+
+
+def _route_input(start_lat, start_lon, pois):
+    """(points, located POIs, unlocated POIs) with the start position as point 0"""
+    located = [poi for poi in pois if poi.get("lat") not in ["", None] and poi.get("lon") not in ["", None]]
+    unlocated = [poi for poi in pois if poi.get("lat") in ["", None] or poi.get("lon") in ["", None]]
+    points = [(start_lat, start_lon)] + [(float(poi["lat"]), float(poi["lon"])) for poi in located]
+    return points, located, unlocated
+
+
+def _solve_route(points, located, unlocated, planet_radius_m, time_budget):
+    if len(located) < 2:
+        return located + unlocated
+    matrix = build_distance_matrix(points, planet_radius_m)
+    tour = solve_open_tour(matrix, 0, time_budget)
+    return [located[node - 1] for node in tour[1:]] + unlocated
+
+
+def plan_route(start_lat, start_lon, pois, planet_radius_m, time_budget=DEFAULT_TIME_BUDGET):
+    """
+    Return `pois` reordered as a short route from the given position.
+    POIs without coordinates are appended at the end in their original order.
+    """
+    points, located, unlocated = _route_input(start_lat, start_lon, pois)
+    return _solve_route(points, located, unlocated, planet_radius_m, time_budget)
+
+
+class BackgroundRoutePlanner:
+    """
+    Plans routes on a worker thread, so a render tick never waits for one.
+    request() takes the POIs' coordinates on the calling thread and queues the
+    plan under a key; result(key) returns the route once it is planned and
+    None until then. Only the newest request is planned - an older one that
+    has not started yet is dropped.
+    """
+
+    def __init__(self, time_budget=DEFAULT_TIME_BUDGET):
+        self.time_budget = time_budget
+        self._lock = threading.Lock()
+        self._job = None             # Newest request, not started yet
+        self._result = (None, None)  # (key, route) of the last finished plan
+        self._thread = None
+        self._idle = threading.Event()
+        self._idle.set()
+        self.plans = 0
+
+    def request(self, key, start_lat, start_lon, pois, planet_radius_m):
+        points, located, unlocated = _route_input(start_lat, start_lon, pois)
+        with self._lock:
+            self._job = (key, points, located, unlocated, planet_radius_m)
+            self._idle.clear()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name="planetpoi-RoutePlanner", daemon=True)
+                self._thread.start()
+
+    def result(self, key):
+        """Route planned for key, or None while it is still being planned"""
+        with self._lock:
+            result_key, route = self._result
+        return route if result_key == key else None
+
+    def wait(self, timeout=None):
+        """Wait until every request so far is planned. Returns False on timeout."""
+        return self._idle.wait(timeout)
+
+    def _worker(self):
+        while True:
+            with self._lock:
+                job, self._job = self._job, None
+                if job is None:
+                    self._thread = None
+                    self._idle.set()
+                    return
+            key, points, located, unlocated, planet_radius_m = job
+            try:
+                route = _solve_route(points, located, unlocated, planet_radius_m, self.time_budget)
+            except Exception as ex:
+                print(f"PPOI: Route planning failed: {ex}")
+                route = located + unlocated
+            with self._lock:
+                self._result = (key, route)
+                self.plans += 1
+
+
+if __name__ == "__main__":
+    # Benchmark: python -m PlanetPOI.route_planner
+    import random
+
+    random.seed(42)
+    radius = 1_500_000
+    print(f"{'points':>6} {'matrix s':>9} {'NN km':>9} {'opt km':>9} {'gain':>6} {'solve s':>8}")
+    for count in (10, 25, 50, 100, 200, 500):
+        # Clustered around a landing site, like a set of bio samples or shard sites
+        points = [(0.0, 0.0)] + [(random.gauss(10, 2), random.gauss(20, 2)) for _ in range(count)]
+
+        t0 = time.perf_counter()
+        matrix = build_distance_matrix(points, radius)
+        t1 = time.perf_counter()
+
+        nn_length = tour_length(nearest_neighbour_tour(matrix), matrix)
+        budget = max(DEFAULT_TIME_BUDGET, count / 500)
+        t2 = time.perf_counter()
+        tour = solve_open_tour(matrix, 0, budget)
+        t3 = time.perf_counter()
+        opt_length = tour_length(tour, matrix)
+
+        assert sorted(tour) == list(range(len(points))) and tour[0] == 0
+        print(f"{count:>6} {t1 - t0:>9.3f} {nn_length / 1000:>9.1f} {opt_length / 1000:>9.1f} "
+              f"{(1 - opt_length / nn_length) * 100:>5.1f}% {t3 - t2:>8.3f}")
@@ -0,0 +1,286 @@
+"""
+Search index module for EDMC-PlanetPOI
+Inverted index over POI description, notes, system, body and folder names.
+Built by walking the tree once after a load or import, then kept in step by
+poi_manager's mutation hooks (add, change, remove, move), so neither an edit
+nor a query walks the tree.
+"""
+
+import bisect
+import re
+
+
+# Prefixes up to this length have their own posting sets; longer prefixes
+# are looked up as a range of the sorted vocabulary
+PREFIX_LENGTH = 3
+# Above this many changed tokens the vocabulary is re-sorted instead of patched
+RESORT_THRESHOLD = 1000
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def tokenize(text):
+    """Lowercase word tokens of a string"""
+    if not text:
+        return []
+    return _TOKEN_RE.findall(str(text).casefold())
+
+
+def poi_fields(poi, folder_path):
+    """The indexed fields of a POI; also used to tell whether it changed since it was indexed"""
+    return (
+        poi.get("description", ""),
+        poi.get("notes", ""),
+        poi.get("system", ""),
+        poi.get("body", ""),
+        folder_path
+    )
+
+
+def iter_pois_with_path(items, folder_path=()):
+    """Yield (poi, tuple of folder names) for every POI in a tree"""
+    for item in items:
+        item_type = item.get("type")
+        if item_type == "poi":
+            yield item, folder_path
+        elif item_type == "folder":
+            yield from iter_pois_with_path(item.get("children", []), folder_path + (item.get("name", ""),))
+
+
+def poi_tokens(fields):
+    """Token set of a POI's indexed fields"""
+    description, notes, system, body, folder_path = fields
+    text = f"{description} {notes} {system} {body} {' '.join(folder_path)}"
+    return set(_TOKEN_RE.findall(text.casefold()))
+
+
+class SearchIndex:
+    """
+    Token and prefix search over the POIs of one tree.
+    POIs are keyed on id(); the index keeps a reference to each POI, so the
+    id stays unique while it is indexed.
+    Results come in tree order as of the last full build; POIs added or moved
+    since then follow, in the order of those changes.
+    """
+
+    def __init__(self):
+        self._postings = {}   # token -> set of POI keys
+        self._prefixes = {}   # short prefix -> set of POI keys
+        self._vocab = []      # sorted tokens, for prefixes longer than PREFIX_LENGTH
+        self._pois = {}       # key -> POI
+        self._fields = {}     # key -> indexed fields when last indexed
+        self._tokens = {}     # key -> token set when last indexed
+        self._seq = {}        # key -> result order
+        self._next_seq = 0
+        self._order = []      # (seq, key) by seq; entries whose seq is no longer current are skipped
+        self._added_tokens = set()
+        self._removed_tokens = set()
+        self._pending_tree = None  # Tree to index before the next query
+
+    def __len__(self):
+        self._build_pending()
+        return len(self._pois)
+
+    def reset(self, all_pois):
+        """
+        Index a newly loaded tree. Building is deferred to the first query, so
+        loading the plugin does not wait for the tokenizer; changes made before
+        that need no hook calls, the build sees them.
+        """
+        self.__init__()
+        self._pending_tree = all_pois
+
+    def rebuild(self, all_pois):
+        """Index a tree from scratch"""
+        self.__init__()
+        postings = self._postings
+        for poi, folder_path in iter_pois_with_path(all_pois):
+            key = id(poi)
+            if key in self._pois:
+                continue
+            fields = poi_fields(poi, folder_path)
+            tokens = poi_tokens(fields)
+            self._pois[key] = poi
+            self._fields[key] = fields
+            self._tokens[key] = tokens
+            self._seq[key] = self._next_seq
+            self._order.append((self._next_seq, key))
+            self._next_seq += 1
+            for token in tokens:
+                posting = postings.get(token)
+                if posting is None:
+                    posting = postings[token] = set()
+                posting.add(key)
+        # Prefix sets from the (much smaller) vocabulary instead of per POI
+        for token, keys in postings.items():
+            for length in range(1, min(len(token), PREFIX_LENGTH) + 1):
+                self._prefixes.setdefault(token[:length], set()).update(keys)
+        self._vocab = sorted(postings)
+
+    # Mutation hooks - each costs the size of the changed item, not of the tree
+
+    def add(self, item, folder_path=()):
+        """A POI, or a folder with everything in it, was added below folder_path"""
+        if self._pending_tree is not None:
+            return
+        for poi, path in iter_pois_with_path([item], folder_path):
+            self._index_poi(id(poi), poi, poi_fields(poi, path))
+        self._update_vocab()
+
+    def update(self, poi, folder_path=()):
+        """A POI's description, notes, system or body may have changed"""
+        if self._pending_tree is not None:
+            return
+        key = id(poi)
+        if key not in self._pois:
+            return
+        fields = poi_fields(poi, folder_path)
+        if self._fields[key] != fields:
+            self._index_poi(key, poi, fields)
+            self._update_vocab()
+
+    def remove(self, item):
+        """A POI, or a folder with everything in it, was taken out of the tree"""
+        if self._pending_tree is not None:
+            return
+        for poi, _ in iter_pois_with_path([item]):
+            self._remove_poi(id(poi))
+        self._update_vocab()
+
+    def move(self, item, folder_path=()):
+        """A POI or folder was moved below folder_path; its POIs now sort last"""
+        if self._pending_tree is not None:
+            return
+        for poi, path in iter_pois_with_path([item], folder_path):
+            key = id(poi)
+            self._seq.pop(key, None)
+            self._index_poi(key, poi, poi_fields(poi, path))
+        self._update_vocab()
+
+    def search(self, query, limit=None):
+        """
+        POIs matching every word of the query, each word as a prefix, in tree
+        order (see the class docstring). An empty query matches nothing.
+        """
+        self._build_pending()
+        terms = tokenize(query)
+        if not terms:
+            return []
+        # Narrowest term first, so the intersection shrinks as fast as possible
+        sets = sorted((self._match_term(term) for term in set(terms)), key=len)
+        keys = sets[0]
+        for other in sets[1:]:
+            if not keys:
+                break
+            keys = keys & other
+        if not keys:
+            return []
+
+        if limit is not None and len(keys) * len(keys) > limit * len(self._seq):
+            # Dense result: scanning in order finds `limit` hits quickly
+            ordered = []
+            seq_of = self._seq
+            for seq, key in self._order:
+                if key in keys and seq_of[key] == seq:
+                    ordered.append(key)
+                    if len(ordered) >= limit:
+                        break
+        else:
+            ordered = sorted(keys, key=self._seq.__getitem__)
+            if limit is not None:
+                ordered = ordered[:limit]
+        return [self._pois[key] for key in ordered]
+
+    def count(self, query):
+        """Number of POIs matching a query"""
+        self._build_pending()
+        terms = tokenize(query)
+        if not terms:
+            return 0
+        sets = sorted((self._match_term(term) for term in set(terms)), key=len)
+        return len(sets[0].intersection(*sets[1:]))
+
+    def _build_pending(self):
+        if self._pending_tree is not None:
+            self.rebuild(self._pending_tree)
+
+    def _match_term(self, term):
+        if len(term) <= PREFIX_LENGTH:
+            return self._prefixes.get(term, set())
+        vocab = self._vocab
+        idx = bisect.bisect_left(vocab, term)
+        matches = []
+        while idx < len(vocab) and vocab[idx].startswith(term):
+            matches.append(self._postings[vocab[idx]])
+            idx += 1
+        if not matches:
+            return set()
+        if len(matches) == 1:
+            return matches[0]
+        return set().union(*matches)
+
+    def _index_poi(self, key, poi, fields):
+        if key not in self._seq:
+            self._seq[key] = self._next_seq
+            self._order.append((self._next_seq, key))
+            self._next_seq += 1
+        old_tokens = self._tokens.get(key, set())
+        new_tokens = poi_tokens(fields)
+        for token in old_tokens - new_tokens:
+            self._unpost(key, token, new_tokens)
+        for token in new_tokens - old_tokens:
+            self._post(key, token)
+        self._pois[key] = poi
+        self._fields[key] = fields
+        self._tokens[key] = new_tokens
+
+    def _remove_poi(self, key):
+        for token in self._tokens.pop(key, ()):
+            self._unpost(key, token, ())
+        self._pois.pop(key, None)
+        self._fields.pop(key, None)
+        self._seq.pop(key, None)
+
+    def _post(self, key, token):
+        posting = self._postings.get(token)
+        if posting is None:
+            posting = self._postings[token] = set()
+            self._added_tokens.add(token)
+            self._removed_tokens.discard(token)
+        posting.add(key)
+        for length in range(1, min(len(token), PREFIX_LENGTH) + 1):
+            self._prefixes.setdefault(token[:length], set()).add(key)
+
+    def _unpost(self, key, token, remaining):
+        posting = self._postings[token]
+        posting.discard(key)
+        if not posting:
+            del self._postings[token]
+            self._removed_tokens.add(token)
+            self._added_tokens.discard(token)
+        # A token the POI keeps may share the prefix
+        for length in range(1, min(len(token), PREFIX_LENGTH) + 1):
+            prefix = token[:length]
+            if any(other.startswith(prefix) for other in remaining):
+                continue
+            keys = self._prefixes.get(prefix)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._prefixes[prefix]
+
+    def _update_vocab(self):
+        if len(self._order) > 2 * len(self._seq) + RESORT_THRESHOLD:
+            # Mostly removed or moved POIs - drop their old entries
+            self._order = [(seq, key) for seq, key in self._order if self._seq.get(key) == seq]
+        if len(self._added_tokens) + len(self._removed_tokens) > RESORT_THRESHOLD:
+            self._vocab = sorted(self._postings)
+        else:
+            for token in self._removed_tokens:
+                idx = bisect.bisect_left(self._vocab, token)
+                if idx < len(self._vocab) and self._vocab[idx] == token:
+                    del self._vocab[idx]
+            for token in self._added_tokens:
+                bisect.insort(self._vocab, token)
+        self._added_tokens.clear()
+        self._removed_tokens.clear()
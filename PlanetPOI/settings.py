@@ -0,0 +1,60 @@
+"""
+Settings module for EDMC-PlanetPOI
+Immutable snapshot of the plugin settings, so the per-tick hot path never
+reads config (the Windows registry) directly
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Settings:
+    """One consistent set of settings. Replace as a whole, never modify."""
+    calc_with_altitude: bool = False
+    max_overlay_rows: int = 10
+    overlay_left_margin: int = 500
+    show_gui_info: bool = True
+    heading_guidance: bool = True
+    guidance_threshold: int = 4
+    guidance_distance: int = 2000
+    target_mode: str = "first"
+    auto_deactivate: bool = False
+    overlay_rate: int = 5
+    gui_rate: int = 2
+
+
+_current = Settings()
+_listeners = []
+
+
+def current():
+    """Return the active settings snapshot"""
+    return _current
+
+
+def publish(new_settings):
+    """
+    Swap in a new snapshot and notify listeners with (old, new) if anything changed.
+    Readers holding the old snapshot keep a consistent view until their next call.
+    """
+    global _current
+    old = _current
+    _current = new_settings
+    if new_settings != old:
+        for listener in list(_listeners):
+            try:
+                listener(old, new_settings)
+            except Exception as ex:
+                print(f"PPOI: settings listener failed: {ex}")
+    return old
+
+
+def add_listener(listener):
+    """Call listener(old, new) whenever a changed snapshot is published"""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def remove_listener(listener):
+    if listener in _listeners:
+        _listeners.remove(listener)
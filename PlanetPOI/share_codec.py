@@ -0,0 +1,291 @@
+"""
+Share codec module for EDMC-PlanetPOI
+Encodes and decodes POI share links (v1 single POI JSON, v2 compact multi-POI binary)
+"""
+
+import base64
+import json
+import zlib
+
+from PlanetPOI.poi_manager import get_all_pois_flat, split_system_and_body
+
+
+SHARE_BASE_URL = "https://bbbkada.github.io/EDMC-PlanetPOI/share/"
+
+# v2 fragments start with this marker. "." is not in the base64url alphabet,
+# so it can never be confused with a v1 fragment.
+V2_PREFIX = "2."
+
+# Coordinates are stored as fixed-point integers with 5 decimals (~1 m on an Earth-sized body)
+COORD_SCALE = 100_000
+
+# Guard against decompression bombs in pasted links
+MAX_V2_PAYLOAD = 4 * 1024 * 1024
+
+FLAG_HAS_COORDS = 0x01
+FLAG_ACTIVE = 0x02
+FLAG_HAS_NOTES = 0x04
+
+
+def _b64url_encode(data):
+    """Encode bytes as unpadded base64url text"""
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+def _b64url_decode(text):
+    """Decode unpadded base64url text to bytes"""
+    text = text.strip().replace("+", "-").replace("/", "_")
+    text += "=" * (-len(text) % 4)
+    return base64.urlsafe_b64decode(text.encode("ascii"))
+
+
+def _get_fragment(url):
+    """Return the part after '#' or None if the URL has no payload"""
+    if not url or "#" not in url:
+        return None
+    fragment = url.split("#", 1)[1].strip()
+    return fragment or None
+
+
+def _has_coords(poi):
+    return poi.get("lat") not in ["", None] and poi.get("lon") not in ["", None]
+
+
+# ---------------------------------------------------------------------------
+# v1: one POI as base64url JSON
+# ---------------------------------------------------------------------------
+
+def encode_v1(poi):
+    """Encode a single POI as a v1 fragment"""
+    poi_data = {
+        "v": 1,
+        "system": poi.get("system", ""),
+        "body": poi.get("body", ""),
+        "lat": poi.get("lat", 0),
+        "lon": poi.get("lon", 0),
+        "description": poi.get("description", ""),
+        "active": poi.get("active", True)
+    }
+    json_str = json.dumps(poi_data, separators=(',', ':'))
+    return _b64url_encode(json_str.encode("utf-8"))
+
+
+def decode_v1(fragment):
+    """Decode a v1 fragment. Returns POI dict or None if invalid"""
+    poi_data = json.loads(_b64url_decode(fragment).decode("utf-8"))
+    if not isinstance(poi_data, dict) or poi_data.get("v") != 1:
+        return None
+
+    # Support both old format (body) and new format (system + body)
+    if "system" in poi_data:
+        if "lat" not in poi_data or "lon" not in poi_data:
+            return None
+    elif "body" in poi_data:
+        system_name, body_part = split_system_and_body(poi_data.get("body", ""))
+        poi_data["system"] = system_name
+        poi_data["body"] = body_part
+    else:
+        return None
+    return poi_data
+
+
+# ---------------------------------------------------------------------------
+# v2: many POIs, string table + delta coded fixed-point coords + zlib
+# ---------------------------------------------------------------------------
+
+def _write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _write_svarint(out, value):
+    # Zigzag so small negative deltas stay small
+    _write_varint(out, (value << 1) if value >= 0 else ((-value << 1) - 1))
+
+
+def _write_str(out, text):
+    data = (text or "").encode("utf-8")
+    _write_varint(out, len(data))
+    out.extend(data)
+
+
+class _Reader:
+    """Sequential reader over a v2 payload"""
+
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+
+    def byte(self):
+        value = self.data[self.pos]
+        self.pos += 1
+        return value
+
+    def varint(self):
+        result = 0
+        shift = 0
+        while True:
+            b = self.data[self.pos]
+            self.pos += 1
+            result |= (b & 0x7F) << shift
+            if not b & 0x80:
+                return result
+            shift += 7
+            if shift > 63:
+                raise ValueError("varint too long")
+
+    def svarint(self):
+        value = self.varint()
+        return (value >> 1) if not value & 1 else -((value + 1) >> 1)
+
+    def string(self):
+        length = self.varint()
+        end = self.pos + length
+        if end > len(self.data):
+            raise ValueError("truncated string")
+        text = self.data[self.pos:end].decode("utf-8")
+        self.pos = end
+        return text
+
+
+def encode_v2(pois, name=""):
+    """
+    Encode a list of POIs as a v2 fragment.
+
+    Layout before compression:
+        varint reserved, str name,
+        varint string count, strings (system and body names, deduplicated),
+        varint POI count, then per POI:
+        byte flags, varint system index, varint body index,
+        [zigzag dlat, zigzag dlon], str description, [str notes]
+    """
+    strings = []
+    string_index = {}
+
+    def intern(text):
+        text = text or ""
+        idx = string_index.get(text)
+        if idx is None:
+            idx = len(strings)
+            string_index[text] = idx
+            strings.append(text)
+        return idx
+
+    records = []
+    for poi in pois:
+        records.append((intern(poi.get("system", "")), intern(poi.get("body", "")), poi))
+
+    out = bytearray()
+    _write_varint(out, 0)
+    _write_str(out, name)
+    _write_varint(out, len(strings))
+    for text in strings:
+        _write_str(out, text)
+
+    _write_varint(out, len(records))
+    prev_lat = 0
+    prev_lon = 0
+    for system_idx, body_idx, poi in records:
+        flags = 0
+        has_coords = _has_coords(poi)
+        if has_coords:
+            flags |= FLAG_HAS_COORDS
+        if poi.get("active", True):
+            flags |= FLAG_ACTIVE
+        notes = poi.get("notes", "")
+        if notes:
+            flags |= FLAG_HAS_NOTES
+
+        out.append(flags)
+        _write_varint(out, system_idx)
+        _write_varint(out, body_idx)
+        if has_coords:
+            lat = int(round(float(poi["lat"]) * COORD_SCALE))
+            lon = int(round(float(poi["lon"]) * COORD_SCALE))
+            _write_svarint(out, lat - prev_lat)
+            _write_svarint(out, lon - prev_lon)
+            prev_lat, prev_lon = lat, lon
+        _write_str(out, poi.get("description", ""))
+        if notes:
+            _write_str(out, notes)
+
+    return V2_PREFIX + _b64url_encode(zlib.compress(bytes(out), 9))
+
+
+def decode_v2(fragment):
+    """Decode a v2 fragment. Returns (name, list of POI dicts)"""
+    if fragment.startswith(V2_PREFIX):
+        fragment = fragment[len(V2_PREFIX):]
+
+    decompressor = zlib.decompressobj()
+    data = decompressor.decompress(_b64url_decode(fragment), MAX_V2_PAYLOAD)
+    if decompressor.unconsumed_tail:
+        raise ValueError("share payload too large")
+
+    reader = _Reader(data)
+    reader.varint()  # reserved
+    name = reader.string()
+    strings = [reader.string() for _ in range(reader.varint())]
+
+    pois = []
+    lat = 0
+    lon = 0
+    for _ in range(reader.varint()):
+        flags = reader.byte()
+        system = strings[reader.varint()]
+        body = strings[reader.varint()]
+        poi_lat = ""
+        poi_lon = ""
+        if flags & FLAG_HAS_COORDS:
+            lat += reader.svarint()
+            lon += reader.svarint()
+            poi_lat = lat / COORD_SCALE
+            poi_lon = lon / COORD_SCALE
+        description = reader.string()
+        notes = reader.string() if flags & FLAG_HAS_NOTES else ""
+        pois.append({
+            "type": "poi",
+            "system": system,
+            "body": body,
+            "lat": poi_lat,
+            "lon": poi_lon,
+            "description": description,
+            "notes": notes,
+            "active": bool(flags & FLAG_ACTIVE)
+        })
+    return name, pois
+
+
+# ---------------------------------------------------------------------------
+# URL helpers
+# ---------------------------------------------------------------------------
+
+def build_share_url(item):
+    """Build share URL for a POI (v1) or a folder (v2 with all POIs in it)"""
+    if item.get("type") == "folder":
+        return build_batch_share_url(get_all_pois_flat(item.get("children", [])), item.get("name", ""))
+    return f"{SHARE_BASE_URL}#{encode_v1(item)}"
+
+
+def build_batch_share_url(pois, name=""):
+    """Build v2 share URL for a list of POIs"""
+    return f"{SHARE_BASE_URL}#{encode_v2(pois, name)}"
+
+
+def parse_share_url_pois(url):
+    """
+    Parse any share URL.
+    Returns (name, list of POI dicts) or None if the link is invalid.
+    """
+    fragment = _get_fragment(url)
+    if not fragment:
+        return None
+    if fragment.startswith(V2_PREFIX):
+        name, pois = decode_v2(fragment)
+        return name, pois
+    poi_data = decode_v1(fragment)
+    if poi_data is None:
+        return None
+    return "", [poi_data]
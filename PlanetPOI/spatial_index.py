@@ -0,0 +1,175 @@
+"""
+Spatial index module for EDMC-PlanetPOI
+Per-body k-d tree over 3D unit vectors for nearest-POI queries
+"""
+
+import heapq
+import math
+
+
+def to_unit_vector(lat, lon):
+    """Convert lat/lon in degrees to a point on the unit sphere"""
+    phi = math.radians(lat)
+    lam = math.radians(lon)
+    cos_phi = math.cos(phi)
+    return (cos_phi * math.cos(lam), cos_phi * math.sin(lam), math.sin(phi))
+
+
+def chord_to_distance(chord_sq, planet_radius_m):
+    """Convert squared chord length on the unit sphere to surface distance"""
+    chord = math.sqrt(min(chord_sq, 4.0))
+    return 2 * math.asin(chord / 2) * planet_radius_m
+
+
+def _has_coords(poi):
+    return poi.get("lat") not in ["", None] and poi.get("lon") not in ["", None]
+
+
+class BodyIndex:
+    """
+    Static k-d tree of the POIs on one body.
+    Straight-line (chord) distance between unit vectors is monotonic with
+    great-circle distance, so nearest in 3D is nearest on the surface.
+    """
+
+    def __init__(self, pois):
+        self.points = []
+        self.pois = []
+        for poi in pois:
+            if _has_coords(poi):
+                self.points.append(to_unit_vector(float(poi["lat"]), float(poi["lon"])))
+                self.pois.append(poi)
+        self._ids = {id(poi) for poi in self.pois}
+        # Node arrays: point index, split axis, left child, right child (-1 = none)
+        self._node_point = []
+        self._node_axis = []
+        self._node_left = []
+        self._node_right = []
+        self._root = self._build(list(range(len(self.points))), 0)
+
+    def __len__(self):
+        return len(self.pois)
+
+    def contains(self, poi):
+        return id(poi) in self._ids
+
+    def _build(self, indices, depth):
+        if not indices:
+            return -1
+        axis = depth % 3
+        indices.sort(key=lambda i: self.points[i][axis])
+        mid = len(indices) // 2
+        node = len(self._node_point)
+        self._node_point.append(indices[mid])
+        self._node_axis.append(axis)
+        self._node_left.append(-1)
+        self._node_right.append(-1)
+        self._node_left[node] = self._build(indices[:mid], depth + 1)
+        self._node_right[node] = self._build(indices[mid + 1:], depth + 1)
+        return node
+
+    def k_nearest(self, lat, lon, k):
+        """Return up to k (chord_sq, poi) pairs, closest first"""
+        if self._root < 0 or k <= 0:
+            return []
+        target = to_unit_vector(lat, lon)
+        points = self.points
+        heap = []  # max-heap on distance via negated keys: (-dist_sq, point index)
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node < 0:
+                continue
+            idx = self._node_point[node]
+            p = points[idx]
+            dx = p[0] - target[0]
+            dy = p[1] - target[1]
+            dz = p[2] - target[2]
+            dist_sq = dx * dx + dy * dy + dz * dz
+            if len(heap) < k:
+                heapq.heappush(heap, (-dist_sq, idx))
+            elif dist_sq < -heap[0][0]:
+                heapq.heapreplace(heap, (-dist_sq, idx))
+
+            axis = self._node_axis[node]
+            diff = target[axis] - p[axis]
+            near, far = (self._node_left[node], self._node_right[node]) if diff < 0 else (self._node_right[node], self._node_left[node])
+            # Visit the far side only if the splitting plane is closer than the current worst match
+            if len(heap) < k or diff * diff < -heap[0][0]:
+                stack.append(far)
+            stack.append(near)
+
+        return [(-neg, self.pois[idx]) for neg, idx in sorted(heap, reverse=True)]
+
+    def nearest(self, lat, lon):
+        """Return (chord_sq, poi) for the closest POI, or None if empty"""
+        result = self.k_nearest(lat, lon, 1)
+        return result[0] if result else None
+
+
+class BodyIndexCache:
+    """Keeps one BodyIndex per body, rebuilt when the POI tree revision changes"""
+
+    def __init__(self):
+        self._entries = {}
+
+    def get(self, body_name, revision, pois_getter):
+        """Return index for body, calling pois_getter() to rebuild if stale"""
+        entry = self._entries.get(body_name)
+        if entry is None or entry[0] != revision:
+            entry = (revision, BodyIndex(pois_getter()))
+            self._entries[body_name] = entry
+        return entry[1]
+
+    def put(self, body_name, revision, index):
+        """Store an index built elsewhere (e.g. prefetched on a worker thread)"""
+        self._entries[body_name] = (revision, index)
+
+    def clear(self):
+        self._entries.clear()
+
+
+class TargetSelector:
+    """
+    Picks the nearest POI as guidance target with hysteresis, so two POIs at
+    almost the same distance don't make the target flap between them.
+    The current target is kept until another POI is closer by at least
+    max(hysteresis_m, hysteresis_ratio * current distance).
+    """
+
+    def __init__(self, hysteresis_m=20, hysteresis_ratio=0.1):
+        self.hysteresis_m = hysteresis_m
+        self.hysteresis_ratio = hysteresis_ratio
+        self.current = None
+
+    def reset(self):
+        self.current = None
+
+    def select(self, index, lat, lon, planet_radius_m, skip=()):
+        """
+        Return the target POI for this position, or None if the index is empty.
+        POIs whose id is in `skip` (e.g. already reached) are passed over.
+        """
+        best = None
+        for candidate in index.k_nearest(lat, lon, len(skip) + 1):
+            if id(candidate[1]) not in skip:
+                best = candidate
+                break
+        if best is None:
+            self.current = None
+            return None
+        best_dist = chord_to_distance(best[0], planet_radius_m)
+        best_poi = best[1]
+
+        current = self.current
+        if (current is not None and current is not best_poi and id(current) not in skip
+                and index.contains(current) and _has_coords(current)):
+            cx, cy, cz = to_unit_vector(float(current["lat"]), float(current["lon"]))
+            tx, ty, tz = to_unit_vector(lat, lon)
+            current_dist = chord_to_distance((cx - tx) ** 2 + (cy - ty) ** 2 + (cz - tz) ** 2, planet_radius_m)
+            margin = max(self.hysteresis_m, self.hysteresis_ratio * current_dist)
+            if best_dist > current_dist - margin:
+                return current
+
+        self.current = best_poi
+        return best_poi
@@ -0,0 +1,121 @@
+"""
+Startup recovery module for EDMC-PlanetPOI
+Finds the current system, body and position when the plugin starts mid-session,
+by scanning the newest journal backwards and reading Status.json
+"""
+
+import glob
+import json
+import mmap
+import os
+
+from PlanetPOI.journal_ingest import JOURNAL_PATTERN, event_name
+
+
+STATUS_FILE = "Status.json"
+
+# Events that tell which system the commander is in
+SYSTEM_EVENTS = frozenset((
+    "Location", "FSDJump", "CarrierJump", "ApproachBody", "LeaveBody",
+    "Touchdown", "Liftoff", "SupercruiseEntry", "SupercruiseExit"
+))
+# Events after which the commander is at a body (the event's "Body")
+BODY_SET_EVENTS = frozenset(("ApproachBody", "Touchdown", "Liftoff", "Disembark", "Embark"))
+# Events after which the commander is not at any body
+BODY_CLEAR_EVENTS = frozenset(("LeaveBody", "FSDJump", "CarrierJump", "SupercruiseEntry"))
+RECOVERY_EVENTS = SYSTEM_EVENTS | BODY_SET_EVENTS | BODY_CLEAR_EVENTS | {"Shutdown"}
+
+_UNKNOWN = object()
+
+
+def find_latest_journal(journal_dir):
+    """Newest Journal.*.log in the folder, or None"""
+    files = glob.glob(os.path.join(journal_dir, JOURNAL_PATTERN))
+    if not files:
+        return None
+    return max(files, key=lambda path: (os.path.getmtime(path), path))
+
+
+def iter_lines_backwards(path):
+    """
+    Yield the lines of a file from last to first (as bytes, without newline).
+    The file is memory-mapped, so only the pages actually visited are read.
+    """
+    with open(path, "rb") as fp:
+        try:
+            data = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty file
+            return
+        with data:
+            end = len(data)
+            while end > 0:
+                start = data.rfind(b"\n", 0, end - 1) + 1
+                line = data[start:end].strip()
+                if line:
+                    yield line
+                end = start
+
+
+def scan_journal_state(path):
+    """
+    Latest (system, body) from a journal, reading backwards until both are known.
+    body is None when the last event left the body; both are None if the
+    game was shut down or nothing is known.
+    """
+    system = _UNKNOWN
+    body = _UNKNOWN
+    for line in iter_lines_backwards(path):
+        event = event_name(line)
+        if event not in RECOVERY_EVENTS:
+            continue
+        if event == "Shutdown":
+            if system is _UNKNOWN and body is _UNKNOWN:
+                return None, None  # Game closed since - nothing is current
+            break
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+
+        if body is _UNKNOWN:
+            if event in BODY_SET_EVENTS and entry.get("Body"):
+                body = entry["Body"]
+            elif event in BODY_CLEAR_EVENTS:
+                body = None
+            elif event == "Location":
+                body = entry.get("Body") if entry.get("BodyType") == "Planet" else None
+        if system is _UNKNOWN and event in SYSTEM_EVENTS and entry.get("StarSystem"):
+            system = entry["StarSystem"]
+        if system is not _UNKNOWN and body is not _UNKNOWN:
+            break
+    return (None if system is _UNKNOWN else system), (None if body is _UNKNOWN else body)
+
+
+def read_status(journal_dir):
+    """Current Status.json as a dict, or None if missing or half-written"""
+    try:
+        with open(os.path.join(journal_dir, STATUS_FILE), "r", encoding="utf8") as fp:
+            status = json.load(fp)
+        return status if isinstance(status, dict) else None
+    except (OSError, ValueError):
+        return None
+
+
+def recover(journal_dir):
+    """
+    Return (system, body, status) for the running game session.
+    Cost depends on how far back the last location event is, not on journal size.
+    """
+    if not journal_dir or not os.path.isdir(journal_dir):
+        return None, None, None
+    system = body = None
+    journal = find_latest_journal(journal_dir)
+    if journal:
+        try:
+            system, body = scan_journal_state(journal)
+        except OSError as ex:
+            print(f"PPOI: Could not read {journal}: {ex}")
+    status = read_status(journal_dir) if system else None
+    if status and status.get("BodyName"):
+        body = status["BodyName"]
+    return system, body, status
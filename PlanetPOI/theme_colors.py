@@ -0,0 +1,51 @@
+"""
+Theme colours module for EDMC-PlanetPOI
+Resolves theme-dependent label colours once and only reconfigures widgets
+when their colour actually changes
+"""
+
+import tkinter as tk
+
+from theme import theme
+
+
+ON_COURSE_COLOR = "#00aa00"
+
+_cache = {}
+
+
+def invalidate():
+    """Forget resolved colours - call when the EDMC theme may have changed"""
+    _cache.clear()
+
+
+def get_default_foreground():
+    """Foreground colour the current EDMC theme gives a plain tk.Label"""
+    color = _cache.get("default_fg")
+    if color is None:
+        # Only done once per theme: a throwaway label themed and read back
+        temp_label = tk.Label()
+        try:
+            theme.update(temp_label)
+            color = temp_label.cget("foreground")
+        finally:
+            temp_label.destroy()
+        _cache["default_fg"] = color
+    return color
+
+
+def get_guidance_color(on_course):
+    """Colour of the guidance bearing/distance label"""
+    return ON_COURSE_COLOR if on_course else get_default_foreground()
+
+
+def set_foreground(widget, color):
+    """
+    Set widget foreground only if it differs from the colour last set here.
+    Returns True if the widget was touched.
+    """
+    if getattr(widget, "_ppoi_fg", None) == color:
+        return False
+    widget.config(foreground=color)
+    widget._ppoi_fg = color
+    return True
@@ -1,3 +1,4 @@
+import dataclasses
 import functools
 import l10n
 import tkinter as tk
@@ -8,7 +9,7 @@ from config import config
 from theme import theme
 import json
 import os
-import base64
+import queue
 import urllib.parse
 from PlanetPOI import overlay  # overlay.py i PlanetPOI-mappen
 from PlanetPOI.AutoCompleter import AutoCompleter
@@ -25,10 +26,21 @@ from PlanetPOI.calculations import (
     safe_int
 )
 from PlanetPOI import poi_manager
-from PlanetPOI import guidance_manager
 from PlanetPOI import context_menus
 from PlanetPOI import dialogs
 from PlanetPOI import gui_builder
+from PlanetPOI import share_codec
+from PlanetPOI import poi_io
+from PlanetPOI import poi_dedupe
+from PlanetPOI import journal_ingest
+from PlanetPOI import startup_recovery
+from PlanetPOI.body_prefetch import BodyPrefetcher
+from PlanetPOI import navigation
+from PlanetPOI.render_gate import RenderGate
+from PlanetPOI import render_scheduler
+from PlanetPOI.dead_reckoning import PositionPredictor
+from PlanetPOI import settings
+from PlanetPOI import theme_colors
 
 plugin_tl = functools.partial(l10n.translations.tl, context=__file__)
 
@@ -50,6 +62,11 @@ GUIDANCE_DEFAULT_FG = None  # Store default foreground color for guidance center
 # Initialize POI file path
 POI_FILE = os.path.join(os.path.dirname(__file__), "poi.json")
 poi_manager.set_poi_file(POI_FILE)
+# POIs are stored as one shard per top-level folder; poi.json is split into it on first start
+poi_manager.set_library(
+    os.path.join(os.path.dirname(__file__), "poi_library"),
+    os.path.join(os.path.dirname(__file__), "packs")
+)
 
 # POI storage
 ALL_POIS = []
@@ -65,6 +82,11 @@ GUIDANCE_THRESHOLD_KEY = "planetpoi_guidance_threshold"  # Degrees tolerance for
 GUIDANCE_DISTANCE_KEY = "planetpoi_guidance_distance"  # Distance in meters where guidance stops
 AUTO_UPDATE_KEY = "planetpoi_auto_update"  # Auto-update plugin
 AUTO_REMOVE_BACKUPS_KEY = "planetpoi_auto_remove_backups"  # Auto-remove old backups
+DUPLICATE_TOLERANCE_KEY = "planetpoi_duplicate_tolerance"  # Degrees within which imported POIs count as duplicates
+OVERLAY_RATE_KEY = "planetpoi_overlay_rate"  # Max overlay renders per second
+GUI_RATE_KEY = "planetpoi_gui_rate"  # Max EDMC GUI label updates per second
+TARGET_MODE_KEY = "planetpoi_target_mode"  # Which POI guidance targets: "first" (tree order), "nearest" or "route"
+AUTO_DEACTIVATE_KEY = "planetpoi_auto_deactivate"  # Deactivate POIs when their geofence is entered
 
 ALT_VAR = None
 ROWS_VAR = None
@@ -75,6 +97,32 @@ GUIDANCE_THRESHOLD_VAR = None
 GUIDANCE_DISTANCE_VAR = None
 AUTO_UPDATE_VAR = None
 AUTO_REMOVE_BACKUPS_VAR = None
+DUPLICATE_TOLERANCE_VAR = None
+TARGET_MODE_VAR = None
+AUTO_DEACTIVATE_VAR = None
+OVERLAY_RATE_VAR = None
+GUI_RATE_VAR = None
+SEARCH_VAR = None
+PREFS_SEARCH_VAR = None
+
+from PlanetPOI.navigation import TARGET_MODE_FIRST, TARGET_MODE_NEAREST, TARGET_MODE_ROUTE, TARGET_MODES
+
+# Target selection, planned route and guidance zone state (no Tk - see PlanetPOI/navigation)
+NAV_ENGINE = navigation.NavigationEngine()
+
+# Per-body POI slices, built in the background when approaching a body (see journal_entry)
+BODY_PREFETCHER = BodyPrefetcher()
+
+# Remembers what was last drawn so unchanged dashboard updates can be skipped
+RENDER_GATE = RenderGate()
+
+# Renders overlay and GUI from the latest position at a limited rate (see dashboard_entry)
+RENDER_SCHEDULER = render_scheduler.RenderScheduler(lambda: PLUGIN_FRAME)
+RENDER_SCHEDULER.add_channel("overlay", lambda: render_overlay_frame(), render_scheduler.DEFAULT_OVERLAY_RATE)
+RENDER_SCHEDULER.add_channel("gui", lambda: update_gui_for_current_position(), render_scheduler.DEFAULT_GUI_RATE)
+
+# Extrapolates position between Status.json updates so guidance moves smoothly
+POSITION_PREDICTOR = PositionPredictor()
 
 # Store overlay info for display in GUI
 OVERLAY_INFO_TEXT = ""
@@ -88,8 +136,6 @@ last_heading = None  # Current heading from dashboard
 
 # Heading guidance instance for graphical arrows
 heading_guidance = None
-within_2km_zone = False  # Track if we're within 2km to show checkmark only once
-gui_guidance_visible = False  # Track if GUI guidance widgets are currently shown
 
 # Settings table sorting
 SORT_COLUMN = "body"  # Default sort column: "body", "lat", "lon", "description"
@@ -97,7 +143,8 @@ SORT_REVERSE = False  # False = ascending, True = descending
 
 # Functions now imported from modules: format_body_name, get_full_body_name, load_pois, save_pois, split_system_and_body
 # calculations: calculate_bearing_and_distance, format_distance_with_unit, scale_geometry, safe_int
-# poi_manager: load_pois, save_pois, get_full_body_name, split_system_and_body, get_all_pois_flat, create_folder, delete_item, move_item
+# poi_manager: load_pois, save_pois, get_full_body_name, split_system_and_body, get_all_pois_flat, search_pois, create_folder, delete_item, move_item,
+# set_pois_active, delete_items, move_items
 
 # Wrapper functions for backward compatibility
 def load_pois():
@@ -121,28 +168,74 @@ def get_all_pois_flat(items):
     """Wrapper for poi_manager.get_all_pois_flat()"""
     return poi_manager.get_all_pois_flat(items)
 
-def export_pois_to_file(parent_frame):
-    """Export POIs to a user-selected JSON file."""
-    from tkinter import filedialog
+def search_pois(query, limit=None):
+    """Wrapper for poi_manager.search_pois()"""
+    return poi_manager.search_pois(query, limit)
+
+def ensure_pois_loaded(system=None):
+    """Wrapper for poi_manager.ensure_loaded()"""
+    return poi_manager.ensure_loaded(system)
+
+def ensure_systems_loaded(items):
+    """Load the shards with POIs in the systems of items"""
+    return poi_manager.ensure_systems_loaded(poi.get("system") for poi in get_all_pois_flat(items) if poi.get("system"))
+
+def export_pois_to_file(parent_frame, folder=None):
+    """Export all POIs, or one folder subtree, to JSON, CSV or GeoJSON on a worker thread."""
+    from tkinter import filedialog, messagebox
+    if folder is not None:
+        poi_manager.ensure_items_loaded([folder])
+    else:
+        ensure_pois_loaded()
     try:
+        if folder is not None:
+            items = [folder]
+            initial_name = f"{folder.get('name', 'poi_export')}.json"
+        else:
+            items = ALL_POIS
+            initial_name = "poi_export.json"
         file_path = filedialog.asksaveasfilename(
             parent=parent_frame,
             title="Export POIs",
             defaultextension=".json",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
-            initialfile="poi_export.json"
+            filetypes=[("JSON files", "*.json"), ("CSV files", "*.csv"), ("GeoJSON files", "*.geojson"), ("All files", "*.*")],
+            initialfile=initial_name
         )
-        if file_path:
-            with open(file_path, "w", encoding="utf8") as f:
-                json.dump(ALL_POIS, f, indent=2)
-            print(f"PPOI: POIs exported to {file_path}")
+        if not file_path:
+            return
+        
+        # Snapshot taken here on the Tk thread - edits made during the export do not reach the file
+        job = poi_io.ExportJob(file_path, items)
+        progress = dialogs.show_progress_dialog(parent_frame, plugin_tl("Export POIs"), on_cancel=job.cancel)
+        job.start()
+        
+        def poll():
+            try:
+                while True:
+                    kind, payload, stats = job.messages.get_nowait()
+                    if kind == "progress":
+                        progress.set_progress(payload, plugin_tl("{count} POIs written").format(count=stats["pois"]))
+                        continue
+                    progress.destroy()
+                    if kind == "done":
+                        print(f"PPOI: {payload} POIs exported to {file_path}")
+                    elif kind == "error":
+                        print(f"PPOI: Error exporting POIs: {payload}")
+                        messagebox.showerror(plugin_tl("Export POIs"), str(payload), parent=parent_frame)
+                    else:
+                        print("PPOI: Export cancelled")
+                    return
+            except queue.Empty:
+                pass
+            parent_frame.after(100, poll)
+        
+        parent_frame.after(100, poll)
     except Exception as ex:
         print(f"PPOI: Error exporting POIs: {ex}")
 
 def import_pois_from_file(parent_frame):
-    """Import POIs from a user-selected JSON file."""
+    """Import POIs from a user-selected JSON file on a worker thread."""
     from tkinter import filedialog, messagebox
-    global ALL_POIS
     try:
         file_path = filedialog.askopenfilename(
             parent=parent_frame,
@@ -150,44 +243,263 @@ def import_pois_from_file(parent_frame):
             defaultextension=".json",
             filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
         )
-        if file_path:
-            with open(file_path, "r", encoding="utf8") as f:
-                imported_pois = json.load(f)
-            
-            # Ask user if they want to replace or merge
-            if ALL_POIS:  # Only ask if there are existing POIs
-                result = messagebox.askyesnocancel(
-                    "Import POIs",
-                    "Replace existing POIs?\n\nYes = Replace all existing POIs\nNo = Add to existing POIs\nCancel = Cancel import",
-                    parent=parent_frame
-                )
-                if result is None:  # Cancel
+        if not file_path:
+            return
+        
+        # Ask user if they want to replace or merge, and how to treat duplicates
+        mode = dialogs.ask_import_mode(parent_frame, has_existing=bool(ALL_POIS))
+        if mode is None:  # Cancel
+            return
+        
+        job = poi_io.ImportJob(file_path)
+        progress = dialogs.show_progress_dialog(parent_frame, plugin_tl("Import POIs"), on_cancel=job.cancel)
+        job.start()
+        
+        def poll():
+            try:
+                while True:
+                    kind, payload, stats = job.messages.get_nowait()
+                    if kind == "progress":
+                        progress.set_progress(payload, plugin_tl("{count} POIs read").format(count=stats["pois"]))
+                        continue
+                    progress.destroy()
+                    if kind == "done":
+                        commit_imported_pois(parent_frame, payload, mode)
+                        print(f"PPOI: {stats['pois']} POIs imported from {file_path} ({stats['skipped']} skipped)")
+                    elif kind == "error":
+                        print(f"PPOI: Error importing POIs: {payload}")
+                        messagebox.showerror(plugin_tl("Import POIs"), str(payload), parent=parent_frame)
+                    else:
+                        print("PPOI: Import cancelled")
                     return
-                elif result:  # Yes - Replace
-                    ALL_POIS = imported_pois if isinstance(imported_pois, list) else []
-                else:  # No - Merge
-                    ALL_POIS.extend(imported_pois if isinstance(imported_pois, list) else [])
-            else:
-                # No existing POIs, just load the imported ones
-                ALL_POIS = imported_pois if isinstance(imported_pois, list) else []
-            
-            save_pois()
-            
-            # Rebuild UI to show imported POIs
-            for widget in parent_frame.winfo_children():
-                widget.destroy()
-            build_plugin_ui(parent_frame)
-            
-            print(f"PPOI: POIs imported from {file_path}")
+            except queue.Empty:
+                pass
+            parent_frame.after(100, poll)
+        
+        parent_frame.after(100, poll)
     except Exception as ex:
         print(f"PPOI: Error importing POIs: {ex}")
 
+def get_journal_dir():
+    """EDMC's journal folder setting, or its default"""
+    return config.get_str("journaldir") or getattr(config, "default_journal_dir", "") or ""
+
+def import_pois_from_journals(parent_frame):
+    """Scan old Journal files for landings, codex entries and bio scans on worker processes."""
+    from tkinter import messagebox
+    try:
+        choice = dialogs.ask_journal_ingest(parent_frame, get_journal_dir(), journal_ingest.DEFAULT_FOLDER_NAME)
+        if choice is None:  # Cancel
+            return
+        journal_dir, folder_name = choice
+        
+        job = journal_ingest.JournalIngestJob(journal_dir)
+        progress = dialogs.show_progress_dialog(parent_frame, plugin_tl("Import from journals"), on_cancel=job.cancel)
+        job.start()
+        
+        def poll():
+            try:
+                while True:
+                    kind, payload, stats = job.messages.get_nowait()
+                    if kind == "progress":
+                        progress.set_progress(payload, plugin_tl("{files} journal files read, {count} POIs found").format(files=stats["files"], count=stats["pois"]))
+                        continue
+                    progress.destroy()
+                    if kind == "done":
+                        added = commit_journal_pois(parent_frame, payload, folder_name)
+                        print(f"PPOI: {added} POIs imported from {stats['files']} journal files in {journal_dir}")
+                        if not added:
+                            messagebox.showinfo(plugin_tl("Import from journals"), plugin_tl("No new POIs found in the journals"), parent=parent_frame)
+                    elif kind == "error":
+                        print(f"PPOI: Error importing journals: {payload}")
+                        messagebox.showerror(plugin_tl("Import from journals"), str(payload), parent=parent_frame)
+                    else:
+                        print("PPOI: Journal import cancelled")
+                    return
+            except queue.Empty:
+                pass
+            parent_frame.after(100, poll)
+        
+        parent_frame.after(100, poll)
+    except Exception as ex:
+        print(f"PPOI: Error importing journals: {ex}")
+
+def get_duplicate_tolerance():
+    """Duplicate tolerance in degrees from settings, falling back to the default."""
+    try:
+        value = float(str(DUPLICATE_TOLERANCE_VAR.get()).replace(",", "."))
+        if value >= 0:
+            return value
+    except Exception:
+        pass
+    return poi_dedupe.DEFAULT_TOLERANCE_DEG
+
+def read_target_mode():
+    """Read guidance target mode from config, falling back to first active POI"""
+    mode = config.get_str(TARGET_MODE_KEY)
+    return mode if mode in TARGET_MODES else TARGET_MODE_FIRST
+
+def get_target_mode():
+    """Return the guidance target mode from the current settings snapshot"""
+    return settings.current().target_mode
+
+def get_target_mode_labels():
+    """Translated labels for the target mode option menu, keyed on mode"""
+    return {
+        TARGET_MODE_FIRST: plugin_tl("First active POI"),
+        TARGET_MODE_NEAREST: plugin_tl("Nearest POI"),
+        TARGET_MODE_ROUTE: plugin_tl("Planned route"),
+    }
+
+def store_target_mode():
+    """Save the mode selected in TARGET_MODE_VAR to config"""
+    selected = TARGET_MODE_VAR.get() if TARGET_MODE_VAR is not None else ""
+    for mode, label in get_target_mode_labels().items():
+        if label == selected:
+            config.set(TARGET_MODE_KEY, mode)
+            return
+
+def store_render_rates():
+    """Save overlay/GUI render rates to config"""
+    for var, key in ((OVERLAY_RATE_VAR, OVERLAY_RATE_KEY), (GUI_RATE_VAR, GUI_RATE_KEY)):
+        try:
+            rate = int(var.get())
+        except (tk.TclError, ValueError):
+            continue
+        if rate > 0:
+            config.set(key, rate)
+
+def build_settings():
+    """Read all hot-path settings from config into an immutable snapshot"""
+    return settings.Settings(
+        calc_with_altitude=bool(config.get_int(ALT_KEY)),
+        max_overlay_rows=config.get_int(ROWS_KEY),
+        overlay_left_margin=config.get_int(LEFT_KEY),
+        show_gui_info=bool(config.get_int(SHOW_GUI_INFO_KEY)),
+        heading_guidance=config.get_int(HEADING_GUIDANCE_KEY, default=1) == 1,
+        guidance_threshold=config.get_int(GUIDANCE_THRESHOLD_KEY, default=4),
+        guidance_distance=config.get_int(GUIDANCE_DISTANCE_KEY, default=2000),
+        target_mode=read_target_mode(),
+        auto_deactivate=config.get_int(AUTO_DEACTIVATE_KEY, default=0) == 1,
+        overlay_rate=config.get_int(OVERLAY_RATE_KEY, default=render_scheduler.DEFAULT_OVERLAY_RATE),
+        gui_rate=config.get_int(GUI_RATE_KEY, default=render_scheduler.DEFAULT_GUI_RATE)
+    )
+
+def on_settings_changed(old, new):
+    """Settings listener: push a new snapshot to the overlay, guidance and scheduler"""
+    overlay.set_overlay_settings(new.max_overlay_rows, new.overlay_left_margin)
+    if heading_guidance:
+        heading_guidance.on_course_threshold = new.guidance_threshold
+    RENDER_SCHEDULER.set_rate("overlay", new.overlay_rate)
+    RENDER_SCHEDULER.set_rate("gui", new.gui_rate)
+    if old.target_mode != new.target_mode:
+        NAV_ENGINE.targets.reset()
+    RENDER_GATE.reset()
+
+def get_body_slice(body=None):
+    """Prefetched (or freshly built) POI slice for a body, the current body by default"""
+    body = body or last_body
+    revision = get_poi_revision()
+    body_slice = BODY_PREFETCHER.get(ALL_POIS, revision, body)
+    # Hand the prefetched spatial index to target selection
+    NAV_ENGINE.targets.index_cache.put(body, revision, body_slice.index)
+    return body_slice
+
+def get_active_body_pois():
+    """All active POIs on the current body, in tree order"""
+    if not last_body:
+        return []
+    return get_body_slice().active
+
+def get_poi_revision():
+    """Value that changes whenever the POI tree is reloaded or edited"""
+    return (poi_manager.get_revision(), id(ALL_POIS))
+
+def current_position():
+    """Current position as a navigation.Position, or None without coordinates"""
+    if last_lat is None or last_lon is None or not last_body:
+        return None
+    return navigation.Position(last_body, last_lat, last_lon, last_altitude, last_planet_radius, last_heading)
+
+def render_position():
+    """
+    Position to render: the dead-reckoned estimate between Status.json updates.
+    Only for drawing - "Save current location" and the settings always use the real fix.
+    """
+    position = current_position()
+    if position is None or POSITION_PREDICTOR.body != position.body:
+        return position
+    predicted = POSITION_PREDICTOR.predict()
+    if predicted is None:
+        return position
+    return dataclasses.replace(position, lat=predicted[0], lon=predicted[1])
+
+def get_guidance_target():
+    """Return the POI guidance should point at on the current body, or None"""
+    # Without coordinates (e.g. in orbit) the tracker falls back to the first active POI
+    return NAV_ENGINE.select_target(current_position(), settings.current(), get_active_body_pois(), get_poi_revision())
+
+def commit_imported_pois(parent_frame, imported_pois, mode):
+    """Apply parsed import to the tree with a single save and a single UI rebuild."""
+    global ALL_POIS
+    if mode == "replace":
+        ALL_POIS = imported_pois
+    else:
+        # Duplicates can only be in the systems being imported
+        ensure_systems_loaded(imported_pois)
+        stats = poi_dedupe.merge_imported(ALL_POIS, imported_pois, mode, get_duplicate_tolerance())
+        if stats["duplicates"]:
+            print(f"PPOI: {stats['duplicates']} duplicate POIs found on import ({stats['updated']} updated)")
+        ALL_POIS.extend(imported_pois)
+    
+    # Merges may update existing POIs anywhere in the tree - recount once
+    poi_manager.notify_tree_replaced(ALL_POIS)
+    save_pois()
+    refresh_after_import(parent_frame)
+
+def commit_journal_pois(parent_frame, journal_pois, folder_name):
+    """
+    Add POIs found in journals to a top-level folder (created if missing),
+    skipping duplicates, with a single save and a single UI rebuild.
+    Returns the number of POIs added.
+    """
+    folder = next((item for item in ALL_POIS if item.get("type") == "folder" and item.get("name") == folder_name), None)
+    if folder is not None:
+        poi_manager.ensure_items_loaded([folder])
+    ensure_systems_loaded(journal_pois)
+    wrapper = [{"type": "folder", "name": folder_name, "children": journal_pois}]
+    poi_dedupe.merge_imported(ALL_POIS, wrapper, poi_dedupe.POLICY_SKIP, get_duplicate_tolerance())
+    new_pois = wrapper[0]["children"] if wrapper else []
+    if not new_pois:
+        return 0
+    
+    if folder is None:
+        ALL_POIS.append(wrapper[0])
+    else:
+        folder.setdefault("children", []).extend(new_pois)
+    
+    poi_manager.notify_tree_replaced(ALL_POIS)
+    save_pois()
+    refresh_after_import(parent_frame)
+    return len(new_pois)
+
+def refresh_after_import(parent_frame):
+    """Rebuild the settings tab and the main view after an import."""
+    # Rebuild UI to show imported POIs
+    try:
+        for widget in parent_frame.winfo_children():
+            widget.destroy()
+        build_plugin_ui(parent_frame)
+    except Exception as ex:
+        print(f"PPOI: Error rebuilding settings after import: {ex}")
+    redraw_plugin_app()
+
 def plugin_start3(plugin_dir: str) -> str:
     import time
     start_time = time.time()
     print(f"[PPOI TIMING] plugin_start3 started")
     
-    global ALT_VAR, ROWS_VAR, LEFT_VAR, SHOW_GUI_INFO_VAR, HEADING_GUIDANCE_VAR, GUIDANCE_THRESHOLD_VAR, GUIDANCE_DISTANCE_VAR, AUTO_UPDATE_VAR, AUTO_REMOVE_BACKUPS_VAR, ALL_POIS, CURRENT_SYSTEM, last_lat, last_lon, last_body, heading_guidance, RELEASE_FRAME
+    global ALT_VAR, ROWS_VAR, LEFT_VAR, SHOW_GUI_INFO_VAR, HEADING_GUIDANCE_VAR, GUIDANCE_THRESHOLD_VAR, GUIDANCE_DISTANCE_VAR, AUTO_UPDATE_VAR, AUTO_REMOVE_BACKUPS_VAR, DUPLICATE_TOLERANCE_VAR, TARGET_MODE_VAR, AUTO_DEACTIVATE_VAR, OVERLAY_RATE_VAR, GUI_RATE_VAR, SEARCH_VAR, PREFS_SEARCH_VAR, ALL_POIS, CURRENT_SYSTEM, last_lat, last_lon, last_body, heading_guidance, RELEASE_FRAME
     
     # Initialize release management
     Release.plugin_start(plugin_dir)
@@ -264,39 +576,70 @@ def plugin_start3(plugin_dir: str) -> str:
     else:
         auto_remove_backups_val = 1 if auto_remove_backups_str == "1" else 0
     AUTO_REMOVE_BACKUPS_VAR = tk.IntVar(value=auto_remove_backups_val)
+    
+    # Duplicate tolerance for imports - stored as string since it is fractional
+    duplicate_tolerance_str = config.get_str(DUPLICATE_TOLERANCE_KEY)
+    if not duplicate_tolerance_str:  # First run
+        duplicate_tolerance_str = str(poi_dedupe.DEFAULT_TOLERANCE_DEG)
+        config.set(DUPLICATE_TOLERANCE_KEY, duplicate_tolerance_str)
+    DUPLICATE_TOLERANCE_VAR = tk.StringVar(value=duplicate_tolerance_str)
+    
+    # Guidance target mode - default first active POI (previous behaviour)
+    target_mode = read_target_mode()
+    config.set(TARGET_MODE_KEY, target_mode)
+    TARGET_MODE_VAR = tk.StringVar(value=get_target_mode_labels()[target_mode])
+    
+    # Deactivate reached POIs - default disabled
+    AUTO_DEACTIVATE_VAR = tk.BooleanVar(value=config.get_int(AUTO_DEACTIVATE_KEY, default=0) == 1)
+    
+    # Render rates (updates per second) - overlay faster than the EDMC GUI by default
+    overlay_rate_val = config.get_int(OVERLAY_RATE_KEY, default=0)
+    if overlay_rate_val <= 0:  # First run - set default
+        overlay_rate_val = render_scheduler.DEFAULT_OVERLAY_RATE
+        config.set(OVERLAY_RATE_KEY, overlay_rate_val)
+    OVERLAY_RATE_VAR = tk.IntVar(value=overlay_rate_val)
+    gui_rate_val = config.get_int(GUI_RATE_KEY, default=0)
+    if gui_rate_val <= 0:  # First run - set default
+        gui_rate_val = render_scheduler.DEFAULT_GUI_RATE
+        config.set(GUI_RATE_KEY, gui_rate_val)
+    GUI_RATE_VAR = tk.IntVar(value=gui_rate_val)
+    # Search boxes keep their text when the main panel or prefs are rebuilt
+    SEARCH_VAR = tk.StringVar()
+    PREFS_SEARCH_VAR = tk.StringVar()
+    
+    # Snapshot read by the per-tick code instead of config
+    settings.publish(build_settings())
+    current_settings = settings.current()
+    RENDER_SCHEDULER.set_rate("overlay", current_settings.overlay_rate)
+    RENDER_SCHEDULER.set_rate("gui", current_settings.gui_rate)
     print(f"[PPOI TIMING] Config initialized: {time.time() - start_time:.3f}s")
    
     load_pois()  # This now calls the wrapper which updates ALL_POIS
     print(f"[PPOI TIMING] POIs loaded: {time.time() - start_time:.3f}s")
     
-    overlay.set_overlay_settings(ROWS_VAR.get(), LEFT_VAR.get())
+    overlay.set_overlay_settings(current_settings.max_overlay_rows, current_settings.overlay_left_margin)
     
     # Initialize heading guidance with settings from config
-    guidance_threshold = GUIDANCE_THRESHOLD_VAR.get()
+    guidance_threshold = current_settings.guidance_threshold
     heading_guidance = HeadingGuidance(center_x=600, center_y=150, on_course_threshold=guidance_threshold)
     
+    # Later settings changes are applied by the listener when prefs publish a new snapshot
+    settings.add_listener(on_settings_changed)
+    
     # Initialize modules with dependency injection
     _init_modules()
     print(f"[PPOI TIMING] Modules initialized: {time.time() - start_time:.3f}s")
     
-    # ============== SIMULATION - HARDCODED VALUES ==============
-    # Comment out these lines to disable simulation
-    #CURRENT_SYSTEM = "HIP 36601"
-    #last_body = "HIP 36601 C 1 a"
-    #last_lat = -67.5  # Same as POI "Crystalline shards Tellerium"
-    #last_lon = 127.2
-    print(f"PPOI SIMULATION: System={CURRENT_SYSTEM}, Body={last_body}, Lat={last_lat}, Lon={last_lon}")
-    
-    # Simulate dashboard entry to trigger overlay info calculation
-    simulated_entry = {
-        "Latitude": last_lat,
-        "Longitude": last_lon,
-        "BodyName": last_body,
-        "Altitude": 0,
-        "PlanetRadius": 2000000  # Default planet radius
-    }
-    dashboard_entry(None, False, simulated_entry)
-    # ============================================================
+    # Pick up system, body and position of a game that is already running,
+    # so the view and overlay are ready before the first journal or dashboard event
+    recovered_system, recovered_body, status = startup_recovery.recover(get_journal_dir())
+    if recovered_system:
+        CURRENT_SYSTEM = recovered_system
+        ensure_pois_loaded(recovered_system)
+        print(f"PPOI: Recovered System={CURRENT_SYSTEM}, Body={recovered_body}")
+    if recovered_body:
+        dashboard_entry(None, False, dict(status or {}, BodyName=recovered_body))
+    print(f"[PPOI TIMING] State recovered: {time.time() - start_time:.3f}s")
     
     print(f"[PPOI TIMING] plugin_start3 completed: {time.time() - start_time:.3f}s")
     return "PlanetPOI"
@@ -331,7 +674,15 @@ def _init_modules():
             'HEADING_GUIDANCE_VAR': globals()['HEADING_GUIDANCE_VAR'],
             'GUIDANCE_THRESHOLD_VAR': globals()['GUIDANCE_THRESHOLD_VAR'],
             'GUIDANCE_DISTANCE_VAR': globals()['GUIDANCE_DISTANCE_VAR'],
+            'DUPLICATE_TOLERANCE_VAR': globals()['DUPLICATE_TOLERANCE_VAR'],
+            'TARGET_MODE_VAR': globals()['TARGET_MODE_VAR'],
+            'AUTO_DEACTIVATE_VAR': globals()['AUTO_DEACTIVATE_VAR'],
+            'OVERLAY_RATE_VAR': globals()['OVERLAY_RATE_VAR'],
+            'GUI_RATE_VAR': globals()['GUI_RATE_VAR'],
+            'SEARCH_VAR': globals()['SEARCH_VAR'],
+            'PREFS_SEARCH_VAR': globals()['PREFS_SEARCH_VAR'],
             'config': config,
+            'SETTINGS': settings.current(),
             'theme': theme,
             'tk': tk,
             'nb': nb,
@@ -362,16 +713,28 @@ def _init_modules():
             'show_move_dialog': show_move_dialog,
             'show_share_popup': show_share_popup,
             'confirm_delete_item': confirm_delete_item,
+            'create_folder': create_folder,
             'delete_item': delete_item,
             'move_item': move_item,
+            'set_pois_active': set_pois_active,
+            'delete_pois': delete_pois,
+            'move_pois': move_pois,
             'count_folder_contents': count_folder_contents,
             'generate_share_url': generate_share_url,
+            'parse_share_url': parse_share_url,
+            'parse_share_url_pois': parse_share_url_pois,
             'remove_poi_obj': remove_poi_obj,
             'save_desc_obj': save_desc_obj,
             'export_pois_to_file': export_pois_to_file,
             'import_pois_from_file': import_pois_from_file,
+            'import_pois_from_journals': import_pois_from_journals,
             'scale_geometry': scale_geometry,
-            'format_body_name': format_body_name
+            'format_body_name': format_body_name,
+            'get_guidance_target': get_guidance_target,
+            'get_body_slice': get_body_slice,
+            'update_overlay_for_current_position': update_overlay_for_current_position,
+            'search_pois': search_pois,
+            'get_target_mode_labels': get_target_mode_labels
         }
     
     # Initialize modules with getters
@@ -418,53 +781,13 @@ def show_config_dialog(parent_frame):
         config.set(GUIDANCE_DISTANCE_KEY, GUIDANCE_DISTANCE_VAR.get())
         config.set(AUTO_UPDATE_KEY, str(1 if AUTO_UPDATE_VAR.get() else 0))
         config.set(AUTO_REMOVE_BACKUPS_KEY, str(1 if AUTO_REMOVE_BACKUPS_VAR.get() else 0))
-        overlay.set_overlay_settings(ROWS_VAR.get(), LEFT_VAR.get())
+        config.set(DUPLICATE_TOLERANCE_KEY, str(get_duplicate_tolerance()))
+        config.set(AUTO_DEACTIVATE_KEY, 1 if AUTO_DEACTIVATE_VAR.get() else 0)
+        store_target_mode()
+        store_render_rates()
+        settings.publish(build_settings())
         
-        # Regenerate overlay info text if we have position data
-        global OVERLAY_INFO_TEXT
-        if SHOW_GUI_INFO_VAR.get() and last_body and last_lat is not None and last_lon is not None:
-            visible_pois = [p for p in get_all_pois_flat(ALL_POIS) 
-                           if p.get("active", True) and get_full_body_name(p) == last_body]
-            
-            poi_texts = []
-            for p in visible_pois:
-                poi_lat = p.get("lat")
-                poi_lon = p.get("lon")
-                if poi_lat is None or poi_lon is None:
-                    continue
-                
-                poi_desc = p.get("description", "")
-                if not poi_desc:
-                    poi_desc = f"{poi_lat:.4f}, {poi_lon:.4f}"
-                
-                distance, bearing = calculate_bearing_and_distance(
-                    last_lat, last_lon, poi_lat, poi_lon,
-                    last_planet_radius,
-                    last_altitude, 0,
-                    calc_with_altitude=config.get_int(ALT_KEY)
-                )
-                
-                unit = "m"
-                show_dist = distance
-                if distance > 1_000:
-                    show_dist /= 1_000
-                    unit = "km"
-                if show_dist > 1_000:
-                    show_dist /= 1_000
-                    unit = "Mm"
-                
-                if unit == "m":
-                    poi_texts.append(f"{round(bearing)}°/ {round(show_dist)}{unit} {poi_desc}")
-                else:
-                    poi_texts.append(f"{round(bearing)}°/ {show_dist:.1f}{unit} {poi_desc}")
-            
-            # Limit to max rows setting
-            max_rows = ROWS_VAR.get()
-            if max_rows > 0 and len(poi_texts) > max_rows:
-                poi_texts = poi_texts[:max_rows]
-            OVERLAY_INFO_TEXT = "\n".join(poi_texts) if poi_texts else ""
-        elif not SHOW_GUI_INFO_VAR.get():
-            OVERLAY_INFO_TEXT = ""
+        refresh_overlay_info_text()
         
         dialog.destroy()
         redraw_plugin_app()
@@ -486,6 +809,11 @@ def show_add_poi_dialog(parent_frame, prefill_system=None, edit_poi=None, parent
 
 def redraw_plugin_app():
     global PLUGIN_FRAME, PLUGIN_PARENT
+    # Inside a POI transaction, rebuild once after the commit
+    if poi_manager.defer_until_commit(redraw_plugin_app):
+        return
+    # Rebuilt labels start from scratch, so the next dashboard update must fill them in
+    RENDER_GATE.reset("first_poi_label", "gui_guidance")
     if PLUGIN_FRAME:
         try:
             # Only destroy children of the persistent frame, not the frame itself
@@ -504,10 +832,21 @@ def redraw_plugin_app():
 def journal_entry(cmdr, is_beta, system, station, entry, state):
     global CURRENT_SYSTEM, last_body
     
+    # Read library shards with POIs in this system before anything looks for them
+    if entry.get('StarSystem') and ensure_pois_loaded(entry['StarSystem']):
+        redraw_plugin_app()
+    
+    # Prepare POI slices before arrival, so the first surface tick only calculates distances
+    if entry['event'] in ['ApproachBody', 'SupercruiseExit'] and entry.get('Body'):
+        BODY_PREFETCHER.prefetch(ALL_POIS, get_poi_revision(), bodies=[entry['Body']])
+    elif entry['event'] == 'FSDJump' and entry.get('StarSystem'):
+        BODY_PREFETCHER.prefetch(ALL_POIS, get_poi_revision(), system=entry['StarSystem'])
+    
     # Clear overlay when jumping to a new system or entering supercruise
     if entry['event'] in ['FSDJump', 'SupercruiseEntry']:
         last_body = None
         overlay.clear_all_poi_rows()
+        RENDER_GATE.reset()
     
     if (entry['event'] in ['FSDJump','StartUp'] and entry.get('StarSystem')):
         print(f"PPOI: Arriving at {entry['StarSystem']}")
@@ -543,41 +882,43 @@ def get_all_pois_flat(items):
     return pois
 
 def create_folder(parent_children, folder_name):
-    """Create new folder."""
-    new_folder = {
-        "type": "folder",
-        "name": folder_name,
-        "children": []
-    }
-    parent_children.append(new_folder)
-    save_pois()
-    return new_folder
+    """Wrapper for poi_manager.create_folder()"""
+    return poi_manager.create_folder(ALL_POIS, parent_children, folder_name)
 
 def delete_item(items, target_item):
-    """Delete item (POI or folder) from tree."""
-    def remove_from(children):
-        for idx, item in enumerate(children):
-            if item is target_item:
-                children.pop(idx)
-                return True
-            if item.get("type") == "folder":
-                if remove_from(item.get("children", [])):
-                    return True
-        return False
-    if remove_from(items):
-        save_pois()
-        return True
-    return False
+    """Wrapper for poi_manager.delete_item()"""
+    return poi_manager.delete_item(ALL_POIS, items, target_item)
 
 def move_item(items, target_item, new_parent_children):
-    """Move item to new parent folder."""
-    # First remove from current location
-    if delete_item(items, target_item):
-        # Then add to new location
-        new_parent_children.append(target_item)
-        save_pois()
-        return True
-    return False
+    """Wrapper for poi_manager.move_item()"""
+    return poi_manager.move_item(ALL_POIS, items, target_item, new_parent_children)
+
+def set_pois_active(pois, active):
+    """Wrapper for poi_manager.set_pois_active()"""
+    return poi_manager.set_pois_active(ALL_POIS, pois, active)
+
+def delete_pois(targets):
+    """Wrapper for poi_manager.delete_items()"""
+    return poi_manager.delete_items(ALL_POIS, ALL_POIS, targets)
+
+def move_pois(targets, new_parent_children):
+    """Wrapper for poi_manager.move_items()"""
+    return poi_manager.move_items(ALL_POIS, ALL_POIS, targets, new_parent_children)
+
+def set_folder_pois_active(folder, active):
+    """Activate or deactivate every POI in a folder with one save and one redraw."""
+    poi_manager.ensure_items_loaded([folder])
+    with poi_manager.transaction():
+        if set_pois_active(get_all_pois_flat(folder.get("children", [])), active):
+            redraw_plugin_app()
+            update_overlay_for_current_position()
+
+def toggle_folder_active(folder):
+    """Switch a folder on or off. The POIs in it keep their own flags."""
+    with poi_manager.transaction():
+        if poi_manager.set_folder_active(ALL_POIS, folder, not folder.get("active", True)):
+            redraw_plugin_app()
+            update_overlay_for_current_position()
 
 def copy_poi_systemname(poi):
     """Copy POI system name to clipboard."""
@@ -668,10 +1009,36 @@ def show_item_actions_popup(item, item_type, frame, body_name):
     finally:
         popup.grab_release()
 
-def show_menu_dropdown(frame, button, body_name):
-    """Show dropdown menu when hamburger icon is clicked."""
-    # Create menu widget that follows EDMC theme
-    menu = tk.Menu(button, tearoff=0)
+# Cached dropdown menu, reused until the POI tree changes
+MENU_CACHE = {"menu": None, "key": None}
+
+def invalidate_menu_cache():
+    """Drop the cached dropdown menu so it is rebuilt on next open."""
+    menu = MENU_CACHE.get("menu")
+    MENU_CACHE["menu"] = None
+    MENU_CACHE["key"] = None
+    if menu is not None:
+        try:
+            menu.destroy()
+        except Exception:
+            pass
+
+def populate_on_post(menu, build):
+    """Fill a submenu the first time Tk is about to post it."""
+    def on_post():
+        if getattr(menu, "_ppoi_built", False):
+            return
+        menu._ppoi_built = True
+        build(menu)
+        try:
+            theme.update(menu)
+        except Exception:
+            pass
+    menu.configure(postcommand=on_post)
+
+def build_menu_dropdown(frame, body_name):
+    """Build the dropdown menu skeleton. Folder and POI submenus are filled lazily."""
+    menu = tk.Menu(frame, tearoff=0)
     
     # Add top menu items
     menu.add_command(label=plugin_tl("Add new POI"), command=lambda: show_add_poi_dialog(frame, body_name))
@@ -679,9 +1046,92 @@ def show_menu_dropdown(frame, button, body_name):
     menu.add_command(label=plugin_tl("Settings"), command=lambda: show_config_dialog(frame))
     menu.add_separator()
     
-    # Build hierarchical menu structure
+    def build_folder_actions(actions_submenu, item):
+        actions_submenu.add_command(
+            label=plugin_tl("Deactivate folder") if item.get("active", True) else plugin_tl("Activate folder"),
+            command=lambda: toggle_folder_active(item)
+        )
+        actions_submenu.add_separator()
+        actions_submenu.add_command(
+            label=plugin_tl("Add new POI"),
+            command=lambda: show_add_poi_dialog(frame, body_name, parent_children=item.get("children", []))
+        )
+        actions_submenu.add_command(
+            label=plugin_tl("Add folder"),
+            command=lambda: show_add_folder_dialog(frame, item.get("children", []))
+        )
+        actions_submenu.add_command(
+            label=plugin_tl("Share folder"),
+            command=lambda: show_share_popup(frame, item)
+        )
+        actions_submenu.add_command(
+            label=plugin_tl("Export folder"),
+            command=lambda: export_pois_to_file(frame, folder=item)
+        )
+        actions_submenu.add_command(
+            label=plugin_tl("Activate all"),
+            command=lambda: set_folder_pois_active(item, True)
+        )
+        actions_submenu.add_command(
+            label=plugin_tl("Deactivate all"),
+            command=lambda: set_folder_pois_active(item, False)
+        )
+        actions_submenu.add_command(
+            label=plugin_tl("Move folder"),
+            command=lambda: show_move_dialog(frame, item, "folder")
+        )
+        actions_submenu.add_command(
+            label=plugin_tl("Delete folder"),
+            command=lambda: confirm_delete_item(frame, item, "folder")
+        )
+    
+    def build_folder_menu(folder_submenu, item, indent):
+        poi_manager.ensure_items_loaded([item])  # Read a top-level folder's shard on first open
+        # Actions submenu at top, filled when opened
+        actions_submenu = tk.Menu(folder_submenu, tearoff=0)
+        populate_on_post(actions_submenu, lambda m: build_folder_actions(m, item))
+        folder_submenu.add_cascade(label=f"⚡ {plugin_tl('Actions')}", menu=actions_submenu)
+        folder_submenu.add_separator()
+        
+        children = item.get("children", [])
+        if children:
+            add_items_to_menu(folder_submenu, children, indent + 1)
+        else:
+            folder_submenu.add_command(label=plugin_tl("(Empty)"), state='disabled')
+    
+    def build_poi_menu(poi_submenu, item):
+        # Add Activate/Deactivate option
+        is_active = item.get("active", True)
+        toggle_label = plugin_tl("Deactivate") if is_active else plugin_tl("Activate")
+        poi_submenu.add_command(
+            label=toggle_label,
+            command=lambda: toggle_poi_active(item, frame)
+        )
+        poi_submenu.add_separator()
+        
+        poi_submenu.add_command(
+            label=plugin_tl("Copy systemname"),
+            command=lambda: copy_poi_systemname(item)
+        )
+        poi_submenu.add_command(
+            label=plugin_tl("Share link"),
+            command=lambda: show_share_popup(frame, item)
+        )
+        poi_submenu.add_command(
+            label=plugin_tl("Edit"),
+            command=lambda: edit_poi_in_menu(frame, item)
+        )
+        poi_submenu.add_command(
+            label=plugin_tl("Move POI"),
+            command=lambda: show_move_dialog(frame, item, "poi")
+        )
+        poi_submenu.add_command(
+            label=plugin_tl("Delete POI"),
+            command=lambda: confirm_delete_item(frame, item, "poi")
+        )
+    
     def add_items_to_menu(parent_menu, items, indent=0):
-        """Recursively add folders and POIs to menu."""
+        """Add one level of folders and POIs. Submenus are only built when opened."""
         # Sort items alphabetically by folder name or POI description
         sorted_items = sorted(items, key=lambda x: x.get("name", "").lower() if x.get("type") == "folder" else x.get("description", "").lower())
         for item in sorted_items:
@@ -690,55 +1140,25 @@ def show_menu_dropdown(frame, button, body_name):
             if item_type == "folder":
                 folder_name = item.get("name", "Unnamed Folder")
                 folder_submenu = tk.Menu(parent_menu, tearoff=0)
+                populate_on_post(folder_submenu, lambda m, i=item, d=indent: build_folder_menu(m, i, d))
                 
-                # Create actions submenu for folder
-                actions_submenu = tk.Menu(folder_submenu, tearoff=0)
-                actions_submenu.add_command(
-                    label=plugin_tl("Add new POI"),
-                    command=lambda i=item: show_add_poi_dialog(frame, body_name, parent_children=i.get("children", []))
-                )
-                actions_submenu.add_command(
-                    label=plugin_tl("Add folder"),
-                    command=lambda i=item: show_add_folder_dialog(frame, i.get("children", []))
-                )
-                actions_submenu.add_command(
-                    label=plugin_tl("Move folder"),
-                    command=lambda i=item: show_move_dialog(frame, i, "folder")
-                )
-                actions_submenu.add_command(
-                    label=plugin_tl("Delete folder"),
-                    command=lambda i=item: confirm_delete_item(frame, i, "folder")
-                )
-                
-                # Add actions submenu at top
-                folder_submenu.add_cascade(label=f"⚡ {plugin_tl('Actions')}", menu=actions_submenu)
-                folder_submenu.add_separator()
-                
-                # Add children recursively
-                children = item.get("children", [])
-                if children:
-                    add_items_to_menu(folder_submenu, children, indent + 1)
-                else:
-                    folder_submenu.add_command(label=plugin_tl("(Empty)"), state='disabled')
-                
-                # Add folder to parent menu
                 prefix = "  " * indent + "📁 "
-                parent_menu.add_cascade(label=f"{prefix}{folder_name}", menu=folder_submenu)
-                
-                try:
-                    theme.update(folder_submenu)
-                    theme.update(actions_submenu)
-                except Exception:
-                    pass
+                # Active / total POIs below the folder, from the maintained folder stats
+                stats = poi_manager.get_folder_stats(item)
+                counts = f" ({stats.active}/{stats.pois})" if stats is not None and stats.pois else ""
+                cascade_kwargs = {
+                    "label": f"{prefix}{folder_name}{counts}",
+                    "menu": folder_submenu
+                }
+                if not poi_manager.is_poi_active(item):
+                    cascade_kwargs["foreground"] = "gray"
+                parent_menu.add_cascade(**cascade_kwargs)
                     
             elif item_type == "poi":
                 desc = item.get("description", "").strip()
                 if not desc:
                     continue  # Skip POIs without description
                 
-                # Check if POI is active
-                is_active = item.get("active", True)
-                
                 # Use different icons for system POIs (no lat/lon) vs planet POIs (with lat/lon)
                 lat = item.get("lat")
                 lon = item.get("lon")
@@ -748,54 +1168,20 @@ def show_menu_dropdown(frame, button, body_name):
                 prefix = "  " * indent + poi_icon + " "
                 menu_label = desc if len(desc) <= 30 else desc[:27] + "..."
                 
-                # Create submenu for POI with actions directly
                 poi_submenu = tk.Menu(parent_menu, tearoff=0)
+                populate_on_post(poi_submenu, lambda m, p=item: build_poi_menu(m, p))
                 
-                # Add Activate/Deactivate option
-                toggle_label = plugin_tl("Deactivate") if is_active else plugin_tl("Activate")
-                poi_submenu.add_command(
-                    label=toggle_label,
-                    command=lambda p=item: toggle_poi_active(p, frame)
-                )
-                poi_submenu.add_separator()
-                
-                poi_submenu.add_command(
-                    label=plugin_tl("Copy systemname"),
-                    command=lambda p=item: copy_poi_systemname(p)
-                )
-                poi_submenu.add_command(
-                    label=plugin_tl("Share link"),
-                    command=lambda p=item: show_share_popup(frame, p)
-                )
-                poi_submenu.add_command(
-                    label=plugin_tl("Edit"),
-                    command=lambda p=item: edit_poi_in_menu(frame, p)
-                )
-                poi_submenu.add_command(
-                    label=plugin_tl("Move POI"),
-                    command=lambda p=item: show_move_dialog(frame, p, "poi")
-                )
-                poi_submenu.add_command(
-                    label=plugin_tl("Delete POI"),
-                    command=lambda p=item: confirm_delete_item(frame, p, "poi")
-                )
-                
-                # Add POI with submenu - use gray color if inactive
+                # Add POI with submenu - use gray color if inactive, itself or through a folder
                 cascade_kwargs = {
                     "label": f"{prefix}{menu_label}",
                     "menu": poi_submenu
                 }
-                if not is_active:
+                if not poi_manager.is_poi_active(item):
                     cascade_kwargs["foreground"] = "gray"
                 
                 parent_menu.add_cascade(**cascade_kwargs)
-                
-                try:
-                    theme.update(poi_submenu)
-                except Exception:
-                    pass
     
-    # Add all items from root level
+    # Only the root level is built up front
     add_items_to_menu(menu, ALL_POIS)
     
     # Apply theme to menu
@@ -804,6 +1190,23 @@ def show_menu_dropdown(frame, button, body_name):
     except Exception:
         pass
     
+    return menu
+
+def show_menu_dropdown(frame, button, body_name):
+    """Show dropdown menu when hamburger icon is clicked."""
+    # Top-level folders are read when their submenu is first opened
+    key = (poi_manager.get_revision(), id(ALL_POIS), body_name, str(frame))
+    menu = MENU_CACHE.get("menu")
+    try:
+        menu_alive = menu is not None and bool(menu.winfo_exists())
+    except Exception:
+        menu_alive = False
+    if not menu_alive or MENU_CACHE.get("key") != key:
+        invalidate_menu_cache()
+        menu = build_menu_dropdown(frame, body_name)
+        MENU_CACHE["menu"] = menu
+        MENU_CACHE["key"] = key
+    
     # Show menu at button position
     try:
         x = button.winfo_rootx()
@@ -811,9 +1214,6 @@ def show_menu_dropdown(frame, button, body_name):
         menu.post(x, y)
     except Exception as ex:
         print(f"Error showing menu: {ex}")
-        menu.post(x, y)
-    except Exception as ex:
-        print(f"Error showing menu: {ex}")
 
 def show_poi_context_menu_main(event, poi, frame):
     """Show context menu for POI in main plugin window."""
@@ -880,51 +1280,10 @@ def show_poi_context_menu_main(event, poi, frame):
 def toggle_poi_active(poi, frame):
     """Toggle POI active status and update overlay info text."""
     poi["active"] = not poi.get("active", True)
+    poi_manager.notify_poi_changed(poi)
     save_pois()
     
-    # Update OVERLAY_INFO_TEXT for GUI display (without sending to actual overlay)
-    global OVERLAY_INFO_TEXT
-    if last_body and last_lat is not None and last_lon is not None:
-        visible_pois = [p for p in get_all_pois_flat(ALL_POIS) 
-                       if p.get("active", True) and get_full_body_name(p) == last_body]
-        
-        poi_texts = []
-        for p in visible_pois:
-            poi_lat = p.get("lat")
-            poi_lon = p.get("lon")
-            if poi_lat is None or poi_lon is None:
-                continue
-            
-            poi_desc = p.get("description", "")
-            if not poi_desc:
-                poi_desc = f"{poi_lat:.4f}, {poi_lon:.4f}"
-            
-            distance, bearing = calculate_bearing_and_distance(
-                last_lat, last_lon, poi_lat, poi_lon,
-                last_planet_radius,
-                last_altitude, 0,
-                calc_with_altitude=config.get_int(ALT_KEY)
-            )
-            
-            unit = "m"
-            show_dist = distance
-            if distance > 1_000:
-                show_dist /= 1_000
-                unit = "km"
-            if show_dist > 1_000:
-                show_dist /= 1_000
-                unit = "Mm"
-            
-            if unit == "m":
-                poi_texts.append(f"{round(bearing)}°/ {round(show_dist)}{unit} {poi_desc}")
-            else:
-                poi_texts.append(f"{round(bearing)}°/ {show_dist:.1f}{unit} {poi_desc}")
-        
-        # Limit to max rows setting
-        max_rows = config.get_int(ROWS_KEY)
-        if max_rows > 0 and len(poi_texts) > max_rows:
-            poi_texts = poi_texts[:max_rows]
-        OVERLAY_INFO_TEXT = "\n".join(poi_texts) if poi_texts else ""
+    refresh_overlay_info_text()
     
     # Update GUI immediately
     redraw_plugin_app()
@@ -945,12 +1304,13 @@ def export_pois():
         with open(export_file, "w", encoding="utf8") as f:
             f.write("Elite Dangerous POI Export\n")
             f.write("=" * 50 + "\n\n")
-            for poi in get_all_pois_flat(ALL_POIS):
+            for poi, path in poi_io.iter_pois_with_path(ALL_POIS):
                 f.write(f"Body: {poi.get('body', 'Unknown')}\n")
                 f.write(f"Latitude: {poi.get('lat', 0):.6f}\n")
                 f.write(f"Longitude: {poi.get('lon', 0):.6f}\n")
                 f.write(f"Description: {poi.get('description', '')}\n")
                 f.write(f"Active: {poi.get('active', True)}\n")
+                f.write(f"Folder: {poi_io.FOLDER_PATH_SEPARATOR.join(path)}\n")
                 f.write("-" * 50 + "\n")
         print(f"POIs exported to {export_file}")
         # Show success message
@@ -996,27 +1356,16 @@ def get_item_location_path(items, target_item, path=""):
 
 def show_move_dialog(frame, item, item_type, is_prefs=False):
     """Wrapper for dialogs.show_move_dialog"""
+    ensure_pois_loaded()
     return dialogs.show_move_dialog(frame, item, item_type, is_prefs)
 
 def count_folder_contents(folder):
-    """Count total subfolders and POIs in a folder recursively."""
-    subfolder_count = 0
-    poi_count = 0
-    
-    def count_recursive(children):
-        nonlocal subfolder_count, poi_count
-        for item in children:
-            if item.get("type") == "folder":
-                subfolder_count += 1
-                count_recursive(item.get("children", []))
-            elif item.get("type") == "poi":
-                poi_count += 1
-    
-    count_recursive(folder.get("children", []))
-    return subfolder_count, poi_count
+    """Wrapper for poi_manager.count_folder_contents()"""
+    return poi_manager.count_folder_contents(folder)
 
 def confirm_delete_item(frame, item, item_type):
     """Wrapper for dialogs.confirm_delete_item"""
+    poi_manager.ensure_items_loaded([item])  # The confirmation counts what the delete removes
     return dialogs.confirm_delete_item(frame, item, item_type)
 
 # Delegate to gui_builder module
@@ -1041,6 +1390,7 @@ def plugin_app(parent, cmdr=None, is_beta=None):
     """Create the persistent plugin frame and return it."""
     global PLUGIN_PARENT, PLUGIN_FRAME
     PLUGIN_PARENT = parent
+    theme_colors.invalidate()
     
     # Create persistent frame - use tk.Frame, let theme handle background
     PLUGIN_FRAME = tk.Frame(parent, highlightthickness=1)
@@ -1098,6 +1448,7 @@ def safe_int(val, fallback):
 # Delegate to gui_builder module
 def build_plugin_ui(frame):
     """Wrapper for gui_builder.build_plugin_ui"""
+    ensure_pois_loaded()  # The settings table lists every POI
     return gui_builder.build_plugin_ui(frame)
 
 # Duplicate split_system_and_body removed - now imported from poi_manager module
@@ -1105,74 +1456,33 @@ def build_plugin_ui(frame):
 def parse_share_url(url):
     """
     Parse a share URL and extract POI data
-    Returns dict with POI data or None if invalid
+    Returns dict with POI data or None if invalid. For multi-POI (v2) links
+    the first POI is returned, use parse_share_url_pois() to get all of them.
+    """
+    result = parse_share_url_pois(url)
+    if not result or not result[1]:
+        return None
+    return result[1][0]
+
+def parse_share_url_pois(url):
+    """
+    Parse a v1 or v2 share URL
+    Returns (name, list of POI dicts) or None if invalid
     """
     try:
-        # Extract hash part after #
-        if '#' not in url:
-            return None
-        
-        base64_str = url.split('#', 1)[1].strip()
-        if not base64_str:
-            return None
-        
-        # Add padding if needed
-        while len(base64_str) % 4 != 0:
-            base64_str += '='
-        
-        # Decode base64url to JSON
-        base64_bytes = base64_str.replace('-', '+').replace('_', '/').encode('utf-8')
-        json_bytes = base64.urlsafe_b64decode(base64_bytes)
-        json_str = json_bytes.decode('utf-8')
-        poi_data = json.loads(json_str)
-        
-        # Validate required fields
-        if poi_data.get('v') != 1:
-            return None
-        
-        # Support both old format (body) and new format (system + body)
-        if 'system' in poi_data:
-            # New format
-            if 'lat' not in poi_data or 'lon' not in poi_data:
-                return None
-        elif 'body' in poi_data:
-            # Old format - migrate to new format
-            full_body = poi_data.get('body', '')
-            system_name, body_part = split_system_and_body(full_body)
-            poi_data['system'] = system_name
-            poi_data['body'] = body_part
-        else:
-            return None
-            return None
-        
-        return poi_data
+        return share_codec.parse_share_url_pois(url)
     except Exception as e:
         print(f"PPOI: Failed to parse share URL: {e}")
         return None
 
-def generate_share_url(poi):
+def generate_share_url(item):
     """
-    Generate a shareable URL for a POI based on the format used in share/index.html
-    URL format: https://bbbkada.github.io/EDMC-PlanetPOI/share/#<base64url_encoded_json>
+    Generate a shareable URL for a POI or a whole folder, decoded by share/index.html
+    POI URL format: https://bbbkada.github.io/EDMC-PlanetPOI/share/#<base64url_encoded_json>
+    Folder URL format: https://bbbkada.github.io/EDMC-PlanetPOI/share/#2.<base64url_zlib_binary>
     """
-    # Create POI object matching the format expected by index.html
-    poi_data = {
-        "v": 1,
-        "system": poi.get("system", ""),
-        "body": poi.get("body", ""),
-        "lat": poi.get("lat", 0),
-        "lon": poi.get("lon", 0),
-        "description": poi.get("description", ""),
-        "active": poi.get("active", True)
-    }
-    
-    # Convert to JSON and encode to base64url
-    json_str = json.dumps(poi_data, separators=(',', ':'))
-    json_bytes = json_str.encode('utf-8')
-    base64_bytes = base64.urlsafe_b64encode(json_bytes)
-    base64_str = base64_bytes.decode('utf-8').rstrip('=')
-    
-    return f"https://bbbkada.github.io/EDMC-PlanetPOI/share/#{base64_str}"
+    poi_manager.ensure_items_loaded([item])
+    return share_codec.build_share_url(item)
 
 # Delegate to dialogs module
 def show_share_popup(parent, poi):
@@ -1240,6 +1550,8 @@ def show_poi_context_menu(event, poi, frame, active_var=None):
         menu.grab_release()
 
 def redraw_prefs(frame):
+    if poi_manager.defer_until_commit(redraw_prefs, frame):
+        return
     for widget in frame.winfo_children():
         widget.destroy()
     build_plugin_ui(frame)
@@ -1260,6 +1572,7 @@ def remove_poi_obj(poi, frame):
 def save_desc_obj(poi, desc_var, frame, savebtn):
     """Save description by POI object reference."""
     poi["description"] = desc_var.get()
+    poi_manager.notify_poi_changed(poi)
     save_pois()
     savebtn.config(state='disabled')
     try:
@@ -1278,7 +1591,7 @@ def add_manual_poi(body_entry, lat_entry, lon_entry, desc_entry, frame):
     desc = desc_entry.get().strip()
     # Split body into system and body parts
     system_name, body_part = split_system_and_body(body)
-    ALL_POIS.append({
+    new_poi = {
         "type": "poi",
         "system": system_name,
         "body": body_part,
@@ -1287,7 +1600,9 @@ def add_manual_poi(body_entry, lat_entry, lon_entry, desc_entry, frame):
         "description": desc,
         "notes": "",
         "active": True
-    })
+    }
+    ALL_POIS.append(new_poi)
+    poi_manager.notify_item_added(new_poi, ALL_POIS)
     save_pois()
     redraw_prefs(frame)
 
@@ -1295,7 +1610,7 @@ def save_current_poi(frame):
     if last_lat is not None and last_lon is not None and last_body:
         # Split last_body into system and body parts
         system_part, body_part = split_system_and_body(last_body)
-        ALL_POIS.append({
+        new_poi = {
             "type": "poi",
             "system": system_part,
             "body": body_part,
@@ -1304,7 +1619,9 @@ def save_current_poi(frame):
             "description": "",
             "notes": "",
             "active": True
-        })
+        }
+        ALL_POIS.append(new_poi)
+        poi_manager.notify_item_added(new_poi, ALL_POIS)
         save_pois()
         redraw_prefs(frame)
     else:
@@ -1314,12 +1631,13 @@ def save_current_poi(frame):
             pass
 
 def prefs_changed(cmdr, is_beta):
-    global ALT_VAR, ROWS_VAR, LEFT_VAR, SHOW_GUI_INFO_VAR, HEADING_GUIDANCE_VAR, GUIDANCE_THRESHOLD_VAR, GUIDANCE_DISTANCE_VAR, AUTO_UPDATE_VAR, AUTO_REMOVE_BACKUPS_VAR, heading_guidance, POI_REFS, RELEASE_FRAME
+    global ALT_VAR, ROWS_VAR, LEFT_VAR, SHOW_GUI_INFO_VAR, HEADING_GUIDANCE_VAR, GUIDANCE_THRESHOLD_VAR, GUIDANCE_DISTANCE_VAR, AUTO_UPDATE_VAR, AUTO_REMOVE_BACKUPS_VAR, DUPLICATE_TOLERANCE_VAR, TARGET_MODE_VAR, AUTO_DEACTIVATE_VAR, OVERLAY_RATE_VAR, GUI_RATE_VAR, heading_guidance, POI_REFS, RELEASE_FRAME
     
     # Update active status for all POIs using POI_REFS (matches order of POI_VARS)
     for i, var in enumerate(POI_VARS):
         if i < len(POI_REFS):
             POI_REFS[i]["active"] = var.get()
+            poi_manager.notify_poi_changed(POI_REFS[i])
     config.set(ALT_KEY, 1 if ALT_VAR.get() else 0)
     config.set(ROWS_KEY, ROWS_VAR.get())
     config.set(LEFT_KEY, LEFT_VAR.get())
@@ -1329,122 +1647,110 @@ def prefs_changed(cmdr, is_beta):
     config.set(GUIDANCE_DISTANCE_KEY, GUIDANCE_DISTANCE_VAR.get())
     config.set(AUTO_UPDATE_KEY, str(1 if AUTO_UPDATE_VAR.get() else 0))
     config.set(AUTO_REMOVE_BACKUPS_KEY, str(1 if AUTO_REMOVE_BACKUPS_VAR.get() else 0))
+    config.set(DUPLICATE_TOLERANCE_KEY, str(get_duplicate_tolerance()))
+    config.set(AUTO_DEACTIVATE_KEY, 1 if AUTO_DEACTIVATE_VAR.get() else 0)
+    store_target_mode()
+    store_render_rates()
     
-    overlay.set_overlay_settings(ROWS_VAR.get(), LEFT_VAR.get())
+    # Swap in the new settings snapshot - listeners update overlay, guidance and scheduler
+    settings.publish(build_settings())
     
-    # Update heading guidance threshold if it exists
-    if heading_guidance:
-        heading_guidance.on_course_threshold = GUIDANCE_THRESHOLD_VAR.get()
+    # EDMC theme may have changed in the same settings dialog
+    theme_colors.invalidate()
     
     save_pois()
     redraw_plugin_app()
 
 def update_overlay_for_current_position():
     """Update overlay based on current position. Called after adding/editing POI or from dashboard updates."""
-    global OVERLAY_INFO_TEXT, OVERLAY_INFO_LABEL, within_2km_zone, gui_guidance_visible
+    global OVERLAY_INFO_TEXT
+    
+    if poi_manager.defer_until_commit(update_overlay_for_current_position):
+        return
     
     # If we don't have valid position data, clear overlay
-    if last_lat is None or last_lon is None or not last_body:
-        overlay.clear_all_poi_rows()
-        if heading_guidance:
-            heading_guidance.clear()
+    position = render_position()
+    if position is None:
+        NAV_ENGINE.target = None
+        if RENDER_GATE.changed("overlay", None):
+            with overlay.batch():
+                overlay.clear_all_poi_rows()
+                if heading_guidance:
+                    heading_guidance.clear()
         OVERLAY_INFO_TEXT = ""
         return
     
-    # Get all active POIs for current body
-    visible_pois = [poi for poi in get_all_pois_flat(ALL_POIS) if poi.get("active", True) and get_full_body_name(poi) == last_body]
-    
-    # Check if heading guidance is enabled
-    guidance_enabled = config.get_int(HEADING_GUIDANCE_KEY, default=1) == 1
+    # Nothing moved and no POI changed (e.g. a flag-only Status.json write) - skip until keepalive is due
+    input_signature = (position, get_poi_revision())
+    if not RENDER_GATE.changed("input", input_signature, keepalive=True):
+        return
     
-    poi_texts = []
-    closest_bearing = None
-    closest_distance = None
-    target_poi_index = 0  # Index of the POI being guided to
+    # One snapshot for the whole render, so settings can't change halfway
+    frame = NAV_ENGINE.compute_overlay(position, settings.current(), get_active_body_pois(), get_poi_revision())
     
-    for idx, poi in enumerate(visible_pois):
-        poi_lat = poi.get("lat")
-        poi_lon = poi.get("lon")
-        poi_desc = poi.get("description", "")
-        
-        distance, bearing = calculate_bearing_and_distance(
-            last_lat, last_lon,
-            poi_lat, poi_lon,
-            last_planet_radius,
-            last_altitude, 0,  # alt1 = current, alt2 = 0
-            calc_with_altitude=config.get_int(ALT_KEY)
-        )
-        
-        # Track closest POI for heading guidance (first POI only when guidance enabled)
-        if idx == 0:
-            closest_distance = distance
-            closest_bearing = bearing
-            target_poi_index = 0
-        
-        if not poi_desc:
-            if poi_lat is not None and poi_lon is not None:
-                poi_desc = f"{poi_lat:.4f}, {poi_lon:.4f}"
-            else:
-                poi_desc = "(No description)"
-        
-        unit = "m"
-        show_dist = distance
-        if distance > 1_000:
-            show_dist /= 1_000
-            unit = "km"
-        if show_dist > 1_000:
-            show_dist /= 1_000
-            unit = "Mm"
-        
-        if unit == "m":
-            poi_texts.append((f"{round(bearing)}°/ {round(show_dist)}{unit} {poi_desc}", idx == 0 and guidance_enabled))
-        else:
-            poi_texts.append((f"{round(bearing)}°/ {show_dist:.1f}{unit} {poi_desc}", idx == 0 and guidance_enabled))
-    
-    if poi_texts:
-        # Show POI rows with different colors - first POI orange (target), rest gray if guidance enabled
-        overlay.show_poi_rows_with_colors(poi_texts)
-        
-        # Show graphical heading guidance if enabled and we have heading and a target bearing
-        if guidance_enabled and heading_guidance and last_heading is not None and closest_bearing is not None:
+    if frame.rows:
+        # Decide what heading guidance should show: ("checkmark",), ("clear",) or ("arrow", display_key)
+        guidance_action = ("clear",)
+        if heading_guidance and frame.guidance != navigation.GUIDANCE_CLEAR:
             # Adjust Y-position based on number of POI rows
-            arrow_y = overlay.ROW_Y_START + (len(poi_texts) * overlay.ROW_Y_STEP) + 30
-            heading_guidance.center_y = arrow_y
+            heading_guidance.center_y = overlay.ROW_Y_START + (len(frame.rows) * overlay.ROW_Y_STEP) + 30
             heading_guidance.center_x = overlay.OVERLAY_LEFT_MARGIN + 150  # Center relative to POI texts
-            
-            # Get guidance distance from config
-            guidance_distance = config.get_int(GUIDANCE_DISTANCE_KEY, default=2000)
-            
-            # Handle guidance zone based on distance
-            if closest_distance < guidance_distance:  # Within guidance stop distance
-                if not within_2km_zone:
-                    # First time within zone - show checkmark ONCE
-                    heading_guidance.show_checkmark()
-                    within_2km_zone = True
-                else:
-                    # Already within zone - show NOTHING (clear all)
-                    heading_guidance.clear()
-            else:  # Outside guidance zone
-                # Left the zone - reset flag
-                if within_2km_zone:
-                    within_2km_zone = False
-                # Show arrows/green circle as normal
-                heading_guidance.update(last_heading, closest_bearing)
-        elif heading_guidance:
-            heading_guidance.clear()
+            if frame.guidance == navigation.GUIDANCE_CHECKMARK:
+                guidance_action = ("checkmark", heading_guidance.center_x, heading_guidance.center_y)
+            else:
+                guidance_action = ("arrow", heading_guidance.display_key(frame.heading, frame.bearing))
         
-        # Store overlay info for GUI display - limit to max rows
-        max_rows = config.get_int(ROWS_KEY)
-        gui_poi_texts = [text for text, _ in poi_texts[:max_rows]] if max_rows > 0 and len(poi_texts) > max_rows else [text for text, _ in poi_texts]
-        OVERLAY_INFO_TEXT = "\n".join(gui_poi_texts)
+        # Only resend when the rendered text or graphics differ, or the TTL keepalive is due
+        overlay_signature = (frame.rows, guidance_action, overlay.OVERLAY_MAX_ROWS, overlay.OVERLAY_LEFT_MARGIN)
+        if RENDER_GATE.changed("overlay", overlay_signature, keepalive=True):
+            # Rows and guidance graphics go to EDMCOverlay as one write
+            with overlay.batch():
+                # Show POI rows with different colors - target POI orange, rest gray if guidance enabled
+                overlay.show_poi_rows_with_colors(list(frame.rows))
+                
+                if heading_guidance:
+                    if guidance_action[0] == "checkmark":
+                        heading_guidance.show_checkmark()
+                    elif guidance_action[0] == "arrow":
+                        heading_guidance.update(frame.heading, frame.bearing)
+                    else:
+                        heading_guidance.clear()
     else:
-        overlay.clear_all_poi_rows()
-        if heading_guidance:
-            heading_guidance.clear()
+        if RENDER_GATE.changed("overlay", None):
+            with overlay.batch():
+                overlay.clear_all_poi_rows()
+                if heading_guidance:
+                    heading_guidance.clear()
+    
+    # Store overlay info for GUI display - limited to max rows
+    OVERLAY_INFO_TEXT = frame.info_text
+    
+    if frame.events:
+        handle_geofence_events(frame.events)
+
+def refresh_overlay_info_text():
+    """Recompute OVERLAY_INFO_TEXT for the GUI without sending anything to the overlay"""
+    global OVERLAY_INFO_TEXT
+    position = render_position()
+    if position is None:
         OVERLAY_INFO_TEXT = ""
+        return
+    OVERLAY_INFO_TEXT = NAV_ENGINE.compute_info_text(position, settings.current(), get_active_body_pois(), get_poi_revision())
+
+def handle_geofence_events(events):
+    """Overlay notice for POIs just reached, and optionally deactivate them (one save, one redraw)."""
+    reached = [event.poi for event in events if event.kind == navigation.GEOFENCE_ENTER]
+    if not reached:
+        return
+    names = ", ".join(navigation.poi_description(poi) for poi in reached)
+    overlay.show_notice(plugin_tl("Arrived at {poi}").format(poi=names))
+    if settings.current().auto_deactivate:
+        with poi_manager.transaction():
+            if set_pois_active(reached, False):
+                redraw_plugin_app()
 
 def dashboard_entry(cmdr, is_beta, entry):
-    global last_lat, last_lon, last_body, last_altitude, last_planet_radius, last_heading, CURRENT_SYSTEM, OVERLAY_INFO_TEXT, within_2km_zone, gui_guidance_visible
+    global last_lat, last_lon, last_body, last_altitude, last_planet_radius, last_heading, CURRENT_SYSTEM, OVERLAY_INFO_TEXT
 
     altitude = entry.get("Altitude") or 0
     lat = entry.get("Latitude")
@@ -1473,114 +1779,70 @@ def dashboard_entry(cmdr, is_beta, entry):
                 first_coords = True
             last_lat, last_lon = lat, lon
             last_altitude, last_planet_radius = altitude, planet_radius
+            POSITION_PREDICTOR.add_sample(bodyname, lat, lon, planet_radius)
+        else:
+            POSITION_PREDICTOR.reset()
     else:
         # No body anymore - clear everything
         if last_body:
             last_body = None
             last_heading = None
-            within_2km_zone = False  # Reset checkmark flag
-            gui_guidance_visible = False  # Reset GUI guidance state
+            NAV_ENGINE.reset()  # Reset target, checkmark and GUI guidance state
             OVERLAY_INFO_TEXT = ""
-            overlay.clear_all_poi_rows()
-            if heading_guidance:
-                heading_guidance.clear()
+            with overlay.batch():
+                overlay.clear_all_poi_rows()
+                if heading_guidance:
+                    heading_guidance.clear()
+            RENDER_GATE.reset()
+            POSITION_PREDICTOR.reset()
             redraw_plugin_app()
             return
     
     # Rebuild GUI only if body changed or first coords received
     if body_changed or first_coords:
-        gui_guidance_visible = False  # Reset GUI guidance state on body/coords change
+        NAV_ENGINE.gui_guidance_visible = False  # Reset GUI guidance state on body/coords change
         redraw_plugin_app()
     
-    # Update overlay for current position (does not rebuild GUI)
+    # Render overlay and GUI for the new position on the scheduler's next tick,
+    # so a burst of Status.json writes costs one render (does not rebuild GUI)
     if lat is not None and lon is not None and bodyname:
-        update_overlay_for_current_position()
-        
-        # Update GUI widgets dynamically without rebuilding (if show_gui_info is enabled)
-        if config.get_int(SHOW_GUI_INFO_KEY) and last_heading is not None:
-            matching_pois = [poi for poi in get_all_pois_flat(ALL_POIS) if get_full_body_name(poi) == last_body and poi.get("active", True)]
-            if matching_pois:
-                first_poi = matching_pois[0]
-                poi_lat = first_poi.get("lat")
-                poi_lon = first_poi.get("lon")
-                
-                if poi_lat is not None and poi_lon is not None:
-                    distance, bearing = calculate_bearing_and_distance(
-                        last_lat, last_lon, poi_lat, poi_lon,
-                        last_planet_radius, last_altitude, 0,
-                        calc_with_altitude=config.get_int(ALT_KEY)
-                    )
-                    
-                    show_dist, unit = format_distance_with_unit(distance)
-                    
-                    # Update FIRST_POI_LABEL
-                    if FIRST_POI_LABEL is not None:
-                        desc = first_poi.get("description", "")
-                        if not desc:
-                            desc = f"{poi_lat:.4f}, {poi_lon:.4f}"
-                        if unit == "m":
-                            display_text = f"{desc} - {round(bearing)}°/ {round(show_dist)}{unit}"
-                        else:
-                            display_text = f"{desc} - {round(bearing)}°/ {show_dist:.1f}{unit}"
-                        FIRST_POI_LABEL.config(text=display_text)
-                    
-                    # Update guidance widgets if they exist, or rebuild GUI if state changed
-                    guidance_distance = config.get_int(GUIDANCE_DISTANCE_KEY, default=2000)
-                    should_show_guidance = distance >= guidance_distance
-                    
-                    # Check if GUI guidance state needs to change
-                    if should_show_guidance != gui_guidance_visible:
-                        # State changed - trigger full GUI rebuild to add/remove widgets
-                        gui_guidance_visible = should_show_guidance
-                        redraw_plugin_app()
-                        return  # GUI rebuild will handle everything
-                    
-                    # GUI state is correct - just update widget content if widgets exist
-                    if should_show_guidance and GUIDANCE_CENTER_LABEL is not None:
-                        # Calculate deviation
-                        guidance_threshold = config.get_int(GUIDANCE_THRESHOLD_KEY, default=4)
-                        deviation = bearing - last_heading
-                        # Normalize to -180 to +180
-                        while deviation > 180:
-                            deviation -= 360
-                        while deviation < -180:
-                            deviation += 360
-                        on_course = abs(deviation) <= guidance_threshold
-                        
-                        # Calculate number of arrows
-                        num_arrows = 0
-                        if not on_course:
-                            abs_deviation = abs(deviation)
-                            if abs_deviation > guidance_threshold:
-                                max_deviation = 90
-                                arrow_fraction = min((abs_deviation - guidance_threshold) / (max_deviation - guidance_threshold), 1.0)
-                                num_arrows = int(arrow_fraction * 4) + 1
-                                num_arrows = min(num_arrows, 4)
-                        
-                        # Update guidance labels
-                        left_arrows = "<" * num_arrows if deviation < -guidance_threshold else ""
-                        GUIDANCE_LEFT_LABEL.config(text=left_arrows)
-                        
-                        if unit == "m":
-                            center_text = f"{round(bearing)}°/ {round(show_dist)}{unit}"
-                        else:
-                            center_text = f"{round(bearing)}°/ {show_dist:.1f}{unit}"
-                        
-                        # Update text
-                        GUIDANCE_CENTER_LABEL.config(text=center_text)
-                        
-                        # Update color based on on_course status
-                        if on_course:
-                            GUIDANCE_CENTER_LABEL.config(foreground="#00aa00")
-                        else:
-                            # Get current theme's default foreground color by creating temp label
-                            import tkinter as tk
-                            temp_label = tk.Label()
-                            theme.update(temp_label)
-                            default_fg = temp_label.cget("foreground")
-                            temp_label.destroy()
-                            GUIDANCE_CENTER_LABEL.config(foreground=default_fg)
-                        
-                        right_arrows = ">" * num_arrows if deviation > guidance_threshold else ""
-                        GUIDANCE_RIGHT_LABEL.config(text=right_arrows)
+        RENDER_SCHEDULER.request()
+
+def render_overlay_frame():
+    """
+    Overlay render tick: render at the dead-reckoned estimate (see render_position),
+    and keep ticking at the overlay rate while the estimate is still moving.
+    """
+    update_overlay_for_current_position()
+    
+    # Only with a Tk frame to schedule on - without one the request would render recursively
+    if POSITION_PREDICTOR.is_moving() and PLUGIN_FRAME is not None:
+        RENDER_SCHEDULER.request("overlay", "gui")
 
+def update_gui_for_current_position():
+    """Update guidance and target labels in the EDMC GUI without rebuilding it."""
+    position = render_position()
+    if position is None:
+        return
+    
+    display, rebuild = NAV_ENGINE.compute_gui(position, settings.current())
+    if display is None:
+        return
+    
+    if FIRST_POI_LABEL is not None and RENDER_GATE.changed("first_poi_label", display.target_label):
+        FIRST_POI_LABEL.config(text=display.target_label)
+    
+    if rebuild:
+        # Guidance widgets must be added or removed - full GUI rebuild handles everything
+        redraw_plugin_app()
+        return
+    
+    # GUI state is correct - just update widget content if widgets exist
+    if display.show_guidance and GUIDANCE_CENTER_LABEL is not None:
+        # Skip Tk updates when the labels would show the same thing
+        if RENDER_GATE.changed("gui_guidance", (display.left_arrows, display.center_text, display.right_arrows, display.on_course)):
+            GUIDANCE_LEFT_LABEL.config(text=display.left_arrows)
+            GUIDANCE_CENTER_LABEL.config(text=display.center_text)
+            # Cached theme colour, only set when it changes
+            theme_colors.set_foreground(GUIDANCE_CENTER_LABEL, theme_colors.get_guidance_color(display.on_course))
+            GUIDANCE_RIGHT_LABEL.config(text=display.right_arrows)
@@ -0,0 +1,396 @@
+"""
+Fake EDMCOverlay server for EDMC-PlanetPOI tests
+Accepts the newline-delimited JSON protocol on localhost and records what it
+receives, so overlay traffic can be measured without the real EDMCOverlay.
+Not part of the plugin - EDMC never loads it.
+
+Run standalone from the plugin folder (EDMC then connects to it instead of EDMCOverlay):
+    python -m tests.fake_overlay --port 5010 [--latency 0.01] [--drop-after 500]
+Benchmark batched vs unbatched writes:
+    python -m tests.fake_overlay --benchmark
+Drive overlay.py and HeadingGuidance and print messages per tick:
+    python -m tests.fake_overlay --demo
+"""
+
+import argparse
+import json
+import socket
+import threading
+import time
+
+
+DEFAULT_PORT = 5010  # Port EDMCOverlay listens on
+
+
+class Received:
+    """One message as seen by the server"""
+
+    __slots__ = ("msg", "time", "connection", "tick")
+
+    def __init__(self, msg, time, connection, tick):
+        self.msg = msg
+        self.time = time
+        self.connection = connection
+        self.tick = tick
+
+    @property
+    def id(self):
+        return self.msg.get("id")
+
+    @property
+    def ttl(self):
+        return self.msg.get("ttl")
+
+    @property
+    def is_shape(self):
+        return "shape" in self.msg
+
+    @property
+    def is_clear(self):
+        """EDMCOverlay removes an item on ttl 0 or an empty text message"""
+        return self.msg.get("ttl") == 0 or ("shape" not in self.msg and not self.msg.get("text"))
+
+
+class FakeOverlayServer:
+    """
+    TCP server that records every JSON message and every recv() that returned data.
+
+    latency: seconds to sleep before each recv(), like a busy overlay process
+    drop_after: close each connection after this many messages (0 = never)
+
+    Usage:
+        with FakeOverlayServer() as server:
+            client = LineClient(*server.address)
+            ...
+            server.wait_for(count)
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, drop_after=0):
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind((host, port))
+        self._sock.listen()
+        self.address = self._sock.getsockname()
+        self.latency = latency
+        self.drop_after = drop_after
+        self.received = []
+        self.reads = 0  # recv() calls that returned data - a rough count of client writes
+        self.connections = 0
+        self.errors = []  # Lines that were not valid JSON objects
+        self._tick = 0
+        self._conns = []
+        self._lock = threading.Lock()
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._accept_loop, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+        self.disconnect_all()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def messages(self):
+        """Raw message dicts in arrival order"""
+        with self._lock:
+            return [item.msg for item in self.received]
+
+    def reset(self):
+        with self._lock:
+            self.received = []
+            self.reads = 0
+            self.errors = []
+            self._tick = 0
+
+    def disconnect_all(self):
+        """Close every client connection, like EDMCOverlay restarting"""
+        with self._lock:
+            conns, self._conns = self._conns, []
+        for conn in conns:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def wait_for(self, count, timeout=5.0):
+        """Wait until at least count messages have arrived; returns True if they did"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._lock:
+                if len(self.received) >= count:
+                    return True
+            time.sleep(0.001)
+        return False
+
+    def settle(self, quiet=0.05, timeout=5.0):
+        """Wait until no message has arrived for `quiet` seconds, return the message count"""
+        deadline = time.monotonic() + timeout
+        last_count = -1
+        last_change = time.monotonic()
+        while time.monotonic() < deadline:
+            with self._lock:
+                count = len(self.received)
+            now = time.monotonic()
+            if count != last_count:
+                last_count = count
+                last_change = now
+            elif now - last_change >= quiet:
+                return count
+            time.sleep(0.005)
+        return last_count
+
+    def mark_tick(self):
+        """
+        Start a new tick: messages received from now on count towards it.
+        Call settle() first so the previous tick's messages are not miscounted.
+        """
+        with self._lock:
+            self._tick += 1
+            return self._tick
+
+    def tick_counts(self):
+        """Number of messages received per tick, index 0 = before the first mark_tick()"""
+        with self._lock:
+            counts = [0] * (self._tick + 1)
+            for item in self.received:
+                counts[item.tick] += 1
+        return counts
+
+    def ttl_histogram(self):
+        """{ttl: message count}"""
+        histogram = {}
+        with self._lock:
+            for item in self.received:
+                histogram[item.ttl] = histogram.get(item.ttl, 0) + 1
+        return histogram
+
+    def visible(self, now=None):
+        """
+        Items EDMCOverlay would still be drawing: the last message per id,
+        unless it cleared the id or its TTL has run out
+        """
+        now = time.monotonic() if now is None else now
+        latest = {}
+        with self._lock:
+            for item in self.received:
+                latest[item.id] = item
+        return {
+            item_id: item.msg
+            for item_id, item in latest.items()
+            if not item.is_clear and (item.ttl is None or item.time + item.ttl > now)
+        }
+
+    def summary(self):
+        """One-line traffic summary"""
+        with self._lock:
+            messages = len(self.received)
+            shapes = sum(1 for item in self.received if item.is_shape)
+            clears = sum(1 for item in self.received if item.is_clear)
+        return (f"{messages} messages ({shapes} shapes, {clears} clears) in {self.reads} reads "
+                f"over {self.connections} connections, {len(self.errors)} bad lines")
+
+    def _accept_loop(self):
+        while self._running:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            with self._lock:
+                self.connections += 1
+                self._conns.append(conn)
+                number = self.connections
+            threading.Thread(target=self._read_loop, args=(conn, number), daemon=True).start()
+
+    def _read_loop(self, conn, number):
+        buffer = b""
+        count = 0
+        with conn:
+            while True:
+                if self.latency:
+                    time.sleep(self.latency)
+                try:
+                    data = conn.recv(65536)
+                except OSError:
+                    return
+                if not data:
+                    return
+                now = time.monotonic()
+                buffer += data
+                *lines, buffer = buffer.split(b"\n")
+                with self._lock:
+                    self.reads += 1
+                    for line in lines:
+                        if not line.strip():
+                            continue
+                        try:
+                            msg = json.loads(line)
+                            if not isinstance(msg, dict):
+                                raise ValueError("not a JSON object")
+                        except ValueError as e:
+                            self.errors.append((line, str(e)))
+                            continue
+                        self.received.append(Received(msg, now, number, self._tick))
+                        count += 1
+                if self.drop_after and count >= self.drop_after:
+                    # Simulated disconnect - the client has to reconnect
+                    with self._lock:
+                        if conn in self._conns:
+                            self._conns.remove(conn)
+                    return
+
+
+class LineClient:
+    """
+    Minimal stand-in for edmcoverlay.Overlay: one JSON line and one write per message
+    """
+
+    def __init__(self, server="127.0.0.1", port=DEFAULT_PORT):
+        self.server = server
+        self.port = port
+        self.connection = None
+
+    def connect(self):
+        connection = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        connection.connect((self.server, self.port))
+        self.connection = connection
+
+    def send_raw(self, msg):
+        if self.connection is None:
+            self.connect()
+        try:
+            self.connection.sendall((json.dumps(msg) + "\n").encode("utf-8"))
+        except OSError:
+            # Same as edmcoverlay: drop the socket and reconnect on the next send
+            self.connection = None
+            raise
+
+    def send_message(self, msgid, text, color, x, y, ttl=4, size="normal"):
+        self.send_raw({"id": msgid, "color": color, "text": text, "size": size, "x": x, "y": y, "ttl": ttl})
+
+    def send_shape(self, shapeid, shape, color, fill, x, y, w, h, ttl):
+        self.send_raw({"id": shapeid, "shape": shape, "color": color, "fill": fill, "x": x, "y": y, "w": w, "h": h, "ttl": ttl})
+
+
+def attach_plugin_overlay(server):
+    """
+    Point PlanetPOI.overlay at the fake server instead of EDMCOverlay,
+    so overlay.py and HeadingGuidance can run on any OS
+    """
+    from PlanetPOI import overlay
+
+    client = LineClient(*server.address)
+    client.connect()
+    overlay._batcher.set_client(client)
+    overlay.overlay = overlay._batcher
+    overlay.overlay_available = True
+    overlay._connection_attempted = True
+    return client
+
+
+def run_benchmark(frames=200):
+    """Compare one write per message with one write per frame of changes"""
+    from PlanetPOI.overlay import FrameBatcher
+
+    def guidance_frame(writer, frame, rows=10):
+        """Roughly what one overlay tick sends while flying: new distances, arrow clear and a new arrow"""
+        for idx in range(rows):
+            writer.send_message(f"poi_{idx}", f"123°/ {4.5 + frame / 100:.2f}km POI {idx}", "#888888", 500, 2 + idx * 24, ttl=30, size="large")
+        for name in ("shaft", "head", "rect"):
+            writer.send_message(f"heading-{name}", "", "", 0, 0, 0)
+        for offset in range(-2, 3):
+            for step in range(30):
+                writer.send_message(f"checkmark-left-{step}-{offset}", "", "", 0, 0, 0)
+                writer.send_message(f"checkmark-right-{step}-{offset}", "", "", 0, 0, 0)
+        writer.send_shape("heading-arrow-shaft", "rect", "#ff8800", "#ff8800", 600, 300, 80 + frame % 7, 12, 15)
+
+    print(f"{'writer':>9} {'frames':>7} {'queued':>7} {'messages':>9} {'send s':>7} {'total s':>8} {'server reads':>13}")
+    for name in ("unbatched", "batched"):
+        with FakeOverlayServer() as server:
+            client = LineClient(*server.address)
+            client.connect()
+            batcher = FrameBatcher(client)
+            t0 = time.perf_counter()
+            for frame in range(frames):
+                if name == "batched":
+                    with batcher.frame():
+                        guidance_frame(batcher, frame)
+                else:
+                    guidance_frame(client, frame)
+            send_time = time.perf_counter() - t0  # Time the plugin thread spends writing
+            queued = frames * (10 + 3 + 300 + 1)
+            expected = queued if name == "unbatched" else batcher.messages
+            assert server.wait_for(expected), "fake server did not receive all messages"
+            elapsed = time.perf_counter() - t0
+            print(f"{name:>9} {frames:>7} {queued:>7} {expected:>9} {send_time:>7.3f} {elapsed:>8.3f} {server.reads:>13}")
+
+
+def run_demo():
+    """Drive overlay rows and heading guidance through a turn and print the traffic per tick"""
+    from PlanetPOI import overlay
+    from PlanetPOI.heading_guidance import HeadingGuidance
+
+    with FakeOverlayServer() as server:
+        attach_plugin_overlay(server)
+        guidance = HeadingGuidance(center_x=600, center_y=150)
+        print(f"{'tick':>5} {'heading':>7} {'messages':>8} {'visible':>7}")
+        for heading in range(0, 100, 10):
+            tick = server.mark_tick()
+            with overlay.batch():
+                overlay.show_poi_rows_with_colors([(f"90°/ 4.2km POI {i}", i == 0) for i in range(3)])
+                guidance.update(heading, 90)
+            server.settle()
+            print(f"{tick:>5} {heading:>7} {server.tick_counts()[tick]:>8} {len(server.visible()):>7}")
+        tick = server.mark_tick()
+        with overlay.batch():
+            overlay.clear_all_poi_rows()
+            guidance.clear()
+        server.settle()
+        print(f"{'clear':>5} {'':>7} {server.tick_counts()[tick]:>8} {len(server.visible()):>7}")
+        print(server.summary())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake EDMCOverlay server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds to sleep before each read")
+    parser.add_argument("--drop-after", type=int, default=0, help="close connections after this many messages")
+    parser.add_argument("--benchmark", action="store_true", help="compare batched and unbatched writes")
+    parser.add_argument("--demo", action="store_true", help="drive overlay.py and HeadingGuidance")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        run_benchmark()
+        return
+    if args.demo:
+        run_demo()
+        return
+
+    with FakeOverlayServer(args.host, args.port, args.latency, args.drop_after) as server:
+        print(f"Fake EDMCOverlay listening on {server.address[0]}:{server.address[1]} - Ctrl+C to stop")
+        try:
+            while True:
+                time.sleep(1)
+                tick = server.mark_tick()
+                print(f"{server.tick_counts()[tick - 1]:>6} msg/s, {len(server.visible()):>4} visible - {server.summary()}")
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Tests for PlanetPOI.body_prefetch"""
+
+import threading
+import time
+
+import pytest
+
+from PlanetPOI import body_prefetch, poi_manager
+from PlanetPOI.body_prefetch import BodyPrefetcher
+
+SYSTEM = "Sol"
+BODY = "Sol 3"
+
+
+def poi(description, active=True):
+    return {"type": "poi", "system": SYSTEM, "body": "3", "lat": 1.0, "lon": 2.0,
+            "description": description, "active": active}
+
+
+@pytest.fixture
+def tree():
+    """A tree with an inactive POI and an inactive folder, known to the folder stats"""
+    tree = [
+        {"type": "folder", "name": "On", "children": [poi("one"), poi("off", active=False)]},
+        {"type": "folder", "name": "Off", "active": False, "children": [poi("hidden")]},
+        poi("root"),
+    ]
+    poi_manager.folder_stats.reset(tree)
+    yield tree
+    poi_manager.folder_stats.reset([])
+
+
+def wait_for_slice(prefetcher, body, revision, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with prefetcher._lock:
+            body_slice = prefetcher._slices.get(body)
+        if body_slice is not None and body_slice.revision == revision:
+            return body_slice
+        time.sleep(0.01)
+    raise AssertionError("slice was not prefetched")
+
+
+def test_worker_builds_from_a_snapshot(tree, monkeypatch):
+    threads = set()
+    is_active = body_prefetch.is_poi_active
+
+    def recording_is_active(item):
+        threads.add(threading.current_thread())
+        return is_active(item)
+
+    monkeypatch.setattr(body_prefetch, "is_poi_active", recording_is_active)
+    prefetcher = BodyPrefetcher()
+    prefetcher.prefetch(tree, 1, system=SYSTEM)
+    # The tree may change as soon as prefetch() returns
+    tree[0]["children"].clear()
+
+    body_slice = wait_for_slice(prefetcher, BODY, 1)
+    assert [p["description"] for p in body_slice.pois] == ["one", "off", "hidden", "root"]
+    assert [p["description"] for p in body_slice.active] == ["one", "root"]
+    assert threads == {threading.current_thread()}
+
+
+def test_get_uses_the_prefetched_slice(tree):
+    prefetcher = BodyPrefetcher()
+    prefetcher.prefetch(tree, 1, bodies=[BODY])
+    prefetched = wait_for_slice(prefetcher, BODY, 1)
+    assert prefetcher.get(tree, 1, BODY) is prefetched
+    assert prefetcher.hits == 1
+
+    # Nothing is queued for bodies already prefetched at the revision
+    prefetcher.prefetch(tree, 1, bodies=[BODY])
+    assert prefetcher._queue.empty()
+    assert prefetcher.get(tree, 2, BODY) is not prefetched
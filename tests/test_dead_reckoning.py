@@ -0,0 +1,80 @@
+"""Tests for PlanetPOI.dead_reckoning"""
+
+from PlanetPOI.calculations import calculate_bearing_and_distance
+from PlanetPOI.dead_reckoning import PositionPredictor, MAX_EXTRAPOLATION
+
+RADIUS = 1000000
+BODY = "Test 1 a"
+
+
+def moving_predictor(samples=4, step=0.001, interval=1.0):
+    """Predictor fed with samples heading north at a steady speed"""
+    predictor = PositionPredictor(clock=lambda: 0.0)
+    for idx in range(samples):
+        predictor.add_sample(BODY, 10.0 + idx * step, 20.0, RADIUS, t=idx * interval)
+    return predictor
+
+
+def test_prediction_never_changes_the_real_fix():
+    predictor = moving_predictor()
+    fix = predictor.samples[-1]
+    saved = list(predictor.samples)
+
+    last_t = fix[0]
+    for dt in (0.1, 0.5, 1.0, 1.4):
+        lat, lon = predictor.predict(last_t + dt)
+        assert lat > fix[1]
+    assert list(predictor.samples) == saved
+    assert predictor.samples[-1] is fix
+
+
+def test_predicts_along_track_at_sample_speed():
+    predictor = moving_predictor()
+    fix = predictor.samples[-1]
+    lat, lon = predictor.predict(fix[0] + 0.5)
+    step, _ = calculate_bearing_and_distance(fix[1], fix[2], fix[1] + 0.001, fix[2], RADIUS)
+    distance, bearing = calculate_bearing_and_distance(fix[1], fix[2], lat, lon, RADIUS)
+    assert abs(distance - step / 2) < 0.5
+    assert bearing < 1 or bearing > 359
+
+
+def test_stops_extrapolating_when_updates_stop():
+    predictor = moving_predictor()
+    fix = predictor.samples[-1]
+    assert predictor.is_moving(fix[0] + 1.0)
+    # Samples came every second - a second and a half without one means they stopped
+    assert not predictor.is_moving(fix[0] + 1.6)
+    assert predictor.predict(fix[0] + 1.6) == (fix[1], fix[2])
+    assert predictor.predict(fix[0] + 60) == (fix[1], fix[2])
+
+
+def test_never_extrapolates_past_the_limit():
+    predictor = moving_predictor(interval=10.0, step=0.01)
+    fix = predictor.samples[-1]
+    assert predictor.horizon <= MAX_EXTRAPOLATION
+    assert predictor.predict(fix[0] + MAX_EXTRAPOLATION + 0.1) == (fix[1], fix[2])
+
+
+def test_stopping_drops_speed_with_the_next_sample():
+    predictor = moving_predictor()
+    last_t, lat, lon = predictor.samples[-1]
+    predictor.add_sample(BODY, lat, lon, RADIUS, t=last_t + 1.0)
+    assert predictor.speed == 0.0
+    assert predictor.predict(last_t + 1.5) == (lat, lon)
+
+
+def test_slowing_down_lowers_speed():
+    predictor = moving_predictor()
+    fast = predictor.speed
+    last_t, lat, lon = predictor.samples[-1]
+    predictor.add_sample(BODY, lat + 0.0002, lon, RADIUS, t=last_t + 1.0)
+    assert predictor.speed < fast / 2
+
+
+def test_body_change_resets():
+    predictor = moving_predictor()
+    last_t = predictor.samples[-1][0]
+    predictor.add_sample("Other 2", 1.0, 2.0, RADIUS, t=last_t + 1.0)
+    assert len(predictor.samples) == 1
+    assert predictor.speed == 0.0
+    assert predictor.predict(last_t + 1.5) == (1.0, 2.0)
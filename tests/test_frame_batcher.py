@@ -0,0 +1,179 @@
+"""Tests for PlanetPOI.overlay.FrameBatcher"""
+
+import json
+
+from PlanetPOI.overlay import FrameBatcher
+
+
+class Connection:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.writes = []
+
+    def sendall(self, payload):
+        if self.fail:
+            raise OSError("connection reset")
+        self.writes.append([json.loads(line) for line in payload.decode("utf-8").splitlines()])
+
+
+class Client:
+    """edmcoverlay.Overlay lookalike: a connection attribute, connect() makes a new one"""
+
+    def __init__(self):
+        self.connection = Connection()
+        self.connects = 0
+
+    def connect(self):
+        self.connects += 1
+        self.connection = Connection()
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def row(idx, text, ttl=30):
+    return {"id": f"poi_{idx}", "color": "#ff7100", "text": text, "size": "large", "x": 500, "y": 2 + idx * 24, "ttl": ttl}
+
+
+def send_row(batcher, idx, text, ttl=30):
+    batcher.send_message(f"poi_{idx}", text, "#ff7100", 500, 2 + idx * 24, ttl=ttl, size="large")
+
+
+def clear(batcher, msgid):
+    batcher.send_message(msgid, "", "", 0, 0, 0)
+
+
+def make_batcher():
+    client = Client()
+    clock = Clock()
+    return FrameBatcher(client, clock=clock), client, clock
+
+
+def test_outside_a_frame_each_message_is_written():
+    batcher, client, _ = make_batcher()
+    send_row(batcher, 0, "a")
+    send_row(batcher, 1, "b")
+    assert client.connection.writes == [[row(0, "a")], [row(1, "b")]]
+
+
+def test_frame_flushes_once_at_its_end():
+    batcher, client, _ = make_batcher()
+    with batcher.frame():
+        send_row(batcher, 0, "a")
+        send_row(batcher, 1, "b")
+        assert client.connection.writes == []
+    assert client.connection.writes == [[row(0, "a"), row(1, "b")]]
+    assert (batcher.flushes, batcher.messages) == (1, 2)
+
+
+def test_nested_frames_flush_with_the_outermost():
+    batcher, client, _ = make_batcher()
+    with batcher.frame():
+        send_row(batcher, 0, "a")
+        with batcher.frame():
+            send_row(batcher, 1, "b")
+        assert client.connection.writes == []
+        send_row(batcher, 2, "c")
+    assert client.connection.writes == [[row(0, "a"), row(1, "b"), row(2, "c")]]
+
+
+def test_unchanged_messages_are_not_resent():
+    batcher, client, _ = make_batcher()
+    with batcher.frame():
+        send_row(batcher, 0, "a")
+        send_row(batcher, 1, "b")
+    with batcher.frame():
+        send_row(batcher, 0, "a")
+        send_row(batcher, 1, "changed")
+    assert client.connection.writes[-1] == [row(1, "changed")]
+    with batcher.frame():
+        send_row(batcher, 0, "a")
+        send_row(batcher, 1, "changed")
+    assert len(client.connection.writes) == 2
+    assert batcher.skipped == 3
+
+
+def test_unchanged_messages_are_refreshed_before_their_ttl_runs_out():
+    batcher, client, clock = make_batcher()
+    send_row(batcher, 0, "a", ttl=30)
+    clock.now += 14
+    send_row(batcher, 0, "a", ttl=30)
+    assert len(client.connection.writes) == 1
+    clock.now += 1
+    send_row(batcher, 0, "a", ttl=30)
+    assert len(client.connection.writes) == 2
+
+
+def test_clears_are_only_sent_for_items_that_show():
+    batcher, client, clock = make_batcher()
+    clear(batcher, "heading-arrow-shaft")
+    assert client.connection.writes == []
+
+    send_row(batcher, 0, "a", ttl=30)
+    clear(batcher, "poi_0")
+    clear(batcher, "poi_0")
+    assert [[msg["text"] for msg in write] for write in client.connection.writes] == [["a"], [""]]
+
+    send_row(batcher, 1, "b", ttl=30)
+    clock.now += 31  # Expired on its own
+    clear(batcher, "poi_1")
+    assert len(client.connection.writes) == 3
+
+
+def test_last_message_per_id_in_a_frame_wins():
+    batcher, client, _ = make_batcher()
+    send_row(batcher, 0, "a")
+    with batcher.frame():
+        clear(batcher, "poi_0")   # Guidance clears everything first ...
+        send_row(batcher, 0, "a")  # ... then redraws the same thing
+    assert len(client.connection.writes) == 1
+
+    with batcher.frame():
+        clear(batcher, "poi_0")
+        send_row(batcher, 0, "b")
+    assert client.connection.writes[-1] == [row(0, "b")]
+
+
+def test_failed_write_drops_the_frame_and_reconnects():
+    batcher, client, _ = make_batcher()
+    send_row(batcher, 0, "a")
+    client.connection.fail = True
+    with batcher.frame():
+        send_row(batcher, 0, "b")
+        send_row(batcher, 1, "c")
+    assert client.connection is None
+    assert batcher.messages == 1
+
+    with batcher.frame():
+        send_row(batcher, 0, "a")
+    assert client.connects == 1
+    # What reached EDMCOverlay is unknown, so even the row it had before is resent
+    assert client.connection.writes == [[row(0, "a")]]
+
+
+def test_new_client_resends_everything():
+    batcher, client, _ = make_batcher()
+    send_row(batcher, 0, "a")
+    other = Client()
+    batcher.set_client(other)
+    send_row(batcher, 0, "a")
+    assert other.connection.writes == [[row(0, "a")]]
+
+
+def test_client_without_connection_gets_one_call_per_message():
+    sent = []
+
+    class PlainClient:
+        def send_raw(self, msg):
+            sent.append(msg)
+
+    batcher = FrameBatcher(PlainClient())
+    with batcher.frame():
+        send_row(batcher, 0, "a")
+        send_row(batcher, 1, "b")
+    assert sent == [row(0, "a"), row(1, "b")]
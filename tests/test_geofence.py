@@ -0,0 +1,62 @@
+"""Tests for PlanetPOI.navigation.geofence"""
+
+from PlanetPOI.navigation import Position, GEOFENCE_ENTER, GEOFENCE_EXIT
+from PlanetPOI.navigation.geofence import Geofence
+
+BODY = "Test 1 a"
+RADIUS = 1000000
+DEFAULT_RADIUS = 50
+
+
+def poi(description, lat, radius=None):
+    item = {"description": description, "lat": lat, "lon": 0.0, "active": True}
+    if radius is not None:
+        item["radius"] = radius
+    return item
+
+
+def at(lat):
+    return Position(BODY, lat, 0.0, planet_radius=RADIUS)
+
+
+def test_enter_and_exit_events():
+    pois = [poi("a", 0.0), poi("b", 1.0)]
+    geofence = Geofence()
+    events = geofence.update(at(0.0), pois, 1, DEFAULT_RADIUS)
+    assert [(event.kind, event.poi["description"]) for event in events] == [(GEOFENCE_ENTER, "a")]
+    assert geofence.update(at(0.0), pois, 1, DEFAULT_RADIUS) == []
+    events = geofence.update(at(0.5), pois, 1, DEFAULT_RADIUS)
+    assert [(event.kind, event.poi["description"]) for event in events] == [(GEOFENCE_EXIT, "a")]
+
+
+def test_new_revision_keeps_unchanged_fences():
+    pois = [poi("a", 0.0), poi("b", 1.0), poi("c", 2.0)]
+    geofence = Geofence()
+    geofence.update(at(0.0), pois, 1, DEFAULT_RADIUS)
+    fences = dict(geofence._fences)
+
+    # A save that changed nothing on the body
+    geofence.update(at(0.0), pois, 2, DEFAULT_RADIUS)
+    assert all(geofence._fences[key] is fence for key, fence in fences.items())
+
+    # "a" reached and deactivated, "b" given a larger radius
+    pois[1]["radius"] = 500
+    events = geofence.update(at(0.0), pois[1:], 3, DEFAULT_RADIUS)
+    assert events == []
+    assert geofence._fences[id(pois[2])] is fences[id(pois[2])]
+    assert geofence._fences[id(pois[1])] is not fences[id(pois[1])]
+    assert id(pois[0]) not in geofence._fences
+    # The fence already entered is still left with an event
+    assert geofence.is_inside(pois[0])
+    events = geofence.update(at(0.5), pois[1:], 3, DEFAULT_RADIUS)
+    assert [(event.kind, event.poi["description"]) for event in events] == [(GEOFENCE_EXIT, "a")]
+
+
+def test_moved_poi_is_found_at_its_new_position():
+    pois = [poi("a", 0.0)]
+    geofence = Geofence()
+    geofence.update(at(1.0), pois, 1, DEFAULT_RADIUS)
+    pois[0]["lat"] = 1.0
+    events = geofence.update(at(1.0), pois, 2, DEFAULT_RADIUS)
+    assert [(event.kind, event.poi["description"]) for event in events] == [(GEOFENCE_ENTER, "a")]
+    assert len(list(geofence._candidates(geofence._fences[id(pois[0])].point))) == 1
@@ -0,0 +1,37 @@
+"""Tests for PlanetPOI.navigation.engine"""
+
+from PlanetPOI.navigation import NavigationEngine, Position
+from PlanetPOI.settings import Settings
+
+BODY = "Test 1 a"
+
+
+def poi(description, lat):
+    return {"description": description, "lat": lat, "lon": 0.0, "active": True}
+
+
+def test_info_text_matches_the_tick():
+    pois = [poi("a", 1.0), poi("b", 2.0), poi("c", 3.0)]
+    position = Position(BODY, 0.0, 0.0)
+    settings = Settings(max_overlay_rows=2)
+    engine = NavigationEngine()
+    frame = engine.compute_overlay(position, settings, pois, 1)
+    assert engine.compute_info_text(position, settings, pois, 1) == frame.info_text
+    assert len(frame.info_text.splitlines()) == 2
+
+
+def test_info_text_leaves_guidance_state_alone():
+    pois = [poi("a", 0.0), poi("b", 1.0)]
+    settings = Settings()
+    engine = NavigationEngine()
+    engine.compute_overlay(Position(BODY, 1.0, 0.0), settings, pois, 1)
+    assert engine.target is pois[0]
+
+    # Standing on "a" would enter its fence on a tick, but not here
+    text = engine.compute_info_text(Position(BODY, 0.0, 0.0), settings, pois, 1)
+    assert "a" in text.splitlines()[0]
+    assert engine.target is pois[0]
+    assert not engine.geofence.is_inside(pois[0])
+
+    # A deactivated target is not shown
+    assert "a" not in engine.compute_info_text(Position(BODY, 0.0, 0.0), settings, pois[1:], 2)
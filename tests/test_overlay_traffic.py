@@ -0,0 +1,120 @@
+"""Overlay traffic of one render tick, received by the fake EDMCOverlay server"""
+
+import pytest
+
+from PlanetPOI import navigation, overlay
+from PlanetPOI.heading_guidance import HeadingGuidance
+from PlanetPOI.settings import Settings
+from tests.fake_overlay import FakeOverlayServer, attach_plugin_overlay
+
+BODY = "Sol A 1"
+
+
+@pytest.fixture
+def server():
+    saved = (overlay.overlay, overlay.overlay_available, overlay._connection_attempted, overlay._batcher.client)
+    with FakeOverlayServer() as fake:
+        client = attach_plugin_overlay(fake)
+        yield fake
+        client.connection.close()
+    overlay.overlay, overlay.overlay_available, overlay._connection_attempted, overlay._batcher.client = saved
+
+
+def sample_pois():
+    return [
+        {"type": "poi", "system": "Sol", "body": "A 1", "lat": 0.0, "lon": 1.0, "description": "East", "active": True},
+        {"type": "poi", "system": "Sol", "body": "A 1", "lat": 1.0, "lon": 0.0, "description": "North", "active": True},
+        {"type": "poi", "system": "Sol", "body": "A 1", "lat": -1.0, "lon": 0.0, "description": "South", "active": True},
+    ]
+
+
+def render(frame, guidance):
+    """What load.update_overlay_for_current_position sends for a frame"""
+    with overlay.batch():
+        overlay.show_poi_rows_with_colors(list(frame.rows))
+        if frame.guidance == navigation.GUIDANCE_CHECKMARK:
+            guidance.show_checkmark()
+        elif frame.guidance == navigation.GUIDANCE_ARROW:
+            guidance.update(frame.heading, frame.bearing)
+        else:
+            guidance.clear()
+
+
+def tick(server, engine, guidance, position, pois, settings=Settings()):
+    number = server.mark_tick()
+    frame = engine.compute_overlay(position, settings, pois, 1)
+    render(frame, guidance)
+    server.settle()
+    return frame, [item.msg for item in server.received if item.tick == number]
+
+
+def test_sample_tick_draws_rows_and_turn_arrow(server):
+    engine = navigation.NavigationEngine()
+    guidance = HeadingGuidance(center_x=650, center_y=150)
+    position = navigation.Position(BODY, 0.0, 0.0, 0, 1000000, heading=0)
+
+    frame, messages = tick(server, engine, guidance, position, sample_pois())
+
+    assert not server.errors
+    assert frame.guidance == navigation.GUIDANCE_ARROW
+    visible = server.visible()
+    rows = [visible[f"poi_{idx}"] for idx in range(3)]
+    assert [row["text"].split()[-1] for row in rows] == ["East", "North", "South"]
+    assert [row["color"] for row in rows] == ["#ff7100", "#888888", "#888888"]
+    assert all(row["x"] == overlay.OVERLAY_LEFT_MARGIN for row in rows)
+    # Target is due east with heading north - turn right
+    assert visible["heading-arrow-shaft"]["shape"] == "rect"
+    assert visible["heading-arrow-head"]["shape"] == "vect"
+    assert set(visible) == {"poi_0", "poi_1", "poi_2", "heading-arrow-shaft", "heading-arrow-head"}
+    # Nothing was drawn before, so the empty rows and guidance clears are not sent
+    assert len(messages) == 5
+
+
+def test_only_changes_are_sent(server):
+    engine = navigation.NavigationEngine()
+    guidance = HeadingGuidance(center_x=650, center_y=150)
+    pois = sample_pois()
+    position = navigation.Position(BODY, 0.0, 0.0, 0, 1000000, heading=0)
+    tick(server, engine, guidance, position, pois)
+
+    _, messages = tick(server, engine, guidance, position, pois)
+    assert messages == []
+
+    # Turning towards the target changes the arrow, not the rows
+    _, messages = tick(server, engine, guidance, navigation.Position(BODY, 0.0, 0.0, 0, 1000000, heading=45), pois)
+    assert {msg["id"] for msg in messages} == {"heading-arrow-shaft", "heading-arrow-head"}
+
+    # On course: the arrow is cleared and the bar drawn
+    _, messages = tick(server, engine, guidance, navigation.Position(BODY, 0.0, 0.0, 0, 1000000, heading=90), pois)
+    assert {msg["id"] for msg in messages} == {
+        "heading-arrow-shaft", "heading-arrow-head", "heading-center-rect", "heading-t-horizontal", "heading-t-vertical"}
+    assert set(server.visible()) == {"poi_0", "poi_1", "poi_2", "heading-center-rect", "heading-t-horizontal", "heading-t-vertical"}
+
+
+def test_arrival_tick_shows_checkmark(server):
+    engine = navigation.NavigationEngine()
+    guidance = HeadingGuidance(center_x=650, center_y=150)
+    pois = sample_pois()
+    tick(server, engine, guidance, navigation.Position(BODY, 0.0, 0.5, 0, 1000000, heading=90), pois)
+
+    frame, _ = tick(server, engine, guidance, navigation.Position(BODY, 0.0, 0.999, 0, 1000000, heading=90), pois)
+
+    assert frame.guidance == navigation.GUIDANCE_CHECKMARK
+    visible = server.visible()
+    assert "heading-arrow-shaft" not in visible
+    assert sum(1 for item_id in visible if item_id.startswith("checkmark-")) == 250
+
+
+def test_clear_tick_leaves_nothing_visible(server):
+    engine = navigation.NavigationEngine()
+    guidance = HeadingGuidance(center_x=650, center_y=150)
+    tick(server, engine, guidance, navigation.Position(BODY, 0.0, 0.0, 0, 1000000, heading=0), sample_pois())
+    assert server.visible()
+
+    server.mark_tick()
+    with overlay.batch():
+        overlay.clear_all_poi_rows()
+        guidance.clear()
+    server.settle()
+
+    assert server.visible() == {}
@@ -0,0 +1,57 @@
+"""Tests for PlanetPOI.poi_io export"""
+
+import json
+
+from PlanetPOI import poi_io
+
+
+def sample_tree():
+    return [
+        {"type": "poi", "system": "Sol", "body": "Earth", "lat": 1.0, "lon": 2.0, "description": "root", "active": True},
+        {"type": "folder", "name": "Sites", "children": [
+            {"type": "poi", "system": "Sol", "body": "Moon", "lat": 3.0, "lon": 4.0, "description": "inner", "active": True},
+        ]},
+    ]
+
+
+def last_message(job):
+    message = None
+    while not job.messages.empty():
+        message = job.messages.get_nowait()
+    return message
+
+
+def test_export_job_writes_the_tree_as_it_was_when_created(tmp_path):
+    tree = sample_tree()
+    target = tmp_path / "export.json"
+    job = poi_io.ExportJob(str(target), tree)
+
+    # Edits on the Tk thread after the job was created
+    tree[0]["description"] = "changed"
+    tree[1]["children"].append({"type": "poi", "system": "Sol", "body": "Mars", "lat": 5.0, "lon": 6.0})
+    tree.append({"type": "folder", "name": "Late", "children": []})
+
+    job.run()
+    assert last_message(job)[:2] == ("done", 2)
+    assert json.loads(target.read_text(encoding="utf8")) == sample_tree()
+
+
+def test_snapshot_shares_no_dicts_or_lists():
+    tree = sample_tree()
+    snapshot = poi_io.snapshot_tree(tree)
+    assert snapshot == tree
+    assert snapshot[0] is not tree[0]
+    assert snapshot[1] is not tree[1]
+    assert snapshot[1]["children"] is not tree[1]["children"]
+    assert snapshot[1]["children"][0] is not tree[1]["children"][0]
+
+
+def test_folder_export_streams_csv_with_folder_path(tmp_path):
+    tree = sample_tree()
+    target = tmp_path / "export.csv"
+    job = poi_io.ExportJob(str(target), [tree[1]])
+    job.run()
+    lines = target.read_text(encoding="utf8").splitlines()
+    assert lines[0].split(",") == poi_io.CSV_COLUMNS
+    assert lines[1].endswith(",Sites")
+    assert len(lines) == 2
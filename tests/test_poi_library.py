@@ -0,0 +1,104 @@
+"""Tests for PlanetPOI.poi_library through poi_manager"""
+
+import json
+import os
+
+import pytest
+
+from PlanetPOI import poi_manager
+
+
+def poi(system, description):
+    return {"type": "poi", "system": system, "body": "A 1", "lat": 1.0, "lon": 2.0,
+            "description": description, "active": True}
+
+
+@pytest.fixture
+def library(tmp_path):
+    """A library split from a legacy poi.json, reloaded so only the root shard is read"""
+    legacy = tmp_path / "poi.json"
+    legacy.write_text(json.dumps([
+        {"type": "folder", "name": "Sites", "children": [
+            poi("Sol", "one"),
+            {"type": "folder", "name": "Inner", "children": [poi("Sol", "two")]},
+        ]},
+        {"type": "folder", "name": "Other", "children": [poi("Lave", "three")]},
+        poi("Achenar", "root"),
+    ]), encoding="utf8")
+    old_file, old_library = poi_manager.POI_FILE, poi_manager.LIBRARY
+    poi_manager.set_poi_file(str(legacy))
+    poi_manager.set_library(str(tmp_path / "library"))
+    poi_manager.load_pois()
+    yield poi_manager.load_pois()
+    poi_manager.set_poi_file(old_file)
+    poi_manager.LIBRARY = old_library
+
+
+def folder_named(tree, name):
+    return next(item for item in tree if item.get("name") == name)
+
+
+def test_top_level_folders_carry_their_manifest_id(library, tmp_path):
+    manifest = json.loads((tmp_path / "library" / "manifest.json").read_text(encoding="utf8"))
+    assert sorted(entry["id"] for entry in manifest["shards"]) == sorted(
+        item["id"] for item in library if item.get("type") == "folder")
+
+
+def test_count_loads_the_folder(library):
+    sites = folder_named(library, "Sites")
+    assert not sites["children"]
+    assert poi_manager.count_folder_contents(sites) == (1, 2)
+
+
+def test_delete_of_unloaded_folder_removes_only_that_folder(library, tmp_path):
+    sites = folder_named(library, "Sites")
+    assert poi_manager.delete_items(library, library, [sites]) == 1
+    tree = poi_manager.load_pois()
+    poi_manager.ensure_loaded()
+    assert [item.get("name") for item in tree if item.get("type") == "folder"] == ["Other"]
+    assert [p["description"] for p in poi_manager.get_all_pois_flat(tree)] == ["three", "root"]
+
+
+def test_move_of_unloaded_folder_keeps_its_pois(library):
+    sites = folder_named(library, "Sites")
+    other = folder_named(library, "Other")
+    poi_manager.ensure_items_loaded([other])
+    assert poi_manager.move_items(library, library, [sites], other["children"]) == 1
+    tree = poi_manager.load_pois()
+    poi_manager.ensure_loaded()
+    assert sorted(p["description"] for p in poi_manager.get_all_pois_flat(tree)) == ["one", "root", "three", "two"]
+
+
+def test_copy_of_a_folder_gets_its_own_shard(library, tmp_path):
+    poi_manager.ensure_loaded()
+    sites = folder_named(library, "Sites")
+    copy = json.loads(json.dumps(sites))
+    copy["name"] = "Sites copy"
+    library.append(copy)
+    poi_manager.save_pois(library)
+    assert copy["id"] != sites["id"]
+    shard_files = [name for name in os.listdir(tmp_path / "library") if name not in ("manifest.json", "root.json")]
+    assert len(shard_files) == 3
+
+    tree = poi_manager.load_pois()
+    poi_manager.ensure_loaded()
+    assert [item["name"] for item in tree if item.get("type") == "folder"] == ["Sites", "Other", "Sites copy"]
+    assert len(poi_manager.get_all_pois_flat(tree)) == 6
+
+
+def test_poi_appended_to_unloaded_folder_is_saved(library):
+    other = folder_named(library, "Other")
+    assert not other["children"]
+    other["children"].append(poi("Lave", "added"))
+    poi_manager.save_pois(library)
+
+    tree = poi_manager.load_pois()
+    poi_manager.ensure_loaded()
+    assert [p["description"] for p in folder_named(tree, "Other")["children"]] == ["three", "added"]
+
+
+def test_ensure_systems_loaded_reads_only_matching_shards(library):
+    assert poi_manager.ensure_systems_loaded(["Lave"])
+    assert [p["description"] for p in folder_named(library, "Other")["children"]] == ["three"]
+    assert not folder_named(library, "Sites")["children"]
+    assert not poi_manager.ensure_systems_loaded(["Lave", "Nowhere"])
@@ -0,0 +1,91 @@
+"""Tests for PlanetPOI.route_planner and route mode of the target tracker"""
+
+import threading
+
+import pytest
+
+from PlanetPOI import route_planner
+from PlanetPOI.navigation import Position, TargetTracker, TARGET_MODE_ROUTE
+
+BODY = "Test 1 a"
+
+
+def make_pois(lats):
+    return [{"description": f"P{idx}", "lat": lat, "lon": 0.0, "active": True} for idx, lat in enumerate(lats)]
+
+
+@pytest.fixture
+def blocked_solver(monkeypatch):
+    """Hold every plan in the solver until the returned event is set"""
+    release = threading.Event()
+    solve = route_planner.solve_open_tour
+
+    def blocking_solve(*args, **kwargs):
+        assert release.wait(5)
+        return solve(*args, **kwargs)
+
+    monkeypatch.setattr(route_planner, "solve_open_tour", blocking_solve)
+    yield release
+    release.set()
+
+
+def test_background_planner_orders_by_distance():
+    pois = make_pois([3.0, 1.0, 2.0])
+    planner = route_planner.BackgroundRoutePlanner()
+    planner.request("key", 0.0, 0.0, pois, 1000000)
+    assert planner.wait(5)
+    assert [poi["description"] for poi in planner.result("key")] == ["P1", "P2", "P0"]
+    assert planner.result("other") is None
+
+
+def test_tick_does_not_wait_for_the_plan(blocked_solver):
+    pois = make_pois([3.0, 1.0, 2.0])
+    tracker = TargetTracker()
+    position = Position(BODY, 0.0, 0.0)
+
+    # Planning is held in the worker - the tick falls back to tree order
+    assert tracker.select(TARGET_MODE_ROUTE, position, pois, 1) is pois[0]
+    assert tracker.row_pois(TARGET_MODE_ROUTE, position, pois, 1, pois[0], 10) == pois
+
+    blocked_solver.set()
+    assert tracker.planner.wait(5)
+    assert tracker.select(TARGET_MODE_ROUTE, position, pois, 1) is pois[1]
+    assert tracker.row_pois(TARGET_MODE_ROUTE, position, pois, 1, pois[1], 10) == [pois[1], pois[2], pois[0]]
+
+
+def test_replans_only_when_pois_are_added():
+    pois = make_pois([3.0, 1.0, 2.0])
+    tracker = TargetTracker()
+    position = Position(BODY, 0.0, 0.0)
+    tracker.select(TARGET_MODE_ROUTE, position, pois, 1)
+    assert tracker.planner.wait(5)
+    assert tracker.planner.plans == 1
+
+    # An edit elsewhere, then a POI deactivated - the route just drops it
+    assert tracker.select(TARGET_MODE_ROUTE, position, pois, 2) is pois[1]
+    assert tracker.select(TARGET_MODE_ROUTE, position, [pois[0], pois[2]], 3) is pois[2]
+    assert tracker.planner.wait(5)
+    assert tracker.planner.plans == 1
+
+    # A new POI is planned into the route
+    added = pois + make_pois([0.5])
+    tracker.select(TARGET_MODE_ROUTE, position, added, 4)
+    assert tracker.planner.wait(5)
+    assert tracker.planner.plans == 2
+    assert tracker.select(TARGET_MODE_ROUTE, position, added, 4) is added[3]
+
+
+def test_new_body_waits_for_its_own_plan(blocked_solver):
+    pois = make_pois([3.0, 1.0, 2.0])
+    tracker = TargetTracker()
+    blocked_solver.set()
+    tracker.select(TARGET_MODE_ROUTE, Position(BODY, 0.0, 0.0), pois, 1)
+    assert tracker.planner.wait(5)
+    blocked_solver.clear()
+
+    other = make_pois([2.0, 1.0])
+    # The old body's route is never shown for the new one
+    assert tracker.row_pois(TARGET_MODE_ROUTE, Position("Other", 0.0, 0.0), other, 1, None, 10) == other
+    blocked_solver.set()
+    assert tracker.planner.wait(5)
+    assert tracker.row_pois(TARGET_MODE_ROUTE, Position("Other", 0.0, 0.0), other, 1, None, 10) == [other[1], other[0]]
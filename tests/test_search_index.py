@@ -0,0 +1,107 @@
+"""Tests for PlanetPOI.search_index, kept up to date through poi_manager's hooks"""
+
+import pytest
+
+from PlanetPOI import poi_manager, search_index
+
+
+def poi(description, system="Sol", notes=""):
+    return {"type": "poi", "system": system, "body": "A 1", "lat": 1.0, "lon": 2.0,
+            "description": description, "notes": notes, "active": True}
+
+
+@pytest.fixture
+def tree(tmp_path, monkeypatch):
+    """A single-file tree (no library) loaded through poi_manager, with the index built"""
+    monkeypatch.setattr(poi_manager, "LIBRARY", None)
+    monkeypatch.setattr(poi_manager, "POI_FILE", str(tmp_path / "poi.json"))
+    all_pois = [
+        poi("Crystalline shards"),
+        {"type": "folder", "name": "Biology", "children": [
+            poi("Bacterium colony", "Lave"),
+            {"type": "folder", "name": "Rare", "children": [poi("Stratum tectonicas", "Achenar")]},
+        ]},
+    ]
+    poi_manager.notify_tree_replaced(all_pois)
+    assert len(poi_manager.search_index) == 3
+    return all_pois
+
+
+@pytest.fixture
+def tokenized(monkeypatch):
+    """Descriptions of the POIs tokenized from now on"""
+    seen = []
+    original = search_index.poi_tokens
+
+    def counting(fields):
+        seen.append(fields[0])
+        return original(fields)
+
+    monkeypatch.setattr(search_index, "poi_tokens", counting)
+    return seen
+
+
+def descriptions(pois):
+    return [p["description"] for p in pois]
+
+
+def test_prefix_and_folder_search(tree):
+    assert descriptions(poi_manager.search_pois("crys")) == ["Crystalline shards"]
+    assert descriptions(poi_manager.search_pois("biology")) == ["Bacterium colony", "Stratum tectonicas"]
+    assert descriptions(poi_manager.search_pois("rare achenar")) == ["Stratum tectonicas"]
+    assert poi_manager.search_pois("") == []
+
+
+def test_edit_reindexes_only_that_poi(tree, tokenized):
+    target = tree[1]["children"][0]
+    target["description"] = "Fungoida setae"
+    poi_manager.notify_poi_changed(target)
+    poi_manager.save_pois(tree)
+
+    assert tokenized == ["Fungoida setae"]
+    assert descriptions(poi_manager.search_pois("fungoida")) == ["Fungoida setae"]
+    assert poi_manager.search_pois("bacterium") == []
+
+
+def test_active_toggle_tokenizes_nothing(tree, tokenized):
+    poi_manager.set_pois_active(tree, [tree[0]], False)
+    poi_manager.notify_poi_changed(tree[0])
+    assert tokenized == []
+
+
+def test_add_indexes_the_new_item_with_its_folder_path(tree, tokenized):
+    rare = tree[1]["children"][1]
+    new_poi = poi("Osseus spiralis")
+    rare["children"].append(new_poi)
+    poi_manager.notify_item_added(new_poi, rare["children"])
+
+    assert tokenized == ["Osseus spiralis"]
+    assert descriptions(poi_manager.search_pois("rare osseus")) == ["Osseus spiralis"]
+
+
+def test_delete_removes_a_whole_folder(tree, tokenized):
+    assert poi_manager.delete_item(tree, tree, tree[1])
+    assert tokenized == []
+    assert poi_manager.search_pois("biology") == []
+    assert len(poi_manager.search_index) == 1
+
+
+def test_move_updates_folder_path_and_sorts_last(tree):
+    rare = tree[1]["children"][1]
+    poi_manager.move_item(tree, tree, rare, tree)
+
+    assert descriptions(poi_manager.search_pois("biology")) == ["Bacterium colony"]
+    assert descriptions(poi_manager.search_pois("rare")) == ["Stratum tectonicas"]
+
+    moved = tree[0]
+    poi_manager.move_item(tree, tree, moved, rare["children"])
+    assert descriptions(poi_manager.search_pois("rare")) == ["Stratum tectonicas", "Crystalline shards"]
+
+
+def test_limit_returns_the_first_matches(tree):
+    for idx in range(20):
+        new_poi = poi(f"Extra {idx}")
+        tree.append(new_poi)
+        poi_manager.notify_item_added(new_poi, tree)
+    assert descriptions(poi_manager.search_pois("extra", limit=3)) == ["Extra 0", "Extra 1", "Extra 2"]
+    assert search_index.tokenize("Extra 1") == ["extra", "1"]